@@ -1,52 +1,294 @@
+from django import forms
 from django.contrib import admin
+from django.contrib.admin import helpers
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max
+from django.db.models.functions import Substr
+from django.template.response import TemplateResponse
+from django.utils.functional import cached_property
 
-
-from .models import Category, Comment, Location, Post
+from .models import Category, Comment, DigestSubscription, Location, Post
+from .moderation import delete_comments, delete_posts, update_posts
 
 
 admin.site.empty_value_display = 'Не задано'
 
+PREVIEW_LENGTH = 80
+EXACT_COUNT_LIMIT = 10000
+
+
+def estimate_rows(queryset):
+    """
+    Примерное число строк таблицы без COUNT(*).
+
+    PostgreSQL берёт оценку планировщика, остальные базы — наибольший
+    первичный ключ; маленькие таблицы считаются точно.
+    """
+    connection = connections[queryset.db]
+    estimate = None
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples FROM pg_class WHERE relname = %s',
+                           [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+            estimate = int(row[0]) if row else None
+    if estimate is None:
+        estimate = queryset.model._default_manager.using(
+            queryset.db).aggregate(last=Max('pk'))['last'] or 0
+    if estimate < EXACT_COUNT_LIMIT:
+        return queryset.count()
+    return estimate
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор списка админки с оценкой числа строк без фильтров."""
+
+    @cached_property
+    def count(self):
+        if self.object_list.query.where:
+            return super().count
+        return estimate_rows(self.object_list)
+
+
+class PreviewChangeList(ChangeList):
+    """Список без полного текста: вместо него начало текста из базы."""
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer(
+            *self.model_admin.deferred_fields
+        ).annotate(text_preview=Substr('text', 1, PREVIEW_LENGTH))
+
+
+class InputFilter(admin.SimpleListFilter):
+    """
+    Фильтр с полем ввода вместо списка всех значений.
+
+    Для связей с большими таблицами: список вариантов не строится.
+    """
+    template = 'admin/blog/input_filter.html'
+    lookup = None
+
+    def lookups(self, request, model_admin):
+        # Без вариантов Django не показывает фильтр.
+        return (('', ''),)
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.lookup: self.value().strip()})
+        return queryset
+
+    def choices(self, changelist):
+        all_choice = next(super().choices(changelist))
+        all_choice['query_parts'] = [
+            (key, value)
+            for key, value in changelist.get_filters_params().items()
+            if key != self.parameter_name
+        ]
+        yield all_choice
+
 
-class PostAdmin(admin.ModelAdmin):
+class AuthorFilter(InputFilter):
+    title = 'автору (имя пользователя)'
+    parameter_name = 'author'
+    lookup = 'author__username'
+
+
+class LocationFilter(InputFilter):
+    title = 'местоположению'
+    parameter_name = 'location'
+    lookup = 'location__name__iexact'
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Список для больших таблиц.
+
+    Число строк без фильтров оценивается, длинный текст не загружается,
+    сортировка только по первичному ключу, который использует индекс.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    ordering = ('-pk',)
+    sortable_by = ()
+    deferred_fields = ('text',)
+
+    def get_changelist(self, request, **kwargs):
+        return PreviewChangeList
+
+    @admin.display(description='Текст')
+    def text_preview(self, obj):
+        preview = obj.text_preview
+        return preview + '…' if len(preview) == PREVIEW_LENGTH else preview
+
+
+class MoveCategoryForm(forms.Form):
+    category = forms.ModelChoiceField(Category.objects.all(),
+                                      label='Категория')
+
+
+def confirm_action(modeladmin, request, queryset, title, form_class=None):
+    """
+    Страница подтверждения массового действия.
+
+    Возвращает (None, данные формы) после подтверждения или
+    (ответ со страницей, None). При выборе всех объектов ключи не
+    передаются в форму — действие применяется к выборке списка.
+    """
+    data = request.POST if 'post' in request.POST else None
+    form = form_class(data) if form_class else None
+    if data is not None and (form is None or form.is_valid()):
+        return None, form.cleaned_data if form else {}
+    select_across = request.POST.get('select_across') == '1'
+    return TemplateResponse(request, 'admin/blog/bulk_action.html', {
+        **modeladmin.admin_site.each_context(request),
+        'title': title,
+        'opts': modeladmin.model._meta,
+        'form': form,
+        'count': queryset.count(),
+        'action': request.POST['action'],
+        'select_across': select_across,
+        'selected': [] if select_across else request.POST.getlist(
+            helpers.ACTION_CHECKBOX_NAME),
+        'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+    }), None
+
+
+class CategoryAdmin(admin.ModelAdmin):
+    search_fields = (
+        'title',
+    )
+
+
+class LocationAdmin(admin.ModelAdmin):
+    search_fields = (
+        'name',
+    )
+
+
+class PostAdmin(LargeTableAdmin):
     list_display = (
         'title',
-        'text',
+        'text_preview',
         'image',
         'pub_date',
         'author',
         'location',
         'category',
+        'is_published',
     )
-    list_editable = (
-        'category',
+    list_select_related = (
+        'author',
         'location',
+        'category',
     )
     search_fields = (
         'title',
         'text',
     )
     list_filter = (
+        'is_published',
         'category',
-        'location',
+        LocationFilter,
+        AuthorFilter,
+    )
+    autocomplete_fields = (
         'author',
+        'location',
+        'category',
+    )
+    actions = (
+        'publish',
+        'unpublish',
+        'move_to_category',
+        'delete_selected_posts',
     )
 
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
 
-class CommentAdmin(admin.ModelAdmin):
+    @admin.action(description='Опубликовать', permissions=['change'])
+    def publish(self, request, queryset):
+        updated = update_posts(queryset, is_published=True)
+        self.message_user(request, f'Опубликовано публикаций: {updated}.')
+
+    @admin.action(description='Снять с публикации', permissions=['change'])
+    def unpublish(self, request, queryset):
+        updated = update_posts(queryset, is_published=False)
+        self.message_user(request, f'Снято с публикации: {updated}.')
+
+    @admin.action(description='Перенести в категорию',
+                  permissions=['change'])
+    def move_to_category(self, request, queryset):
+        response, data = confirm_action(
+            self, request, queryset, 'Перенос в категорию', MoveCategoryForm)
+        if response:
+            return response
+        updated = update_posts(queryset, category=data['category'])
+        self.message_user(
+            request, f'Перенесено в «{data["category"]}»: {updated}.')
+
+    @admin.action(description='Удалить выбранные публикации',
+                  permissions=['delete'])
+    def delete_selected_posts(self, request, queryset):
+        response, _ = confirm_action(
+            self, request, queryset, 'Удаление публикаций')
+        if response:
+            return response
+        deleted = delete_posts(queryset)
+        self.message_user(request, f'Удалено публикаций: {deleted}.')
+
+
+class CommentAdmin(LargeTableAdmin):
     list_display = (
-        'text',
+        'text_preview',
+        'post',
+        'author',
+        'created_at',
+    )
+    list_select_related = (
         'post',
         'author',
     )
+    deferred_fields = (
+        'text',
+        'post__text',
+    )
     search_fields = (
         'text',
     )
     list_filter = (
+        AuthorFilter,
+    )
+    autocomplete_fields = (
+        'post',
         'author',
     )
+    actions = (
+        'delete_selected_comments',
+    )
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    @admin.action(description='Удалить выбранные комментарии',
+                  permissions=['delete'])
+    def delete_selected_comments(self, request, queryset):
+        response, _ = confirm_action(
+            self, request, queryset, 'Удаление комментариев')
+        if response:
+            return response
+        deleted = delete_comments(queryset)
+        self.message_user(request, f'Удалено комментариев: {deleted}.')
 
 
-admin.site.register(Category)
+admin.site.register(Category, CategoryAdmin)
 admin.site.register(Comment, CommentAdmin)
-admin.site.register(Location)
+admin.site.register(Location, LocationAdmin)
 admin.site.register(Post, PostAdmin)
+admin.site.register(DigestSubscription)
@@ -0,0 +1,329 @@
+import base64
+import hashlib
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from django.db.models.functions import Substr
+from django.http import Http404, JsonResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import urlencode
+from django.views.generic import View
+
+from core.tags import get_tagged, set_tagged
+
+from .cache import (COMMENTS_TAG, FEED_TAG, RELATED_TAG, author_comments_tag,
+                    author_feed_tag, author_tag, category_comments_tag,
+                    category_feed_tag, category_tag, get_published_category,
+                    post_tag)
+from .conditional import get_posts_validators
+from .mixins import ConditionalGetMixin
+from .models import Comment, Post, User
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+EXCERPT_LENGTH = 200
+API_CACHE_TIMEOUT = 60
+
+POST_FIELDS = ('id', 'url', 'title', 'excerpt', 'text', 'pub_date',
+               'author', 'category', 'location', 'image', 'comment_count')
+DEFAULT_POST_FIELDS = tuple(
+    field for field in POST_FIELDS if field != 'text')
+COMMENT_FIELDS = ('id', 'text', 'author', 'created_at')
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(
+        json.dumps(values).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise ApiError('Неверный курсор.')
+
+
+def error_response(message, status):
+    return JsonResponse({'error': message}, status=status,
+                        json_dumps_params={'ensure_ascii': False})
+
+
+def visible_posts():
+    """Публикации, видимые всем, — те же правила, что у ленты."""
+    return Post.objects.filter(
+        is_published=True,
+        pub_date__lte=timezone.now(),
+        category__is_published=True,
+    )
+
+
+def serialize_post(post, fields):
+    values = {
+        'id': lambda: post.pk,
+        'url': lambda: reverse('blog:post_detail', args=[post.pk]),
+        'title': lambda: post.title,
+        'excerpt': lambda: post.excerpt,
+        'text': lambda: post.text,
+        'pub_date': lambda: post.pub_date.isoformat(),
+        'author': lambda: post.author.username,
+        'category': lambda: post.category and {
+            'slug': post.category.slug, 'title': post.category.title},
+        'location': lambda: (post.location.name if post.location
+                             and post.location.is_published else None),
+        'image': lambda: post.image.url if post.image else None,
+        'comment_count': lambda: post.comments_total,
+    }
+    return {field: values[field]() for field in fields}
+
+
+def serialize_comment(comment, fields):
+    values = {
+        'id': lambda: comment.pk,
+        'text': lambda: comment.text,
+        'author': lambda: comment.author.username,
+        'created_at': lambda: comment.created_at.isoformat(),
+    }
+    return {field: values[field]() for field in fields}
+
+
+def select_post_fields(queryset, fields):
+    """Загрузить только связи и колонки, нужные выбранным полям."""
+    related = [name for name in ('author', 'category', 'location')
+               if name in fields]
+    if related:
+        queryset = queryset.select_related(*related)
+    if 'text' not in fields:
+        queryset = queryset.defer('text')
+    if 'excerpt' in fields:
+        queryset = queryset.annotate(
+            excerpt=Substr('text', 1, EXCERPT_LENGTH))
+    return queryset
+
+
+class CachedPageView(View):
+    """
+    Страница ответа API, закэшированная с тегами по параметрам запроса.
+
+    Ключ включает токен валидаторов: новый комментарий меняет ETag, но
+    не теги ленты, и без токена под новым ETag отдавалась бы старая
+    страница.
+    """
+    allowed_fields = ()
+    default_fields = ()
+
+    def get_fields(self):
+        fields = self.request.GET.get('fields')
+        if not fields:
+            return self.default_fields
+        fields = tuple(dict.fromkeys(
+            field.strip() for field in fields.split(',') if field.strip()))
+        unknown = set(fields) - set(self.allowed_fields)
+        if unknown:
+            raise ApiError(
+                f'Неизвестные поля: {", ".join(sorted(unknown))}.')
+        return fields
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.GET.get('limit', PAGE_SIZE))
+        except ValueError:
+            raise ApiError('Неверный limit.')
+        return min(max(limit, 1), MAX_PAGE_SIZE)
+
+    def get_cache_tags(self):
+        raise NotImplementedError
+
+    def build(self, fields, limit, cursor):
+        """Вернуть (объекты страницы, курсор следующей страницы)."""
+        raise NotImplementedError
+
+    def next_url(self, cursor):
+        if cursor is None:
+            return None
+        params = self.request.GET.copy()
+        params['cursor'] = cursor
+        return f'{self.request.path}?{urlencode(sorted(params.items()))}'
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        limit = self.get_limit()
+        cursor = request.GET.get('cursor')
+        params = repr((request.path, fields, limit, cursor,
+                       getattr(self, 'validator_token', '')))
+        key = f'blog:api:v1:{hashlib.md5(params.encode()).hexdigest()}'
+        page = get_tagged(key)
+        if page is None:
+            results, next_cursor = self.build(fields, limit, cursor)
+            page = {'results': results, 'next': next_cursor}
+            set_tagged(key, page, self.get_cache_tags(), API_CACHE_TIMEOUT)
+        return JsonResponse(self.get_payload(page), safe=False,
+                            json_dumps_params={'ensure_ascii': False})
+
+    def get_payload(self, page):
+        return {'results': page['results'],
+                'next': self.next_url(page['next'])}
+
+
+class ApiView(ConditionalGetMixin, CachedPageView):
+    """
+    Основа представлений API v1 только для чтения.
+
+    Страницы кэшируются с теми же тегами, что и страницы HTML, и
+    поддерживают If-None-Match/If-Modified-Since.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except Http404:
+            return error_response('Не найдено.', 404)
+        except ApiError as error:
+            return error_response(str(error), error.status)
+
+
+class PostFeedView(ApiView):
+    """Лента публикаций с курсором по (pub_date, id) от новых к старым."""
+    allowed_fields = POST_FIELDS
+    default_fields = DEFAULT_POST_FIELDS
+
+    def get_posts(self):
+        return visible_posts()
+
+    def get_validators(self):
+        return get_posts_validators(self.get_posts(), self.get_cache_tags())
+
+    def get_cache_tags(self):
+        return [FEED_TAG, COMMENTS_TAG, RELATED_TAG]
+
+    def build(self, fields, limit, cursor):
+        posts = self.get_posts()
+        if cursor:
+            try:
+                pub_date, pk = decode_cursor(cursor)
+                pub_date = datetime.fromisoformat(pub_date)
+                pk = int(pk)
+            except (TypeError, ValueError):
+                raise ApiError('Неверный курсор.')
+            posts = posts.filter(Q(pub_date__lt=pub_date)
+                                 | Q(pub_date=pub_date, pk__lt=pk))
+        posts = list(select_post_fields(
+            posts.order_by('-pub_date', '-pk'), fields)[:limit + 1])
+        next_cursor = None
+        if len(posts) > limit:
+            posts = posts[:limit]
+            last = posts[-1]
+            next_cursor = encode_cursor([last.pub_date.isoformat(), last.pk])
+        return [serialize_post(post, fields) for post in posts], next_cursor
+
+
+class CategoryFeedView(PostFeedView):
+    """Лента публикаций категории."""
+
+    def get_category(self):
+        return get_published_category(self.kwargs['category_slug'])
+
+    def get_posts(self):
+        return super().get_posts().filter(category=self.get_category())
+
+    def get_cache_tags(self):
+        category = self.get_category()
+        return [category_tag(category.pk), category_feed_tag(category.pk),
+                category_comments_tag(category.pk), RELATED_TAG]
+
+
+class AuthorFeedView(PostFeedView):
+    """Лента опубликованных записей автора."""
+
+    def get_author_id(self):
+        if not hasattr(self, 'author_id'):
+            self.author_id = User.objects.filter(
+                username=self.kwargs['username']
+            ).values_list('pk', flat=True).first()
+            if self.author_id is None:
+                raise Http404()
+        return self.author_id
+
+    def get_posts(self):
+        return super().get_posts().filter(author_id=self.get_author_id())
+
+    def get_cache_tags(self):
+        author_id = self.get_author_id()
+        return [author_tag(author_id), author_feed_tag(author_id),
+                author_comments_tag(author_id), RELATED_TAG]
+
+
+class PostDetailApiView(ApiView):
+    """Одна публикация; поле text по умолчанию включено."""
+    allowed_fields = POST_FIELDS
+    default_fields = POST_FIELDS
+
+    def get_posts(self):
+        return visible_posts().filter(pk=self.kwargs['pk'])
+
+    def get_author_id(self):
+        if not hasattr(self, 'author_id'):
+            self.author_id = self.get_posts().values_list(
+                'author_id', flat=True).first()
+            if self.author_id is None:
+                raise Http404()
+        return self.author_id
+
+    def get_validators(self):
+        return get_posts_validators(self.get_posts(), self.get_cache_tags())
+
+    def get_cache_tags(self):
+        return [post_tag(self.kwargs['pk']), author_tag(self.get_author_id()),
+                RELATED_TAG]
+
+    def build(self, fields, limit, cursor):
+        post = select_post_fields(self.get_posts(), fields).first()
+        if post is None:
+            raise Http404()
+        return serialize_post(post, fields), None
+
+    def get_payload(self, page):
+        return page['results']
+
+
+class CommentListApiView(ApiView):
+    """Комментарии публикации с курсором по id от старых к новым."""
+    allowed_fields = COMMENT_FIELDS
+    default_fields = COMMENT_FIELDS
+
+    def get_posts(self):
+        return visible_posts().filter(pk=self.kwargs['pk'])
+
+    def get_validators(self):
+        posts = self.get_posts()
+        if not posts.exists():
+            raise Http404()
+        return get_posts_validators(posts, self.get_cache_tags())
+
+    def get_cache_tags(self):
+        return [post_tag(self.kwargs['pk'])]
+
+    def build(self, fields, limit, cursor):
+        comments = Comment.objects.filter(post_id=self.kwargs['pk'])
+        if cursor:
+            after = decode_cursor(cursor)
+            if not isinstance(after, int):
+                raise ApiError('Неверный курсор.')
+            comments = comments.filter(pk__gt=after)
+        if 'author' in fields:
+            comments = comments.select_related('author')
+        comments = list(comments.order_by('pk')[:limit + 1])
+        next_cursor = None
+        if len(comments) > limit:
+            comments = comments[:limit]
+            next_cursor = encode_cursor(comments[-1].pk)
+        return ([serialize_comment(comment, fields) for comment in comments],
+                next_cursor)
@@ -0,0 +1,294 @@
+import asyncio
+import io
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.contrib.auth.models import AnonymousUser
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+from django.template import Context, Template, engines
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+from core.asgi import get_application
+
+from .forms import CommentForm
+from .models import Category, Comment, Location, Post, User
+
+DUMMY_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
+
+
+def timeit(func, repeat):
+    """Среднее время вызова в миллисекундах."""
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def make_post_page(count):
+    """Страница несохранённых публикаций для замеров без базы данных."""
+    author = User(pk=1, username='author')
+    category = Category(pk=1, slug='routine', title='Будни',
+                        is_published=True)
+    location = Location(pk=1, name='Остров', is_published=True)
+    posts = []
+    for index in range(1, count + 1):
+        post = Post(pk=index, title=f'Публикация {index}',
+                    text='Текст публикации для замера. ' * 20,
+                    pub_date=datetime(2023, 1, 1, tzinfo=timezone.utc),
+                    author=author, category=category, location=location)
+        post.comment_count = index
+        posts.append(post)
+    return posts
+
+
+def bench_cards(posts=10, repeat=200, **options):
+    """Цикл с {% include %} против {% post_cards %} на одной странице."""
+    page = make_post_page(posts)
+    include_loop = Template(
+        '{% for post in posts %}\n'
+        '    <article class="mb-5">\n'
+        '      {% include "includes/post_card.html" %}\n'
+        '    </article>\n'
+        '  {% endfor %}'
+    )
+    post_cards = Template('{% load blog_cards %}{% post_cards posts %}')
+    results = {}
+    with override_settings(CACHES=DUMMY_CACHES):
+        results['include loop, no cache'] = timeit(
+            lambda: include_loop.render(Context({'posts': page})), repeat)
+        results['post_cards, no cache'] = timeit(
+            lambda: post_cards.render(Context({'posts': page})), repeat)
+    results['include loop, warm cache'] = timeit(
+        lambda: include_loop.render(Context({'posts': page})), repeat)
+    results['post_cards, warm cache'] = timeit(
+        lambda: post_cards.render(Context({'posts': page})), repeat)
+    return results
+
+
+def page_contexts(posts):
+    """Контексты страниц ленты, категории, публикации и профиля."""
+    page = Paginator(make_post_page(posts * 3), posts).page(2)
+    post = page.object_list[0]
+    comments = [Comment(pk=index, post=post, author=post.author,
+                        text='Комментарий\nв две строки',
+                        created_at=post.pub_date)
+                for index in range(1, posts + 1)]
+    return {
+        'index': ('/', 'blog/index.html', {'page_obj': page}),
+        'category': (f'/category/{post.category.slug}/',
+                     'blog/category.html',
+                     {'page_obj': page, 'category': post.category}),
+        'detail': (f'/posts/{post.pk}/', 'blog/detail.html',
+                   {'post': post, 'comments': comments,
+                    'form': CommentForm()}),
+        'profile': (f'/profile/{post.author.username}/', 'blog/profile.html',
+                    {'page_obj': page, 'profile': post.author}),
+    }
+
+
+def bench_engines(posts=10, repeat=200, **options):
+    """Шаблоны Django против Jinja2 на публичных страницах блога."""
+    factory = RequestFactory()
+    results = {}
+    with override_settings(CACHES=DUMMY_CACHES):
+        for page, (url, name, context) in page_contexts(posts).items():
+            request = factory.get(url)
+            request.user = AnonymousUser()
+            request.resolver_match = resolve(url)
+            for alias in ('django', 'jinja2'):
+                template = engines[alias].get_template(name)
+                results[f'{page}, {alias}'] = timeit(
+                    lambda: template.render(dict(context), request), repeat)
+    return results
+
+
+def bench_sessions(repeat=200, **options):
+    """
+    Запросы ленты авторизованным пользователем с разными хранилищами сессий.
+
+    Данные создаются в транзакции, которая откатывается после замера.
+    """
+    results = {}
+    with transaction.atomic():
+        user = User.objects.create_user('bench-sessions', password='bench')
+        for name, engine in settings.SESSION_ENGINES.items():
+            with override_settings(SESSION_ENGINE=engine, INTERNAL_IPS=[]):
+                client = Client(SERVER_NAME='localhost')
+                client.force_login(user)
+                results[f'{name}, ms'] = timeit(
+                    lambda: client.get('/'), repeat)
+                with CaptureQueriesContext(connection) as queries:
+                    client.get('/')
+                results[f'{name}, queries'] = len(queries)
+        transaction.set_rollback(True)
+    return results
+
+
+def bench_admin(repeat=20, rows=5000, **options):
+    """
+    Страницы списков публикаций и комментариев в админке.
+
+    Данные создаются в транзакции, которая откатывается после замера.
+    """
+    results = {}
+    with transaction.atomic():
+        admin = User.objects.create_superuser('bench-admin', password='bench')
+        User.objects.bulk_create(
+            User(username=f'bench-author-{index}') for index in range(200))
+        Category.objects.bulk_create(
+            Category(title=f'Категория {index}', slug=f'bench-{index}',
+                     description='Описание') for index in range(20))
+        Location.objects.bulk_create(
+            Location(name=f'Место {index}') for index in range(200))
+        # SQLite не возвращает ключи из bulk_create.
+        authors = list(User.objects.filter(username__startswith='bench-'))
+        categories = list(Category.objects.filter(slug__startswith='bench-'))
+        locations = list(Location.objects.filter(name__startswith='Место '))
+        pub_date = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        Post.objects.bulk_create(
+            Post(title=f'Публикация {index}', text='Текст. ' * 500,
+                 pub_date=pub_date, author=authors[index % len(authors)],
+                 category=categories[index % len(categories)],
+                 location=locations[index % len(locations)])
+            for index in range(rows))
+        posts = list(Post.objects.filter(
+            title__startswith='Публикация ').only('pk'))
+        Comment.objects.bulk_create(
+            Comment(text='Комментарий. ' * 50, post=posts[index % len(posts)],
+                    author=authors[index % len(authors)])
+            for index in range(rows))
+        with override_settings(INTERNAL_IPS=[]):
+            client = Client(SERVER_NAME='localhost')
+            client.force_login(admin)
+            for name in ('post', 'comment'):
+                url = f'/admin/blog/{name}/'
+                results[f'{name} changelist, ms'] = timeit(
+                    lambda: client.get(url), repeat)
+                with CaptureQueriesContext(connection) as queries:
+                    client.get(url)
+                results[f'{name} changelist, queries'] = len(queries)
+        transaction.set_rollback(True)
+    return results
+
+
+def latency_stats(latencies, elapsed):
+    latencies = sorted(latencies)
+    return {
+        'throughput, req/s': len(latencies) / elapsed,
+        'p50, ms': statistics.median(latencies) * 1000,
+        'p99, ms': latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def run_wsgi(url, requests, concurrency, workers, slow_client):
+    """
+    Синхронный сервер с ``workers`` потоками.
+
+    Поток занят запросом, пока медленный клиент не дочитает ответ.
+    """
+    handler = WSGIHandler()
+    slots = threading.Semaphore(workers)
+    latencies = []
+
+    def request():
+        start = time.perf_counter()
+        with slots:
+            environ = {
+                'REQUEST_METHOD': 'GET', 'PATH_INFO': url,
+                'QUERY_STRING': '', 'SERVER_NAME': 'localhost',
+                'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+                'REMOTE_ADDR': '10.0.0.1', 'wsgi.url_scheme': 'http',
+                'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+            }
+            response = handler(environ, lambda status, headers: None)
+            for _ in response:
+                time.sleep(slow_client)
+            response.close()
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as clients:
+        for _ in range(requests):
+            clients.submit(request)
+    return latency_stats(latencies, time.perf_counter() - start)
+
+
+def run_asgi(url, requests, concurrency, slow_client):
+    """
+    Медленный клиент под ASGI ждёт в цикле событий, не занимая поток.
+
+    Кроме задержек возвращает наибольшее число потоков процесса.
+    """
+    application = get_application()
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': url, 'root_path': '',
+        'query_string': b'', 'headers': [(b'host', b'localhost')],
+        'client': ('10.0.0.1', 0), 'server': ('localhost', 80),
+    }
+    latencies = []
+    threads = [threading.active_count()]
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        threads.append(threading.active_count())
+        if message['type'] == 'http.response.body':
+            await asyncio.sleep(slow_client)
+
+    async def client(count):
+        for _ in range(count):
+            start = time.perf_counter()
+            await application(dict(scope), receive, send)
+            latencies.append(time.perf_counter() - start)
+
+    async def main():
+        share, extra = divmod(requests, concurrency)
+        await asyncio.gather(*(client(share + (index < extra))
+                               for index in range(concurrency)))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    stats = latency_stats(latencies, time.perf_counter() - start)
+    stats['peak threads'] = max(threads)
+    return stats
+
+
+def bench_concurrency(repeat=200, concurrency=50, workers=4,
+                      slow_client=0.05, url='/', **options):
+    """
+    Пропускная способность и p99 WSGI и ASGI при медленных клиентах.
+
+    Запросы выполняются в процессе без сетевого сервера; медленный
+    клиент дочитывает каждую часть ответа ``slow_client`` секунд.
+    """
+    results = {}
+    for name, stats in (
+        ('wsgi', run_wsgi(url, repeat, concurrency, workers, slow_client)),
+        ('asgi', run_asgi(url, repeat, concurrency, slow_client)),
+    ):
+        for label, value in stats.items():
+            results[f'{name}, {label}'] = value
+    return results
+
+
+BENCHMARKS = {
+    'cards': bench_cards,
+    'engines': bench_engines,
+    'sessions': bench_sessions,
+    'admin': bench_admin,
+    'concurrency': bench_concurrency,
+}
@@ -0,0 +1,90 @@
+from django.core.cache.utils import make_template_fragment_key
+from django.core.paginator import Paginator
+from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
+
+from core.tags import get_tagged, set_tagged
+
+from .models import Category
+
+CACHE_TIMEOUT = 300
+COUNT_CACHE_TIMEOUT = 60
+POST_CARD_FRAGMENT = 'post_card'
+FEED_TAG = 'feed:index'
+COMMENTS_TAG = 'comments:index'
+RELATED_TAG = 'related'
+SITEMAP_TAG = 'sitemap'
+SITEMAP_SHARD_SIZE = 5000
+
+
+def category_tag(category_id):
+    return f'category:{category_id}'
+
+
+def category_feed_tag(category_id):
+    return f'feed:category:{category_id}'
+
+
+def author_tag(author_id):
+    return f'author:{author_id}'
+
+
+def author_feed_tag(author_id):
+    return f'feed:author:{author_id}'
+
+
+def category_comments_tag(category_id):
+    return f'comments:category:{category_id}'
+
+
+def author_comments_tag(author_id):
+    return f'comments:author:{author_id}'
+
+
+def post_tag(post_id):
+    return f'post:{post_id}'
+
+
+def location_tag(location_id):
+    return f'location:{location_id}'
+
+
+def sitemap_shard(pk):
+    return pk // SITEMAP_SHARD_SIZE
+
+
+def sitemap_tag(section, shard):
+    return f'sitemap:{section}:{shard}'
+
+
+def post_card_key(post_id):
+    return make_template_fragment_key(POST_CARD_FRAGMENT, [post_id])
+
+
+def get_published_category(slug):
+    """Опубликованная категория по slug из кэша запросов."""
+    key = f'blog:category:{slug}'
+    category = get_tagged(key)
+    if category is None:
+        category = get_object_or_404(Category, slug=slug, is_published=True)
+        set_tagged(key, category, [category_tag(category.pk)],
+                   CACHE_TIMEOUT)
+    return category
+
+
+class CachedCountPaginator(Paginator):
+    """Пагинатор, который берёт число объектов из кэша с тегами."""
+
+    def __init__(self, *args, count_key, count_tags, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_key = count_key
+        self.count_tags = count_tags
+
+    @cached_property
+    def count(self):
+        count = get_tagged(self.count_key)
+        if count is None:
+            count = super().count
+            set_tagged(self.count_key, count, self.count_tags,
+                       COUNT_CACHE_TIMEOUT)
+        return count
@@ -0,0 +1,113 @@
+from django.template.defaultfilters import date as date_filter
+from django.urls import reverse
+from django.utils.html import conditional_escape
+from django.utils.text import Truncator
+from django.utils.timezone import template_localtime
+
+from core.tags import get_many_tagged, set_tagged
+
+from .cache import post_card_key
+
+CARD_CACHE_TIMEOUT = 300
+
+ARTICLE = '\n    <article class="mb-5">\n      {}\n    </article>\n  '
+
+IMAGE = (
+    '\n        <a href="{url}" target="_blank">'
+    '\n          <img class="border-3 rounded img-fluid img-thumbnail mb-2 '
+    'mx-auto d-block" src="{url}">'
+    '\n        </a>\n      '
+)
+
+NOT_PUBLISHED = (
+    '\n            <p class="text-danger">Пост снят с публикации админом</p>'
+    '\n          '
+)
+
+CATEGORY_NOT_PUBLISHED = (
+    '\n            <p class="text-danger">Выбранная категория снята с '
+    'публикации админом</p>\n          '
+)
+
+CARD = (
+    '<div class="col d-flex justify-content-center">\n'
+    '  <div class="card" style="width: 40rem;">\n'
+    '    <div class="card-body">\n'
+    '      {image}\n'
+    '      <h5 class="card-title">{title}</h5>\n'
+    '      <h6 class="card-subtitle mb-2 text-muted">\n'
+    '        <small>\n'
+    '          {notice}\n'
+    '          {pub_date} | {location}<br>\n'
+    '          От автора <a class="text-muted" href="{profile_url}">'
+    '@{username}</a> в\n'
+    '          категории <a class="text-muted" href="{category_url}">\n'
+    '  {category_title}\n'
+    '</a>\n'
+    '        </small>\n'
+    '      </h6>\n'
+    '      <p class="card-text">{text}</p>\n'
+    '      <a href="{detail_url}" class="card-link">Читать полный текст</a>\n'
+    '      <a href="{detail_url}" class="card-link text-muted">'
+    'Комментарии ({comment_count})</a>\n'
+    '    </div>\n'
+    '  </div>\n'
+    '</div>'
+)
+
+
+def render_post_card(post):
+    """
+    Карточка публикации без шаблонизатора.
+
+    Разметка побайтно совпадает с ``includes/post_card.html``.
+    """
+    escape = conditional_escape
+    if not post.is_published:
+        notice = NOT_PUBLISHED
+    elif not post.category.is_published:
+        notice = CATEGORY_NOT_PUBLISHED
+    else:
+        notice = ''
+    if post.location and post.location.is_published:
+        location = escape(post.location.name)
+    else:
+        location = 'Планета Земля'
+    detail_url = escape(reverse('blog:post_detail', args=[post.id]))
+    return CARD.format(
+        image=IMAGE.format(url=escape(post.image.url)) if post.image else '',
+        title=escape(post.title),
+        notice=notice,
+        pub_date=escape(date_filter(template_localtime(post.pub_date),
+                                    'd E Y, H:i')),
+        location=location,
+        profile_url=escape(reverse('blog:profile', args=[post.author])),
+        username=escape(post.author.username),
+        category_url=escape(
+            reverse('blog:category_posts', args=[post.category.slug])),
+        category_title=escape(post.category.title),
+        text=escape(Truncator(post.text).words(10, truncate=' …')),
+        detail_url=detail_url,
+        comment_count=escape(post.comment_count),
+    )
+
+
+def render_post_cards(posts):
+    """
+    Страница карточек в статьях ``<article>`` за один вызов.
+
+    Закэшированные карточки читаются одним запросом к кэшу и делят
+    ключи с фрагментом ``{% cachetagged %}`` из ``post_card.html``.
+    """
+    posts = list(posts)
+    keys = {post.id: post_card_key(post.id) for post in posts}
+    cached = get_many_tagged(list(keys.values()))
+    cards = []
+    for post in posts:
+        card = cached.get(keys[post.id])
+        if card is None:
+            card = render_post_card(post)
+            set_tagged(keys[post.id], card, post.cache_tags,
+                       CARD_CACHE_TIMEOUT)
+        cards.append(ARTICLE.format(card))
+    return ''.join(cards)
@@ -0,0 +1,67 @@
+import hashlib
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+from core.tags import get_tagged, set_tagged
+
+from .cache import CACHE_TIMEOUT, RELATED_TAG
+from .models import Category, Location
+
+CHOICES_PER_PAGE = 20
+
+SOURCES = {
+    'category': (Category, 'title'),
+    'location': (Location, 'name'),
+}
+
+
+def case_variants(text):
+    """
+    Варианты написания текста для сравнения без учёта регистра.
+
+    SQLite не учитывает регистр только у ASCII, поэтому кириллица
+    ищется по нескольким написаниям.
+    """
+    return {text, text.lower(), text.upper(), text.capitalize(), text.title()}
+
+
+def prefix_lookup(field, query):
+    """Условие «название начинается с ``query``» без учёта регистра."""
+    return reduce(or_, (Q(**{f'{field}__startswith': variant})
+                        for variant in case_variants(query)),
+                  Q(**{f'{field}__istartswith': query}))
+
+
+def name_lookup(field, name):
+    """Условие «название равно ``name``» без учёта регистра."""
+    return (Q(**{f'{field}__iexact': name})
+            | Q(**{f'{field}__in': case_variants(name)}))
+
+
+def search_choices(kind, query, page=1):
+    """
+    Опубликованные категории или местоположения по началу названия.
+
+    Результат страницы кэшируется до изменения любой категории или
+    местоположения; возвращает (варианты, есть ли следующая страница).
+    """
+    model, label_field = SOURCES[kind]
+    query = query.strip().lower()
+    query_hash = hashlib.md5(query.encode()).hexdigest()
+    key = f'blog:choices:{kind}:{page}:{query_hash}'
+    result = get_tagged(key)
+    if result is None:
+        start = (page - 1) * CHOICES_PER_PAGE
+        rows = list(model.objects.filter(
+            prefix_lookup(label_field, query), is_published=True,
+        ).order_by(label_field, 'pk').values_list(
+            'pk', label_field)[start:start + CHOICES_PER_PAGE + 1])
+        result = (
+            [{'id': pk, 'text': label}
+             for pk, label in rows[:CHOICES_PER_PAGE]],
+            len(rows) > CHOICES_PER_PAGE,
+        )
+        set_tagged(key, result, [RELATED_TAG], CACHE_TIMEOUT)
+    return result
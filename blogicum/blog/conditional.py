@@ -0,0 +1,28 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.utils import timezone
+
+from core.tags import get_tag_versions
+
+
+def version_time(version):
+    return datetime.fromtimestamp(version / 10 ** 9, tz=dt_timezone.utc)
+
+
+def get_posts_validators(posts, tags):
+    """
+    Дешёвые валидаторы (Last-Modified, токен ETag) для набора публикаций.
+
+    Правки публикаций, комментариев и связанных объектов меняют версии
+    тегов кэша. Без записи в базу набор меняется, только когда наступает
+    дата отложенной публикации, поэтому к версиям добавляется последняя
+    наступившая дата — один запрос с LIMIT 1 по индексу pub_date.
+    """
+    published = posts.filter(pub_date__lte=timezone.now()).order_by(
+        '-pub_date').values_list('pub_date', flat=True).first()
+    versions = get_tag_versions(tags)
+    times = [version_time(version) for version in versions.values()]
+    if published is not None:
+        times.append(published)
+    token = repr((published, sorted(versions.items())))
+    return max(times), token
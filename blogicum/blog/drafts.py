@@ -0,0 +1,115 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.cache import shared_cache
+
+from .models import PostDraft
+
+DRAFT_FIELDS = ('title', 'text', 'pub_date', 'location', 'category')
+SPLICE_FIELDS = ('text',)
+MAX_FIELD_LENGTH = 100000
+
+
+class DraftConflict(Exception):
+    """Автосохранение сделано от устаревшей версии черновика."""
+
+    def __init__(self, state):
+        super().__init__(state['version'])
+        self.state = state
+
+
+def draft_key(author_id, post_id):
+    return f'blog:draft:{author_id}:{post_id or "new"}'
+
+
+def load_draft(author_id, post_id):
+    """
+    Состояние черновика автора или None.
+
+    Сначала читается общий кэш, где копятся изменения, затем база.
+    """
+    state = shared_cache().get(draft_key(author_id, post_id))
+    if state is not None:
+        return state
+    draft = PostDraft.objects.filter(
+        author_id=author_id, post_id=post_id).first()
+    if draft is None:
+        return None
+    return {'data': draft.data, 'version': draft.version,
+            'flushed_at': time.time(), 'dirty': False}
+
+
+def apply_changes(data, changes):
+    """
+    Применить изменения формы к полям черновика.
+
+    Поля из ``SPLICE_FIELDS`` приходят заменой участка
+    ``{"at": начало, "remove": сколько удалить, "insert": что вставить}``,
+    остальные — новым значением целиком.
+    """
+    data = dict(data)
+    for field, change in changes.items():
+        if field not in DRAFT_FIELDS:
+            raise ValueError(f'Unknown field {field!r}')
+        if field in SPLICE_FIELDS and isinstance(change, dict):
+            old = data.get(field, '')
+            at, remove = int(change['at']), int(change['remove'])
+            if not 0 <= at <= len(old) or not 0 <= remove <= len(old) - at:
+                raise ValueError(f'Splice out of range for {field!r}')
+            change = old[:at] + str(change['insert']) + old[at + remove:]
+        if not isinstance(change, str) or len(change) > MAX_FIELD_LENGTH:
+            raise ValueError(f'Invalid value for {field!r}')
+        data[field] = change
+    return data
+
+
+def flush_draft(author_id, post_id, state):
+    PostDraft.objects.update_or_create(
+        author_id=author_id, post_id=post_id,
+        defaults={'data': state['data'], 'version': state['version']})
+    state['flushed_at'] = time.time()
+    state['dirty'] = False
+
+
+def save_draft(author_id, post_id, version, changes, flush=False,
+               initial=None):
+    """
+    Принять автосохранение, сделанное от версии ``version``.
+
+    Изменения сразу попадают в общий кэш, а в базу — не чаще раза в
+    DRAFT_FLUSH_INTERVAL секунд или по ``flush``, когда автор уходит со
+    страницы. Частые автосохранения стоят одной записи в кэш.
+    Новый черновик начинается с полей ``initial``: форма правки шлёт
+    текст заменой участка уже от текста публикации.
+    """
+    state = load_draft(author_id, post_id) or {
+        'data': dict(initial or {}), 'version': 0, 'flushed_at': 0,
+        'dirty': False}
+    if version != state['version']:
+        raise DraftConflict(state)
+    state['data'] = apply_changes(state['data'], changes)
+    state['version'] += 1
+    state['dirty'] = True
+    if flush or (time.time() - state['flushed_at']
+                 >= settings.DRAFT_FLUSH_INTERVAL):
+        flush_draft(author_id, post_id, state)
+    shared_cache().set(draft_key(author_id, post_id), state,
+                       settings.DRAFT_RETENTION_DAYS * 86400)
+    return state
+
+
+def discard_draft(author_id, post_id):
+    """Удалить черновик после публикации или сохранения правки."""
+    shared_cache().delete(draft_key(author_id, post_id))
+    PostDraft.objects.filter(author_id=author_id, post_id=post_id).delete()
+
+
+def purge_drafts(days=None):
+    """Удалить черновики, которые не менялись ``days`` дней."""
+    days = days or settings.DRAFT_RETENTION_DAYS
+    return PostDraft.objects.filter(
+        updated_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()[0]
@@ -0,0 +1,170 @@
+import hashlib
+
+from django.contrib.syndication.views import Feed
+from django.db.models.functions import Substr
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.views.generic import View
+
+from core.tags import get_tagged, set_tagged
+
+from .api import EXCERPT_LENGTH, visible_posts
+from .cache import (CACHE_TIMEOUT, FEED_TAG, RELATED_TAG, author_feed_tag,
+                    author_tag, category_feed_tag, category_tag,
+                    get_published_category)
+from .conditional import get_posts_validators
+from .mixins import ConditionalGetMixin
+from .models import User
+
+FEED_ITEMS = 20
+
+
+class PostFeed(Feed):
+    """RSS-лента записей сайта."""
+    title = 'Блогикум'
+    description = 'Новые публикации.'
+
+    def link(self, obj):
+        return reverse('blog:index')
+
+    def get_posts(self, obj):
+        return visible_posts()
+
+    def get_cache_tags(self, obj):
+        return [FEED_TAG, RELATED_TAG]
+
+    def items(self, obj):
+        return self.get_posts(obj).select_related(
+            'author', 'category'
+        ).defer('text').annotate(
+            excerpt=Substr('text', 1, EXCERPT_LENGTH)
+        ).order_by('-pub_date', '-pk')[:FEED_ITEMS]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.excerpt
+
+    def item_link(self, item):
+        return reverse('blog:post_detail', args=[item.pk])
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.get_username()
+
+    def item_categories(self, item):
+        return [item.category.title] if item.category else []
+
+
+class CategoryPostFeed(PostFeed):
+    """RSS-лента записей категории."""
+
+    def get_object(self, request, category_slug):
+        return get_published_category(category_slug)
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('blog:category_posts', args=[obj.slug])
+
+    def get_posts(self, obj):
+        return super().get_posts(obj).filter(category=obj)
+
+    def get_cache_tags(self, obj):
+        return [category_tag(obj.pk), category_feed_tag(obj.pk), RELATED_TAG]
+
+
+class AuthorPostFeed(PostFeed):
+    """RSS-лента опубликованных записей автора."""
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj):
+        return f'Блогикум: {obj.get_username()}'
+
+    def description(self, obj):
+        return f'Публикации пользователя {obj.get_username()}.'
+
+    def link(self, obj):
+        return reverse('blog:profile', args=[obj.get_username()])
+
+    def get_posts(self, obj):
+        return super().get_posts(obj).filter(author=obj)
+
+    def get_cache_tags(self, obj):
+        return [author_tag(obj.pk), author_feed_tag(obj.pk), RELATED_TAG]
+
+
+class AtomFeedMixin:
+    """Та же лента в формате Atom."""
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self._get_dynamic_attr('description', obj)
+
+
+class AtomPostFeed(AtomFeedMixin, PostFeed):
+    pass
+
+
+class AtomCategoryPostFeed(AtomFeedMixin, CategoryPostFeed):
+    pass
+
+
+class AtomAuthorPostFeed(AtomFeedMixin, AuthorPostFeed):
+    pass
+
+
+class CachedFeedView(View):
+    """Документ ленты из кэша; ключ включает токен валидаторов."""
+    feed_class = None
+    token = ''
+
+    def get_feed_object(self):
+        if not hasattr(self, 'feed_object'):
+            self.feed = self.feed_class()
+            self.feed_object = self.feed.get_object(
+                self.request, *self.args, **self.kwargs)
+        return self.feed_object
+
+    def get(self, request, *args, **kwargs):
+        obj = self.get_feed_object()
+        key = hashlib.md5(
+            f'{request.path}:{self.token}'.encode()).hexdigest()
+        key = f'blog:syndication:{key}'
+        document = get_tagged(key)
+        if document is None:
+            response = self.feed(request, *args, **kwargs)
+            document = (response.content, response['Content-Type'])
+            set_tagged(key, document, self.feed.get_cache_tags(obj),
+                       CACHE_TIMEOUT)
+        content, content_type = document
+        return HttpResponse(content, content_type=content_type)
+
+
+class FeedView(ConditionalGetMixin, CachedFeedView):
+    """
+    RSS/Atom-лента с ответом 304 для неизменившихся лент.
+
+    Видимость записей та же, что у ленты на главной; документ
+    пересобирается, только когда меняются валидаторы набора записей.
+    """
+
+    def get_validators(self):
+        obj = self.get_feed_object()
+        last_modified, self.token = get_posts_validators(
+            self.feed.get_posts(obj), self.feed.get_cache_tags(obj))
+        return last_modified, self.token
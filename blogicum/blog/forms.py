@@ -1,14 +1,141 @@
 from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse_lazy
+from django.utils.html import format_html
 
+from .choices import name_lookup
 from .models import Comment, Post, Profile
 
 
+class AutocompleteInput(forms.TextInput):
+    """
+    Поле ввода названия с подсказками из JSON-эндпоинта.
+
+    Видимое поле ``<name>_label`` показывает только название; первичный
+    ключ выбранного объекта отправляется скрытым полем ``<name>``.
+    Подсказки и ключ выбранного варианта подставляет скрипт
+    autocomplete.js; без скрипта название вводится вручную.
+    """
+    label_for = None
+
+    def value_from_datadict(self, data, files, name):
+        return data.get(name), data.get(f'{name}_label')
+
+    def value_omitted_from_data(self, data, files, name):
+        return name not in data and f'{name}_label' not in data
+
+    def render(self, name, value, attrs=None, renderer=None):
+        if isinstance(value, (list, tuple)):
+            pk, label = value
+        else:
+            pk = value
+            label = self.label_for(pk) if pk not in (None, '') else ''
+        attrs = {**(attrs or {})}
+        value_id = f'{attrs.get("id", f"id_{name}")}_value'
+        attrs.update({'list': f'{name}-choices', 'autocomplete': 'off',
+                      'data-value-input': value_id})
+        return (
+            super().render(f'{name}_label', label, attrs, renderer)
+            + format_html(
+                '<input type="hidden" name="{}" value="{}" id="{}">'
+                '<datalist id="{}-choices"></datalist>',
+                name, '' if pk is None else pk, value_id, name)
+        )
+
+
+class NamedChoiceField(forms.ModelChoiceField):
+    """
+    Выбор объекта по первичному ключу с вводом по названию.
+
+    Форма не строит список всех вариантов: в поле показывается название
+    выбранного объекта, а отправляется его ключ. Названия не уникальны,
+    поэтому по названию объект ищется, только если ключа нет или
+    название изменили без скрипта; совпадение с несколькими объектами —
+    ошибка, а не первый из них.
+    """
+    widget = AutocompleteInput
+    label_field = None
+    autocomplete_url = None
+    default_error_messages = {
+        'ambiguous_choice': 'Несколько вариантов с таким названием; '
+                            'выберите нужный из подсказок.',
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.widget.attrs['data-autocomplete-url'] = self.autocomplete_url
+        self.widget.label_for = self.label_for
+
+    def label_for(self, pk):
+        return self.queryset.filter(pk=pk).values_list(
+            self.label_field, flat=True).first() or ''
+
+    def choice_labels(self, choice):
+        """Написания, которыми скрипт показывает вариант в поле."""
+        label = getattr(choice, self.label_field)
+        return {label.casefold(), f'{label} (#{choice.pk})'.casefold()}
+
+    def choice_by_name(self, name):
+        choices = list(self.queryset.filter(
+            name_lookup(self.label_field, name)).order_by('pk')[:2])
+        if not choices:
+            raise ValidationError(self.error_messages['invalid_choice'],
+                                  code='invalid_choice')
+        if len(choices) > 1:
+            raise ValidationError(self.error_messages['ambiguous_choice'],
+                                  code='ambiguous_choice')
+        return choices[0]
+
+    def to_python(self, value):
+        pk, label = (value if isinstance(value, (list, tuple))
+                     else (value, None))
+        pk = str(pk).strip() if pk is not None else ''
+        if label is not None:
+            label = label.strip()
+            if not label:
+                return None
+        if pk.isdigit():
+            choice = super().to_python(pk)
+            if label is None or label.casefold() in self.choice_labels(
+                    choice):
+                return choice
+            return self.choice_by_name(label)
+        if pk or label:
+            return self.choice_by_name(pk or label)
+        return None
+
+    def has_changed(self, initial, data):
+        if self.disabled:
+            return False
+        try:
+            choice = self.to_python(data)
+        except ValidationError:
+            return True
+        initial = self.prepare_value(initial)
+        return (str(initial) if initial is not None else '') != (
+            str(choice.pk) if choice is not None else '')
+
+
+class CategoryChoiceField(NamedChoiceField):
+    label_field = 'title'
+    autocomplete_url = reverse_lazy('blog:choices', args=['category'])
+
+
+class LocationChoiceField(NamedChoiceField):
+    label_field = 'name'
+    autocomplete_url = reverse_lazy('blog:choices', args=['location'])
+
+
 class PostForm(forms.ModelForm):
 
     class Meta:
         model = Post
         fields = ('title', 'text', 'image',
                   'pub_date', 'location', 'category', 'is_published')
+        field_classes = {
+            'location': LocationChoiceField,
+            'category': CategoryChoiceField,
+        }
         widgets = {
             'pub_date': forms.DateTimeInput(attrs={'type': 'datetime-local'})
         }
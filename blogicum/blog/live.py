@@ -0,0 +1,124 @@
+import asyncio
+from urllib.parse import parse_qs
+
+from django.conf import settings
+from django.db.models import Max
+from django.template.loader import get_template
+from django.utils import timezone
+
+from core.asgi import CacheKeyWatcher, run_in_db_pool, send_plain
+from core.cache import shared_cache
+
+from .models import Comment, Post
+
+RETRY_MS = 3000
+
+watcher = CacheKeyWatcher(
+    interval=getattr(settings, 'COMMENT_EVENTS_POLL_INTERVAL', 1))
+
+
+def last_comment_key(post_id):
+    return f'blog:post:{post_id}:last-comment'
+
+
+def publish_comment(comment):
+    """Сообщить слушателям публикации о новом комментарии."""
+    shared_cache().set(last_comment_key(comment.post_id), comment.pk, None)
+
+
+def is_visible(post_id):
+    return Post.objects.filter(
+        pk=post_id,
+        is_published=True,
+        pub_date__lte=timezone.now(),
+        category__is_published=True,
+    ).exists()
+
+
+def resolve_last_event_id(post_id, last_event_id):
+    """
+    Номер последнего полученного события.
+
+    Без Last-Event-ID и параметра ``after`` поток начинается с текущего
+    последнего комментария.
+    """
+    try:
+        return int(last_event_id)
+    except (TypeError, ValueError):
+        return Comment.objects.filter(post_id=post_id).aggregate(
+            last=Max('pk'))['last'] or 0
+
+
+def fetch_events(post_id, after_id, limit=50):
+    """Готовые SSE-события для комментариев после ``after_id``."""
+    template = get_template('includes/comment.html')
+    comments = Comment.objects.filter(
+        post_id=post_id, pk__gt=after_id
+    ).select_related('author').order_by('pk')[:limit]
+    return [(comment.pk, format_event(comment.pk,
+                                      template.render({'comment': comment})))
+            for comment in comments]
+
+
+def format_event(event_id, html):
+    data = ''.join(f'data: {line}\n' for line in html.strip().splitlines())
+    return f'id: {event_id}\nevent: comment\n{data}\n'
+
+
+async def comment_events(scope, receive, send, post_id):
+    """
+    SSE-поток новых комментариев публикации для ASGI.
+
+    Ожидающее соединение не занимает потоков: проверку новых
+    комментариев для всех соединений процесса ведёт один ``watcher``.
+    """
+    post_id = int(post_id)
+    message = {'more_body': True}
+    while message.get('more_body'):
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
+    if not await run_in_db_pool(is_visible, post_id):
+        await send_plain(send, 404, b'Not Found', 'text/plain')
+        return
+    headers = dict(scope['headers'])
+    last_event_id = headers.get(b'last-event-id', b'').decode('latin-1')
+    if not last_event_id:
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        last_event_id = query.get('after', [''])[0]
+    after_id = await run_in_db_pool(
+        resolve_last_event_id, post_id, last_event_id)
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ],
+    })
+    await send({'type': 'http.response.body',
+                'body': f'retry: {RETRY_MS}\n\n'.encode(),
+                'more_body': True})
+    disconnected = asyncio.ensure_future(receive())
+    try:
+        while not disconnected.done():
+            waiting = asyncio.ensure_future(watcher.wait(
+                last_comment_key(post_id), after_id,
+                settings.COMMENT_EVENTS_HEARTBEAT))
+            await asyncio.wait({waiting, disconnected},
+                               return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                waiting.cancel()
+                break
+            if waiting.result() is None:
+                body = ': ping\n\n'
+            else:
+                events = await run_in_db_pool(fetch_events, post_id, after_id)
+                if events:
+                    after_id = events[-1][0]
+                body = ''.join(event for _, event in events)
+            await send({'type': 'http.response.body',
+                        'body': body.encode(), 'more_body': True})
+    finally:
+        disconnected.cancel()
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.benchmarks import BENCHMARKS
+
+
+class Command(BaseCommand):
+    help = 'Микробенчмарки блога; результаты в миллисекундах.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', metavar='name',
+                            help='Какие замеры запустить (по умолчанию все).')
+        parser.add_argument('--repeat', type=int, default=200)
+        parser.add_argument('--posts', type=int, default=10)
+        parser.add_argument('--rows', type=int, default=5000,
+                            help='Строк в таблицах для замеров админки.')
+        parser.add_argument('--concurrency', type=int, default=50,
+                            help='Одновременных клиентов.')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Потоков синхронного WSGI-сервера.')
+        parser.add_argument('--slow-client', type=float, default=0.05,
+                            help='Задержка медленного клиента, секунды.')
+        parser.add_argument('--url', default='/')
+
+    def handle(self, *args, **options):
+        unknown = set(options['names']) - set(BENCHMARKS)
+        if unknown:
+            raise CommandError(
+                f'Unknown benchmarks: {", ".join(sorted(unknown))}. '
+                f'Available: {", ".join(BENCHMARKS)}.')
+        for name in options['names'] or BENCHMARKS:
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            results = BENCHMARKS[name](**options)
+            for label, value in results.items():
+                self.stdout.write(f'  {label:<40} {value:>10.3f}')
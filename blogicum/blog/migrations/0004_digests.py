@@ -0,0 +1,43 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:50
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('blog', '0003_auto_20261019_0830'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DigestSubscription',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='auth.user')),
+                ('period', models.PositiveSmallIntegerField(choices=[(0, 'Не присылать'), (1, 'Раз в час'), (24, 'Раз в день'), (168, 'Раз в неделю')], default=24, verbose_name='Сводка о новых комментариях')),
+                ('last_sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Последняя сводка')),
+            ],
+            options={
+                'verbose_name': 'подписка на сводку',
+                'verbose_name_plural': 'Подписки на сводку',
+            },
+        ),
+        migrations.CreateModel(
+            name='CommentEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+                ('comment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.comment', verbose_name='Комментарий')),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Получатель')),
+            ],
+            options={
+                'verbose_name': 'событие комментария',
+                'verbose_name_plural': 'События комментариев',
+                'ordering': ('pk',),
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:52
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+
+
+def fill_comments_total(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Comment = apps.get_model('blog', 'Comment')
+    totals = Comment.objects.filter(
+        post_id=OuterRef('pk')
+    ).order_by().values('post_id').annotate(total=Count('pk')).values('total')
+    Post.objects.filter(comments__isnull=False).distinct().update(
+        comments_total=Subquery(totals))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_digests'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comments_total',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Счётчик комментариев; меняется атомарно при их добавлении и удалении.', verbose_name='Комментариев'),
+        ),
+        migrations.RunPython(fill_comments_total, migrations.RunPython.noop),
+    ]
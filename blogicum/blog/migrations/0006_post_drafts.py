@@ -0,0 +1,39 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:08
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0005_post_comments_total'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostDraft',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.JSONField(default=dict, verbose_name='Поля формы')),
+                ('version', models.PositiveIntegerField(default=0, verbose_name='Версия')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='Изменено')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.post', verbose_name='Публикация')),
+            ],
+            options={
+                'verbose_name': 'черновик',
+                'verbose_name_plural': 'Черновики',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='postdraft',
+            constraint=models.UniqueConstraint(fields=('author', 'post'), name='unique_post_draft'),
+        ),
+        migrations.AddConstraint(
+            model_name='postdraft',
+            constraint=models.UniqueConstraint(condition=models.Q(('post__isnull', True)), fields=('author',), name='unique_new_post_draft'),
+        ),
+    ]
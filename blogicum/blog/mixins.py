@@ -1,16 +1,156 @@
+import hashlib
+
+from django.conf import settings
 from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
 from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from core.swr import get_or_recompute
 
+from .cache import CachedCountPaginator
+from .drafts import discard_draft, load_draft
 from .forms import CommentForm
 from .models import Comment, Post
 
 
-class PostMixin:
+class TemplateEngineMixin:
+    """Mixin для выбора шаблонизатора представления в настройках."""
+
+    @property
+    def template_engine(self):
+        return settings.BLOG_TEMPLATE_ENGINES.get(type(self).__name__)
+
+
+class PostMixin(TemplateEngineMixin):
     """Mixin для публикаций."""
     model = Post
     template_name = 'blog/create.html'
 
 
+class CachedCountMixin:
+    """Mixin для кэширования числа записей в пагинации списков."""
+
+    def get_count_cache(self):
+        raise NotImplementedError
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        count_key, count_tags = self.get_count_cache()
+        return CachedCountPaginator(queryset, per_page,
+                                    count_key=count_key,
+                                    count_tags=count_tags,
+                                    **kwargs)
+
+
+class ConditionalGetMixin:
+    """
+    Mixin для ответа 304 по If-None-Match/If-Modified-Since.
+
+    Валидаторы считаются до основного запроса, поэтому неизменившаяся
+    страница не запрашивает список и не рендерит шаблон. Токен ETag
+    сохраняется в ``validator_token``, чтобы кэш страницы мог включать
+    его в ключ и не отдавать старое тело под новым ETag.
+    """
+    validator_token = ''
+
+    def get_validators(self):
+        """Вернуть (last_modified, token) или None, если объекта нет."""
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+        last_modified, token = validators
+        self.validator_token = token
+        etag = hashlib.md5(
+            f'{request.user.pk}:{token}'.encode()).hexdigest()
+        view = condition(
+            etag_func=lambda request, *args, **kwargs: etag,
+            last_modified_func=lambda request, *args, **kwargs: last_modified,
+        )(super().get)
+        response = view(request, *args, **kwargs)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class StaleWhileRevalidateMixin:
+    """
+    Mixin для кэширования страниц анонимных читателей.
+
+    Истёкшая страница отдаётся устаревшей, пока её пересчитывает один
+    процесс; изменение объектов из ``get_cache_tags`` сбрасывает её сразу.
+    Ключ включает токен ETag (``validator_token`` из ConditionalGetMixin):
+    новый комментарий меняет ETag, но не теги ленты, и страница под
+    новым ETag должна быть пересобрана.
+    """
+    validator_token = ''
+    page_cache_ttl = 60
+    page_cache_stale_ttl = 300
+
+    def get_cache_tags(self):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().get(request, *args, **kwargs)
+
+        def render():
+            response = super(StaleWhileRevalidateMixin, self).get(
+                request, *args, **kwargs)
+            response.render()
+            return response.content, response['Content-Type']
+
+        path_hash = hashlib.md5(
+            f'{request.get_full_path()}:{self.validator_token}'.encode()
+        ).hexdigest()
+        content, content_type = get_or_recompute(
+            f'blog:page:{path_hash}',
+            render,
+            tags=self.get_cache_tags(),
+            ttl=self.page_cache_ttl,
+            stale_ttl=self.page_cache_stale_ttl,
+        )
+        return HttpResponse(content, content_type=content_type)
+
+
+class DraftMixin:
+    """
+    Mixin для автосохранения формы публикации.
+
+    Открытая форма заполняется полями черновика, а после сохранения
+    публикации черновик удаляется.
+    """
+
+    def get_draft_post_id(self):
+        return self.kwargs.get('post_id')
+
+    def get_initial(self):
+        initial = super().get_initial()
+        self.draft = None
+        if self.request.method == 'GET':
+            self.draft = load_draft(self.request.user.pk,
+                                    self.get_draft_post_id())
+        if self.draft:
+            initial.update(self.draft['data'])
+        return initial
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        post_id = self.get_draft_post_id()
+        context['draft_url'] = reverse(
+            'blog:post_draft', args=[post_id] if post_id else [])
+        context['draft_version'] = (self.draft or {}).get('version', 0)
+        context['draft_restored'] = bool(self.draft and self.draft['data'])
+        return context
+
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        discard_draft(self.request.user.pk, self.get_draft_post_id())
+        return response
+
+
 class PostSuccessUrlMixin:
     """
     Mixin для переадресации после создания или удаления поста.
@@ -21,7 +161,7 @@ class PostSuccessUrlMixin:
                        kwargs={'username': self.request.user.username})
 
 
-class CommentMixin:
+class CommentMixin(TemplateEngineMixin):
     """Mixin для комментариев."""
     model = Comment
     template_name = 'blog/comment.html'
@@ -45,6 +45,7 @@ class Post(BaseModel):
                               blank=True,
                               verbose_name='Изображение')
     pub_date = models.DateTimeField(
+        db_index=True,
         verbose_name='Дата и время публикации',
         help_text='Если установить дату и время в будущем — '
         'можно делать отложенные публикации.')
@@ -66,6 +67,12 @@ class Post(BaseModel):
         null=True,
         verbose_name='Категория'
     )
+    comments_total = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Комментариев',
+        help_text='Счётчик комментариев; меняется атомарно при их '
+        'добавлении и удалении.')
 
     class Meta:
         verbose_name = 'публикация'
@@ -77,6 +84,16 @@ class Post(BaseModel):
     def get_absolute_url(self):
         return reverse('post:detail', kwargs={'pk': self.pk})
 
+    @property
+    def cache_tags(self):
+        """Теги кэша объектов, от которых зависит карточка публикации."""
+        tags = [f'post:{self.pk}',
+                f'category:{self.category_id}',
+                f'author:{self.author_id}']
+        if self.location_id:
+            tags.append(f'location:{self.location_id}')
+        return tags
+
 
 class Comment(BaseModel):
     text = models.TextField(
@@ -94,6 +111,7 @@ class Comment(BaseModel):
         on_delete=models.CASCADE,
         verbose_name="Автор"
     )
+    updated_at = None
 
     class Meta:
         verbose_name = 'комментарий'
@@ -115,3 +133,88 @@ class Profile(models.Model):
 
     def __str__(self):
         return self.user
+
+
+class DigestSubscription(models.Model):
+    """
+    Настройка сводки о новых комментариях к публикациям автора.
+
+    Строка появляется, только когда пользователь меняет период или
+    получает первую сводку; без неё действует период по умолчанию.
+    """
+
+    class Period(models.IntegerChoices):
+        OFF = 0, 'Не присылать'
+        HOURLY = 1, 'Раз в час'
+        DAILY = 24, 'Раз в день'
+        WEEKLY = 168, 'Раз в неделю'
+
+    user = models.OneToOneField(User,
+                                on_delete=models.CASCADE,
+                                primary_key=True,
+                                related_name='+')
+    period = models.PositiveSmallIntegerField(
+        choices=Period.choices,
+        default=Period.DAILY,
+        verbose_name='Сводка о новых комментариях')
+    last_sent_at = models.DateTimeField(null=True,
+                                        blank=True,
+                                        verbose_name='Последняя сводка')
+
+    class Meta:
+        verbose_name = 'подписка на сводку'
+        verbose_name_plural = 'Подписки на сводку'
+
+
+class CommentEvent(models.Model):
+    """Новый комментарий, ещё не вошедший в сводку автора публикации."""
+    recipient = models.ForeignKey(User,
+                                  on_delete=models.CASCADE,
+                                  related_name='+',
+                                  verbose_name='Получатель')
+    comment = models.ForeignKey(Comment,
+                                on_delete=models.CASCADE,
+                                related_name='+',
+                                verbose_name='Комментарий')
+    created_at = models.DateTimeField(auto_now_add=True,
+                                      verbose_name='Добавлено')
+
+    class Meta:
+        verbose_name = 'событие комментария'
+        verbose_name_plural = 'События комментариев'
+        ordering = ('pk',)
+
+
+class PostDraft(models.Model):
+    """
+    Автосохранённый черновик новой публикации или правки существующей.
+
+    Хранит только поля, изменённые в форме; ``version`` растёт с каждым
+    принятым автосохранением.
+    """
+    author = models.ForeignKey(User,
+                               on_delete=models.CASCADE,
+                               related_name='+',
+                               verbose_name='Автор')
+    post = models.ForeignKey(Post,
+                             on_delete=models.CASCADE,
+                             null=True,
+                             blank=True,
+                             related_name='+',
+                             verbose_name='Публикация')
+    data = models.JSONField(default=dict, verbose_name='Поля формы')
+    version = models.PositiveIntegerField(default=0, verbose_name='Версия')
+    updated_at = models.DateTimeField(auto_now=True,
+                                      db_index=True,
+                                      verbose_name='Изменено')
+
+    class Meta:
+        verbose_name = 'черновик'
+        verbose_name_plural = 'Черновики'
+        constraints = (
+            models.UniqueConstraint(fields=('author', 'post'),
+                                    name='unique_post_draft'),
+            models.UniqueConstraint(fields=('author',),
+                                    condition=models.Q(post__isnull=True),
+                                    name='unique_new_post_draft'),
+        )
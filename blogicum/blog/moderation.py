@@ -0,0 +1,152 @@
+from sqlite3 import sqlite_version_info
+
+from django.db import connection, transaction
+from django.db.models import (Count, F, IntegerField, OuterRef, Subquery,
+                              Value)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.tags import invalidate_tags
+
+from .cache import (FEED_TAG, author_feed_tag, category_feed_tag, post_tag,
+                    sitemap_shard, sitemap_tag)
+from .models import Comment, CommentEvent, Post, PostDraft
+
+BATCH_SIZE = 500
+
+
+def pk_batches(queryset, batch_size=BATCH_SIZE):
+    """
+    Первичные ключи выборки пачками по возрастанию ключа.
+
+    Каждая пачка читается отдельным запросом от последнего ключа
+    предыдущей, поэтому строки, изменённые обработкой пачки, не сдвигают
+    следующие.
+    """
+    queryset = queryset.order_by('pk').values_list('pk', flat=True)
+    last = None
+    while True:
+        batch = queryset if last is None else queryset.filter(pk__gt=last)
+        batch = list(batch[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last = batch[-1]
+
+
+def post_tags(rows):
+    """
+    Теги кэша публикаций, лент и шардов карты сайта по строкам
+    (pk, category_id, author_id).
+    """
+    tags = {FEED_TAG}
+    for pk, category_id, author_id in rows:
+        tags |= {post_tag(pk), category_feed_tag(category_id),
+                 author_feed_tag(author_id),
+                 sitemap_tag('posts', sitemap_shard(pk)),
+                 sitemap_tag('profiles', sitemap_shard(author_id))}
+    return tags
+
+
+def update_posts(queryset, **fields):
+    """
+    Изменить публикации выборки одним UPDATE на пачку.
+
+    Сигналы сохранения не вызываются; кэш сбрасывается по тегам всех
+    затронутых публикаций, включая ленты прежних категорий.
+    """
+    fields['updated_at'] = timezone.now()
+    updated = 0
+    for batch in pk_batches(queryset):
+        posts = Post.objects.filter(pk__in=batch)
+        with transaction.atomic():
+            rows = list(posts.values_list('pk', 'category_id', 'author_id'))
+            updated += posts.update(**fields)
+        tags = post_tags(rows)
+        if 'category' in fields:
+            tags |= post_tags((pk, fields['category'].pk, author_id)
+                              for pk, _, author_id in rows)
+        invalidate_tags(tags)
+    return updated
+
+
+def delete_posts(queryset):
+    """
+    Удалить публикации выборки вместе с комментариями и черновиками.
+
+    Строки удаляются запросами DELETE по пачкам, без загрузки объектов
+    и сигналов удаления для каждого комментария.
+    """
+    deleted = 0
+    for batch in pk_batches(queryset):
+        posts = Post.objects.filter(pk__in=batch)
+        comments = Comment.objects.filter(post_id__in=batch)
+        with transaction.atomic():
+            rows = list(posts.values_list('pk', 'category_id', 'author_id'))
+            CommentEvent.objects.filter(
+                comment__in=comments)._raw_delete(CommentEvent.objects.db)
+            comments._raw_delete(comments.db)
+            PostDraft.objects.filter(
+                post_id__in=batch)._raw_delete(PostDraft.objects.db)
+            deleted += posts._raw_delete(posts.db)
+        invalidate_tags(post_tags(rows))
+    return deleted
+
+
+def can_update_returning():
+    return (connection.vendor == 'postgresql'
+            or connection.vendor == 'sqlite'
+            and sqlite_version_info >= (3, 35))
+
+
+def change_comments_total(post_id, delta):
+    """
+    Изменить счётчик комментариев публикации и вернуть новое значение.
+
+    Где база поддерживает UPDATE ... RETURNING, значение возвращает сам
+    UPDATE; иначе оно перечитывается в той же транзакции, пока строка
+    заблокирована. Счётчик не опускается ниже нуля; если строка не
+    изменилась, возвращается None.
+    """
+    if not can_update_returning():
+        with transaction.atomic():
+            posts = Post.objects.filter(
+                pk=post_id, comments_total__gte=-delta)
+            if not posts.update(comments_total=F('comments_total') + delta):
+                return None
+            return posts.values_list('comments_total', flat=True).first()
+    quote = connection.ops.quote_name
+    column = quote(Post._meta.get_field('comments_total').column)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {quote(Post._meta.db_table)} '
+            f'SET {column} = {column} + %s '
+            f'WHERE {quote(Post._meta.pk.column)} = %s '
+            f'AND {column} + %s >= 0 RETURNING {column}',
+            [delta, post_id, delta])
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def recount_comments(post_ids):
+    """Пересчитать счётчики комментариев публикаций одним UPDATE."""
+    totals = Comment.objects.filter(
+        post_id=OuterRef('pk')
+    ).order_by().values('post_id').annotate(total=Count('pk')).values('total')
+    Post.objects.filter(pk__in=post_ids).update(comments_total=Coalesce(
+        Subquery(totals, output_field=IntegerField()), Value(0)))
+
+
+def delete_comments(queryset):
+    """Удалить комментарии выборки пачками и пересчитать счётчики."""
+    deleted = 0
+    for batch in pk_batches(queryset):
+        comments = Comment.objects.filter(pk__in=batch)
+        with transaction.atomic():
+            post_ids = set(comments.values_list('post_id', flat=True))
+            CommentEvent.objects.filter(
+                comment_id__in=batch)._raw_delete(CommentEvent.objects.db)
+            deleted += comments._raw_delete(comments.db)
+            recount_comments(post_ids)
+        invalidate_tags(post_tag(post_id) for post_id in post_ids)
+    return deleted
@@ -0,0 +1,116 @@
+from itertools import groupby
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import CommentEvent, DigestSubscription
+
+
+def record_comment(comment):
+    """Запомнить комментарий для сводки автора публикации."""
+    recipient_id = comment.post.author_id
+    if recipient_id != comment.author_id:
+        CommentEvent.objects.create(recipient_id=recipient_id,
+                                    comment=comment)
+
+
+def hour_slot(moment):
+    """Номер часа с начала эпохи."""
+    return int(moment.timestamp() // 3600)
+
+
+def is_due(subscription, now):
+    """
+    Подошёл ли срок сводки.
+
+    Сравниваются номера часов, а не точное время: ежечасная задача
+    запускается с разбросом в несколько секунд и иначе пропускала бы
+    каждый второй запуск.
+    """
+    if subscription is None or subscription.last_sent_at is None:
+        return True
+    return hour_slot(now) - hour_slot(
+        subscription.last_sent_at) >= subscription.period
+
+
+def build_digest(recipient, events):
+    """Письмо-сводка: комментарии, сгруппированные по публикациям."""
+    posts = []
+    for post, post_events in groupby(events, lambda event: event.comment.post):
+        comments = [event.comment for event in post_events]
+        posts.append({
+            'post': post,
+            'url': settings.SITE_URL + reverse('blog:post_detail',
+                                               args=[post.pk]),
+            'count': len(comments),
+            'comments': comments[-settings.DIGEST_COMMENTS_PER_POST:],
+        })
+    body = render_to_string('emails/comment_digest.txt', {
+        'recipient': recipient,
+        'posts': posts,
+        'total': len(events),
+        'settings_url': settings.SITE_URL + reverse('blog:digest_settings'),
+    })
+    return EmailMessage(
+        subject=f'Новые комментарии к вашим публикациям: {len(events)}',
+        body=body,
+        to=[recipient.email],
+    )
+
+
+def send_digests(batch_size=100):
+    """
+    Разослать сводки авторам, у которых подошёл срок.
+
+    Получатели обрабатываются пачками: по одному запросу на подписки и
+    события пачки, одна отправка писем и одно удаление событий.
+    """
+    now = timezone.now()
+    recipient_ids = list(CommentEvent.objects.order_by(
+        'recipient_id').values_list('recipient_id', flat=True).distinct())
+    sent = 0
+    for start in range(0, len(recipient_ids), batch_size):
+        chunk = recipient_ids[start:start + batch_size]
+        subscriptions = DigestSubscription.objects.in_bulk(chunk)
+        muted = [user_id for user_id in chunk
+                 if user_id in subscriptions
+                 and subscriptions[user_id].period
+                 == DigestSubscription.Period.OFF]
+        due = [user_id for user_id in chunk
+               if user_id not in muted
+               and is_due(subscriptions.get(user_id), now)]
+        CommentEvent.objects.filter(recipient_id__in=muted).delete()
+        if not due:
+            continue
+        events = list(CommentEvent.objects.filter(
+            recipient_id__in=due, created_at__lte=now
+        ).select_related(
+            'recipient', 'comment__author', 'comment__post'
+        ).order_by('recipient_id', 'comment__post_id', 'pk'))
+        messages = [
+            build_digest(recipient, list(recipient_events))
+            for recipient, recipient_events in groupby(
+                events, lambda event: event.recipient)
+            if recipient.email
+        ]
+        get_connection().send_messages(messages)
+        if events:
+            CommentEvent.objects.filter(
+                recipient_id__in=due, pk__lte=max(event.pk for event in events)
+            ).delete()
+        existing, created = [], []
+        for user_id in due:
+            subscription = subscriptions.get(user_id)
+            if subscription is None:
+                created.append(
+                    DigestSubscription(user_id=user_id, last_sent_at=now))
+            else:
+                subscription.last_sent_at = now
+                existing.append(subscription)
+        DigestSubscription.objects.bulk_update(existing, ['last_sent_at'])
+        DigestSubscription.objects.bulk_create(created, ignore_conflicts=True)
+        sent += len(messages)
+    return sent
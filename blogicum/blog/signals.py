@@ -0,0 +1,158 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+from django.urls import reverse
+
+from core.tags import invalidate_tags
+
+from .cache import (COMMENTS_TAG, FEED_TAG, RELATED_TAG, SITEMAP_TAG,
+                    author_comments_tag, author_feed_tag, author_tag,
+                    category_comments_tag, category_feed_tag, category_tag,
+                    location_tag, post_tag, sitemap_shard, sitemap_tag)
+from .live import publish_comment
+from .moderation import change_comments_total
+from .models import Category, Comment, Location, Post, User
+from .notifications import record_comment
+from .tasks import warm_pages
+
+
+@receiver(pre_save, sender=Post)
+def post_before_save(sender, instance, **kwargs):
+    instance._previous_relations = Post.objects.filter(
+        pk=instance.pk
+    ).values('category_id', 'author_id').first() if instance.pk else None
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_changed(sender, instance, **kwargs):
+    relations = [{'category_id': instance.category_id,
+                  'author_id': instance.author_id}]
+    previous = getattr(instance, '_previous_relations', None)
+    if previous:
+        relations.append(previous)
+    tags = {post_tag(instance.pk), FEED_TAG,
+            sitemap_tag('posts', sitemap_shard(instance.pk))}
+    for related in relations:
+        tags.add(category_feed_tag(related['category_id']))
+        tags.add(author_feed_tag(related['author_id']))
+        tags.add(sitemap_tag('profiles',
+                             sitemap_shard(related['author_id'])))
+    invalidate_tags(tags)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, **kwargs):
+    # Без обработчика очереди прогрев выполнялся бы в самом запросе.
+    if not instance.is_published or getattr(settings, 'TASKS_EAGER', False):
+        return
+    paths = [reverse('blog:index')]
+    if instance.category_id and instance.category.is_published:
+        paths.append(reverse('blog:category_posts',
+                             args=[instance.category.slug]))
+    key = f'warm:post:{instance.pk}:{instance.updated_at.timestamp()}'
+    transaction.on_commit(
+        lambda: warm_pages.enqueue(paths, idempotency_key=key))
+
+
+@receiver(post_save, sender=Comment)
+def comment_counted(sender, instance, created, **kwargs):
+    if not created:
+        return
+    total = change_comments_total(instance.post_id, 1)
+    if total is not None and Comment.post.is_cached(instance):
+        instance.post.comments_total = total
+
+
+@receiver(post_delete, sender=Comment)
+def comment_uncounted(sender, instance, **kwargs):
+    change_comments_total(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    tags = [post_tag(instance.post_id)]
+    if Comment.post.is_cached(instance):
+        post = {'category_id': instance.post.category_id,
+                'author_id': instance.post.author_id}
+    else:
+        post = Post.objects.filter(pk=instance.post_id).values(
+            'category_id', 'author_id').first()
+    # Счётчики комментариев показаны и в лентах с публикацией.
+    if post is not None:
+        tags += [COMMENTS_TAG,
+                 category_comments_tag(post['category_id']),
+                 author_comments_tag(post['author_id'])]
+    invalidate_tags(tags)
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if not created:
+        return
+
+    def notify():
+        record_comment(instance)
+        publish_comment(instance)
+    transaction.on_commit(notify)
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    invalidate_tags([category_tag(instance.pk),
+                     category_feed_tag(instance.pk),
+                     FEED_TAG,
+                     RELATED_TAG,
+                     SITEMAP_TAG])
+
+
+@receiver(post_save, sender=Location)
+@receiver(pre_delete, sender=Location)
+def location_changed(sender, instance, **kwargs):
+    invalidate_tags([location_tag(instance.pk), RELATED_TAG])
+
+
+def is_login_only(update_fields):
+    return update_fields is not None and set(update_fields) == {'last_login'}
+
+
+@receiver(pre_save, sender=User)
+def user_before_save(sender, instance, update_fields=None, **kwargs):
+    instance._previous_username = User.objects.filter(
+        pk=instance.pk
+    ).values_list('username', flat=True).first() if (
+        instance.pk and not is_login_only(update_fields)) else None
+
+
+def username_tags(user_id):
+    """
+    Теги страниц, на которых показано имя пользователя: ленты с его
+    публикациями и публикации с его комментариями.
+    """
+    posts = Post.objects.filter(author_id=user_id)
+    tags = {FEED_TAG} if posts.exists() else set()
+    tags.update(category_feed_tag(category_id) for category_id in
+                posts.values_list('category_id', flat=True).distinct()
+                if category_id)
+    tags.update(post_tag(post_id) for post_id in
+                Comment.objects.filter(author_id=user_id).values_list(
+                    'post_id', flat=True).distinct())
+    return tags
+
+
+@receiver(post_save, sender=User)
+@receiver(pre_delete, sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    if is_login_only(update_fields):
+        return
+    tags = {author_tag(instance.pk),
+            author_feed_tag(instance.pk),
+            sitemap_tag('profiles', sitemap_shard(instance.pk))}
+    previous = getattr(instance, '_previous_username', None)
+    if previous is not None and previous != instance.username:
+        tags |= username_tags(instance.pk)
+    invalidate_tags(tags)
@@ -0,0 +1,160 @@
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Exists, Max, OuterRef
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.views.generic import View
+
+from core.tags import get_tag_versions, get_tagged, set_tagged
+
+from .api import visible_posts
+from .cache import SITEMAP_SHARD_SIZE, SITEMAP_TAG, sitemap_tag
+from .conditional import version_time
+from .mixins import ConditionalGetMixin
+from .models import Category, Post, User
+
+SITEMAP_CHUNK_SIZE = 1000
+SITEMAP_TIMEOUT = 60 * 60
+CONTENT_TYPE = 'application/xml; charset=utf-8'
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def post_rows(start, stop):
+    return visible_posts().filter(
+        pk__gte=start, pk__lt=stop).values_list('pk', 'updated_at')
+
+
+def post_entry(pk, updated_at):
+    return reverse('blog:post_detail', args=[pk]), updated_at
+
+
+def category_rows(start, stop):
+    return Category.objects.filter(
+        is_published=True, pk__gte=start, pk__lt=stop
+    ).values_list('slug', 'updated_at')
+
+
+def category_entry(slug, updated_at):
+    return reverse('blog:category_posts', args=[slug]), updated_at
+
+
+def profile_rows(start, stop):
+    """Профили авторов хотя бы одной видимой публикации."""
+    return User.objects.filter(
+        Exists(visible_posts().filter(author_id=OuterRef('pk'))),
+        pk__gte=start, pk__lt=stop,
+    ).values_list('username')
+
+
+def profile_entry(username):
+    return reverse('blog:profile', args=[username]), None
+
+
+SECTIONS = {
+    'posts': (Post, post_rows, post_entry),
+    'categories': (Category, category_rows, category_entry),
+    'profiles': (User, profile_rows, profile_entry),
+}
+
+
+def shard_rows(section, shard):
+    _, rows, _ = SECTIONS[section]
+    start = shard * SITEMAP_SHARD_SIZE
+    return rows(start, start + SITEMAP_SHARD_SIZE)
+
+
+def shard_count(section):
+    """Число шардов раздела: шард n покрывает ключи [n*size, (n+1)*size)."""
+    model, _, _ = SECTIONS[section]
+    last = model.objects.aggregate(last=Max('pk'))['last']
+    return 0 if last is None else last // SITEMAP_SHARD_SIZE + 1
+
+
+def shard_tags(section, shard):
+    return [sitemap_tag(section, shard), SITEMAP_TAG]
+
+
+def render_shard(section, shard):
+    """
+    XML шарда раздела.
+
+    Строки читаются итератором пачками по SITEMAP_CHUNK_SIZE, поэтому в
+    памяти держится один шард, а не вся таблица.
+    """
+    _, _, entry = SECTIONS[section]
+    rows = shard_rows(section, shard).order_by('pk').iterator(
+        chunk_size=SITEMAP_CHUNK_SIZE)
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n',
+             f'<urlset xmlns="{XMLNS}">\n']
+    for row in rows:
+        location, lastmod = entry(*row)
+        parts.append(f'<url><loc>{escape(settings.SITE_URL + location)}'
+                     '</loc>')
+        if lastmod is not None:
+            parts.append(f'<lastmod>{lastmod.date().isoformat()}</lastmod>')
+        parts.append('</url>\n')
+    parts.append('</urlset>\n')
+    return ''.join(parts).encode()
+
+
+def get_shard(section, shard, visible):
+    """
+    XML шарда из кэша; пересобирается только шард со сброшенным тегом.
+
+    Ключ включает число видимых строк шарда, чтобы содержимое всегда
+    соответствовало валидаторам ответа.
+    """
+    key = f'blog:sitemap:{section}:{shard}:{visible}'
+    content = get_tagged(key)
+    if content is None:
+        content = render_shard(section, shard)
+        set_tagged(key, content, shard_tags(section, shard), SITEMAP_TIMEOUT)
+    return content
+
+
+def render_index():
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n',
+             f'<sitemapindex xmlns="{XMLNS}">\n']
+    for section in SECTIONS:
+        for shard in range(shard_count(section)):
+            location = settings.SITE_URL + reverse(
+                'blog:sitemap_shard', args=[section, shard])
+            parts.append(f'<sitemap><loc>{escape(location)}</loc></sitemap>\n')
+    parts.append('</sitemapindex>\n')
+    return ''.join(parts).encode()
+
+
+class SitemapIndexView(View):
+    """Индекс карты сайта: по ссылке на каждый шард каждого раздела."""
+
+    def get(self, request):
+        return HttpResponse(render_index(), content_type=CONTENT_TYPE)
+
+
+class CachedShardView(View):
+    """XML шарда из кэша."""
+    visible = None
+
+    def get(self, request, section, shard):
+        return HttpResponse(get_shard(section, shard, self.visible),
+                            content_type=CONTENT_TYPE)
+
+
+class SitemapShardView(ConditionalGetMixin, CachedShardView):
+    """
+    Шард карты сайта.
+
+    Валидаторы — версии тегов шарда и число его видимых строк: число
+    меняется, когда наступает дата отложенной публикации. Ответ 304 не
+    читает строки шарда.
+    """
+
+    def get_validators(self):
+        section, shard = self.kwargs['section'], self.kwargs['shard']
+        if section not in SECTIONS or shard >= shard_count(section):
+            raise Http404()
+        versions = get_tag_versions(shard_tags(section, shard))
+        self.visible = shard_rows(section, shard).count()
+        return (max(version_time(version) for version in versions.values()),
+                repr((self.visible, sorted(versions.items()))))
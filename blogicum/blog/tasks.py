@@ -0,0 +1,55 @@
+import logging
+
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.test import RequestFactory
+from django.urls import resolve
+
+from core.tasks import task
+
+from . import drafts, notifications
+from .mixins import StaleWhileRevalidateMixin
+
+logger = logging.getLogger(__name__)
+
+
+@task(name='blog.warm_pages', max_attempts=3)
+def warm_pages(paths):
+    """
+    Отрендерить страницы для анонимного читателя, чтобы заполнить кэш.
+
+    Представление вызывается напрямую, без middleware и HTTP-клиента;
+    пути представлений без кэша страниц пропускаются.
+    """
+    factory = RequestFactory(SERVER_NAME='localhost')
+    for path in paths:
+        match = resolve(path)
+        view_class = getattr(match.func, 'view_class', None)
+        if view_class is None or not issubclass(
+                view_class, StaleWhileRevalidateMixin):
+            logger.debug('Skipped %s: the page is not cached', path)
+            continue
+        request = factory.get(path)
+        request.user = AnonymousUser()
+        try:
+            response = match.func(request, *match.args, **match.kwargs)
+        except Http404:
+            logger.debug('Skipped %s: not found', path)
+            continue
+        if response.status_code >= 500:
+            raise RuntimeError(f'{path} answered {response.status_code}')
+        logger.debug('Warmed %s: %s', path, response.status_code)
+
+
+@task(name='blog.send_digests', max_attempts=1, every=3600)
+def send_digests(batch_size=100):
+    """Сводки о новых комментариях авторам, у которых подошёл срок."""
+    sent = notifications.send_digests(batch_size)
+    logger.info('Sent %s comment digests', sent)
+
+
+@task(name='blog.purge_drafts', max_attempts=1, every=86400)
+def purge_drafts():
+    """Удалить черновики, брошенные дольше DRAFT_RETENTION_DAYS дней."""
+    deleted = drafts.purge_drafts()
+    logger.info('Purged %s abandoned drafts', deleted)
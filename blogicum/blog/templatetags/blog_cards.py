@@ -0,0 +1,12 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from blog.cards import render_post_cards
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_cards(posts):
+    """Все карточки страницы без {% include %} на каждой итерации."""
+    return mark_safe(render_post_cards(posts))
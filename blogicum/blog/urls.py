@@ -1,39 +1,102 @@
 from django.urls import path
 
+from core.asgi import read_view
+
+from .api import (AuthorFeedView,
+                  CategoryFeedView,
+                  CommentListApiView,
+                  PostDetailApiView,
+                  PostFeedView)
+from .feeds import (AtomAuthorPostFeed,
+                    AtomCategoryPostFeed,
+                    AtomPostFeed,
+                    AuthorPostFeed,
+                    CategoryPostFeed,
+                    FeedView,
+                    PostFeed)
+from .sitemaps import SitemapIndexView, SitemapShardView
 from .views import (PostListView,
                     CategoryListView,
                     PostDetailView,
+                    PostEventsView,
+                    ChoicesView,
                     PostCreateView,
+                    PostDraftView,
                     PostUpdateView,
                     PostDeleteView,
                     CommentCreateView,
+                    CommentCreateJSONView,
                     CommentUpdateView,
                     CommentDeleteView,
                     ProfileDetailView,
+                    DigestSettingsView,
                     ProfileUpdateView)
 
 app_name = 'blog'
 
 urlpatterns = [
-    path('', PostListView.as_view(), name='index'),
+    path('', read_view(PostListView.as_view()), name='index'),
     path('category/<slug:category_slug>/',
-         CategoryListView.as_view(), name='category_posts'),
+         read_view(CategoryListView.as_view()), name='category_posts'),
     path('posts/<int:pk>/',
-         PostDetailView.as_view(), name='post_detail'),
+         read_view(PostDetailView.as_view()), name='post_detail'),
+    path('posts/<int:pk>/events/',
+         PostEventsView.as_view(), name='post_events'),
+    path('choices/<slug:kind>/',
+         read_view(ChoicesView.as_view()), name='choices'),
     path('posts/create/',
          PostCreateView.as_view(), name='create_post'),
+    path('posts/draft/',
+         PostDraftView.as_view(), name='post_draft'),
+    path('posts/<int:post_id>/draft/',
+         PostDraftView.as_view(), name='post_draft'),
     path('posts/<int:post_id>/edit/',
          PostUpdateView.as_view(), name='edit_post'),
     path('posts/<int:post_id>/delete/',
          PostDeleteView.as_view(), name='delete_post'),
     path('posts/<int:post_id>/comment/create/',
          CommentCreateView.as_view(), name='add_comment'),
+    path('posts/<int:post_id>/comments/',
+         CommentCreateJSONView.as_view(), name='add_comment_json'),
     path('posts/<int:post_id>/comment/<int:pk>/update/',
          CommentUpdateView.as_view(), name='edit_comment'),
     path('posts/<int:post_id>/delete_comment/<int:pk>/',
          CommentDeleteView.as_view(), name='delete_comment'),
     path('profile/<slug:username>/',
-         ProfileDetailView.as_view(), name='profile'),
+         read_view(ProfileDetailView.as_view()), name='profile'),
     path('user/<slug:username>/update/',
-         ProfileUpdateView.as_view(), name='edit_profile')
+         ProfileUpdateView.as_view(), name='edit_profile'),
+    path('user/digest/',
+         DigestSettingsView.as_view(), name='digest_settings'),
+    path('api/v1/posts/',
+         read_view(PostFeedView.as_view()), name='api_posts'),
+    path('api/v1/categories/<slug:category_slug>/posts/',
+         read_view(CategoryFeedView.as_view()),
+         name='api_category_posts'),
+    path('api/v1/authors/<slug:username>/posts/',
+         read_view(AuthorFeedView.as_view()), name='api_author_posts'),
+    path('api/v1/posts/<int:pk>/',
+         read_view(PostDetailApiView.as_view()), name='api_post_detail'),
+    path('api/v1/posts/<int:pk>/comments/',
+         read_view(CommentListApiView.as_view()), name='api_comments'),
+    path('feeds/rss/',
+         read_view(FeedView.as_view(feed_class=PostFeed)), name='rss'),
+    path('feeds/atom/',
+         read_view(FeedView.as_view(feed_class=AtomPostFeed)), name='atom'),
+    path('category/<slug:category_slug>/rss/',
+         read_view(FeedView.as_view(feed_class=CategoryPostFeed)),
+         name='category_rss'),
+    path('category/<slug:category_slug>/atom/',
+         read_view(FeedView.as_view(feed_class=AtomCategoryPostFeed)),
+         name='category_atom'),
+    path('profile/<slug:username>/rss/',
+         read_view(FeedView.as_view(feed_class=AuthorPostFeed)),
+         name='author_rss'),
+    path('profile/<slug:username>/atom/',
+         read_view(FeedView.as_view(feed_class=AtomAuthorPostFeed)),
+         name='author_atom'),
+    path('sitemap.xml',
+         read_view(SitemapIndexView.as_view()), name='sitemap'),
+    path('sitemap-<slug:section>-<int:shard>.xml',
+         read_view(SitemapShardView.as_view()), name='sitemap_shard'),
 ]
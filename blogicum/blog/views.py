@@ -1,30 +1,53 @@
+import json
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
-from django.core.paginator import Paginator
-from django.db.models import Count
-from django.http import Http404
+from django.db import transaction
+from django.db.models import F, Q
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
+from django.template.loader import render_to_string
 from django.urls import reverse, reverse_lazy
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
 from django.views.generic import (
-    CreateView, DeleteView, DetailView, ListView, UpdateView
+    CreateView, DeleteView, DetailView, ListView, UpdateView, View
 )
 
+from .cache import (COMMENTS_TAG, FEED_TAG, RELATED_TAG,
+                    CachedCountPaginator, author_comments_tag,
+                    author_feed_tag, author_tag, category_comments_tag,
+                    category_feed_tag, category_tag, get_published_category,
+                    post_tag)
+from .choices import SOURCES, search_choices
+from .conditional import get_posts_validators
+from .drafts import DraftConflict, load_draft, save_draft
 from .forms import CommentForm, PostForm, ProfileForm
+from .live import is_visible
 from .mixins import (
+    CachedCountMixin,
     CommentDispatchMixin,
     CommentMixin,
     CommentSuccessUrlMixin,
+    ConditionalGetMixin,
+    DraftMixin,
     PostMixin,
-    PostSuccessUrlMixin
+    PostSuccessUrlMixin,
+    StaleWhileRevalidateMixin,
+    TemplateEngineMixin
 )
-from .models import Category, Comment, Post, User
+from .models import Category, DigestSubscription, Post, User
 
 
 PUBLICATIONS_PER_PAGE = 10
 
 
-class CategoryListView(ListView):
+class CategoryListView(ConditionalGetMixin,
+                       StaleWhileRevalidateMixin,
+                       CachedCountMixin,
+                       TemplateEngineMixin,
+                       ListView):
     """Публикации в категории."""
     model = Category
     template_name = 'blog/category.html'
@@ -32,18 +55,31 @@ class CategoryListView(ListView):
     paginate_by = PUBLICATIONS_PER_PAGE
 
     def get_category(self):
-        return get_object_or_404(
-            Category,
-            slug=self.kwargs['category_slug'],
-            is_published=True
-        )
+        return get_published_category(self.kwargs['category_slug'])
 
-    def get_queryset(self):
+    def get_posts(self):
         return Post.objects.filter(
             category=self.get_category(),
             is_published=True,
             pub_date__lte=timezone.now()
-        ).order_by('-pub_date').annotate(comment_count=Count('comments'))
+        )
+
+    def get_queryset(self):
+        return self.get_posts().order_by('-pub_date').annotate(
+            comment_count=F('comments_total'))
+
+    def get_cache_tags(self):
+        category = self.get_category()
+        return [category_tag(category.pk), category_feed_tag(category.pk),
+                category_comments_tag(category.pk), RELATED_TAG]
+
+    def get_validators(self):
+        return get_posts_validators(self.get_posts(), self.get_cache_tags())
+
+    def get_count_cache(self):
+        category = self.get_category()
+        return (f'blog:category:{category.pk}:count',
+                [category_feed_tag(category.pk)])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -51,50 +87,143 @@ class CategoryListView(ListView):
         return context
 
 
-class PostListView(ListView):
+class PostListView(ConditionalGetMixin,
+                   StaleWhileRevalidateMixin,
+                   CachedCountMixin,
+                   TemplateEngineMixin,
+                   ListView):
     """Лента записей."""
     model = Post
     template_name = 'blog/index.html'
     context_object_name = 'post_list'
     paginate_by = PUBLICATIONS_PER_PAGE
 
-    def get_queryset(self):
+    def get_posts(self):
         return Post.objects.filter(
             is_published=True,
             pub_date__lte=timezone.now(),
             category__is_published=True
-        ).order_by('-pub_date').annotate(comment_count=Count('comments'))
+        )
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['comment_count'] = Comment.objects.count()
-        return context
+    def get_queryset(self):
+        return self.get_posts().order_by('-pub_date').annotate(
+            comment_count=F('comments_total'))
+
+    def get_cache_tags(self):
+        return [FEED_TAG, COMMENTS_TAG, RELATED_TAG]
+
+    def get_validators(self):
+        return get_posts_validators(self.get_posts(), self.get_cache_tags())
 
+    def get_count_cache(self):
+        return 'blog:feed:count', [FEED_TAG]
 
-class PostDetailView(DetailView):
+
+class PostDetailView(ConditionalGetMixin, TemplateEngineMixin, DetailView):
     """Детали публикации."""
     model = Post
     template_name = 'blog/detail.html'
     context_object_name = 'post'
 
+    def get_validators(self):
+        posts = Post.objects.filter(pk=self.kwargs['pk'])
+        author_id = posts.values_list('author_id', flat=True).first()
+        if author_id is None:
+            return None
+        return get_posts_validators(
+            posts, [post_tag(self.kwargs['pk']), author_tag(author_id),
+                    RELATED_TAG])
+
+    def get_object(self, queryset=None):
+        post = super().get_object(queryset)
+        if not post.is_published and post.author != self.request.user:
+            raise Http404()
+        return post
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        post = self.get_object()
-        context['post'] = post
         context['form'] = CommentForm()
-        context['comments'] = post.comments.all()
+        context['comments'] = self.object.comments.all()
+        context['events_url'] = reverse(
+            'blog:post_events', args=[self.object.pk]
+        ) if settings.ASGI else None
         return context
 
-    def get(self, request, *args, **kwargs):
-        self.object = self.get_object()
-        if not self.object.is_published and self.object.author != request.user:
+
+class PostEventsView(View):
+    """
+    Поток новых комментариев под WSGI не поддерживается.
+
+    Поток отдаёт обработчик ASGI_ROUTES; здесь ответ 204 останавливает
+    переподключения EventSource, чтобы читатели не занимали потоки
+    синхронного сервера.
+    """
+
+    def get(self, request, pk):
+        if not is_visible(pk):
             raise Http404()
-        context = self.get_context_data(object=self.object)
-        return self.render_to_response(context)
+        return HttpResponse(status=204)
+
+
+class ChoicesView(View):
+    """Варианты категорий и местоположений для полей формы публикации."""
+
+    def get(self, request, kind):
+        if kind not in SOURCES:
+            raise Http404()
+        try:
+            page = max(int(request.GET.get('page', 1)), 1)
+        except ValueError:
+            page = 1
+        results, more = search_choices(kind, request.GET.get('q', ''), page)
+        response = JsonResponse({'results': results, 'more': more})
+        patch_cache_control(response, private=True, max_age=60)
+        return response
+
+
+class PostDraftView(View):
+    """
+    Автосохранение формы публикации.
+
+    Принимает JSON ``{"version": n, "changes": {...}, "flush": false}``
+    с полями, изменёнными после версии ``n``; при расхождении версий
+    отвечает 409 с текущим черновиком.
+    """
+
+    def post(self, request, post_id=None):
+        if not request.user.is_authenticated:
+            return JsonResponse({'error': 'Требуется вход.'}, status=401)
+        try:
+            payload = json.loads(request.body)
+            version = int(payload['version'])
+            changes = dict(payload['changes'])
+        except (ValueError, KeyError, TypeError):
+            return JsonResponse({'error': 'Неверный запрос.'}, status=400)
+        initial = None
+        if post_id and load_draft(request.user.pk, post_id) is None:
+            text = Post.objects.filter(
+                pk=post_id, author=request.user
+            ).values_list('text', flat=True).first()
+            if text is None:
+                return JsonResponse({'error': 'Публикация не найдена.'},
+                                    status=404)
+            initial = {'text': text}
+        try:
+            state = save_draft(request.user.pk, post_id, version, changes,
+                               flush=bool(payload.get('flush')),
+                               initial=initial)
+        except DraftConflict as conflict:
+            return JsonResponse({'version': conflict.state['version'],
+                                 'data': conflict.state['data']},
+                                status=409)
+        except (ValueError, KeyError, TypeError):
+            return JsonResponse({'error': 'Неверные изменения.'}, status=400)
+        return JsonResponse({'version': state['version']})
 
 
 class PostCreateView(LoginRequiredMixin,
                      PostMixin,
+                     DraftMixin,
                      PostSuccessUrlMixin,
                      CreateView):
     """Добавление публикации."""
@@ -107,6 +236,7 @@ class PostCreateView(LoginRequiredMixin,
 
 class PostUpdateView(PostMixin,
                      LoginRequiredMixin,
+                     DraftMixin,
                      UpdateView):
     """Редактирование публикации."""
     form_class = PostForm
@@ -145,13 +275,50 @@ class CommentCreateView(CommentMixin,
     """Добавление комментария."""
 
     def form_valid(self, form):
-        form.instance.author = get_object_or_404(
-            User, username=self.request.user)
+        form.instance.author = self.request.user
         form.instance.post = get_object_or_404(
             Post, id=self.kwargs['post_id'])
         return super().form_valid(form)
 
 
+class CommentCreateJSONView(View):
+    """
+    Добавление комментария запросом из скрипта страницы.
+
+    Одно чтение публикации; в транзакции — вставка комментария и
+    UPDATE ... RETURNING счётчика, а события сводки и инвалидации
+    пишутся после фиксации. В ответе готовый фрагмент комментария
+    вместо переадресации и число комментариев после вставки.
+    """
+
+    def post(self, request, post_id):
+        if not request.user.is_authenticated:
+            return JsonResponse({'error': 'Требуется вход.'}, status=401)
+        post = Post.objects.filter(
+            Q(is_published=True) | Q(author_id=request.user.pk), pk=post_id
+        ).only('pk', 'author_id', 'category_id', 'comments_total').first()
+        if post is None:
+            return JsonResponse({'error': 'Публикация не найдена.'},
+                                status=404)
+        form = CommentForm(request.POST)
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors.get_json_data()},
+                                status=400)
+        comment = form.save(commit=False)
+        comment.author = request.user
+        comment.post = post
+        with transaction.atomic():
+            comment.save()
+        html = render_to_string(
+            'includes/comment.html', {'comment': comment}, request,
+            using=settings.BLOG_TEMPLATE_ENGINES.get('PostDetailView'))
+        return JsonResponse({
+            'id': comment.pk,
+            'html': html,
+            'comment_count': post.comments_total,
+        }, status=201)
+
+
 class CommentUpdateView(CommentMixin,
                         LoginRequiredMixin,
                         CommentDispatchMixin,
@@ -169,7 +336,9 @@ class CommentDeleteView(CommentMixin,
     success_url = reverse_lazy('blog:index')
 
 
-class ProfileDetailView(DetailView):
+class ProfileDetailView(ConditionalGetMixin,
+                        TemplateEngineMixin,
+                        DetailView):
     """Страница пользователя."""
     model = User
     slug_field = 'username'
@@ -178,42 +347,52 @@ class ProfileDetailView(DetailView):
     paginate_by = PUBLICATIONS_PER_PAGE
     context_object_name = 'profile'
 
+    def get_author(self):
+        """Автор профиля; для своего профиля — уже загруженный request.user."""
+        if not hasattr(self, 'author'):
+            username = self.kwargs['username']
+            if self.request.user.get_username() == username:
+                self.author = self.request.user
+            else:
+                self.author = get_object_or_404(User, username=username)
+        return self.author
+
     def get_object(self, queryset=None):
-        return get_object_or_404(
-            User,
-            username=self.kwargs['username'])
+        return self.get_author()
+
+    def get_validators(self):
+        author = self.get_author()
+        posts = Post.objects.filter(author=author)
+        if author != self.request.user:
+            posts = posts.filter(is_published=True)
+        return get_posts_validators(
+            posts, [author_tag(author.pk), author_feed_tag(author.pk),
+                    author_comments_tag(author.pk), RELATED_TAG])
 
     def get_queryset(self):
-        username = self.kwargs['username']
-        self.author = get_object_or_404(User, username=username)
-        if self.author == self.request.user:
-            queryset = Post.objects.select_related(
-                'category', 'location', 'author'
-            ).filter(author=self.author).order_by('-pub_date')
-        else:
-            queryset = Post.objects.select_related(
-                'category', 'location', 'author'
-            ).filter(author=self.author,
-                     is_published=True).order_by('-pub_date')
-        queryset = queryset.annotate(comment_count=Count('comments'))
-        return queryset
+        queryset = Post.objects.select_related(
+            'category', 'location', 'author'
+        ).filter(author=self.get_author()).order_by('-pub_date')
+        if self.author != self.request.user:
+            queryset = queryset.filter(is_published=True)
+        return queryset.annotate(comment_count=F('comments_total'))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         posts = self.get_queryset()
-        paginator = Paginator(posts, self.paginate_by)
+        visibility = 'all' if self.author == self.request.user else 'public'
+        paginator = CachedCountPaginator(
+            posts, self.paginate_by,
+            count_key=f'blog:author:{self.author.pk}:{visibility}:count',
+            count_tags=[author_feed_tag(self.author.pk)])
         page_number = self.request.GET.get('page')
         page_obj = paginator.get_page(page_number)
         context['page_obj'] = page_obj
-        context['profile'] = get_object_or_404(
-            User,
-            username=self.kwargs.get('username'))
-        post_images = [post.image for post in posts if post.image]
-        context['image'] = post_images
+        context['image'] = [post.image for post in page_obj if post.image]
         return context
 
 
-class ProfileUpdateView(LoginRequiredMixin, UpdateView):
+class ProfileUpdateView(LoginRequiredMixin, TemplateEngineMixin, UpdateView):
     """Изменение профиля."""
     model = User
     form_class = ProfileForm
@@ -226,3 +405,21 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
             'blog:profile',
             kwargs={'username': self.request.user.username}
         )
+
+
+class DigestSettingsView(LoginRequiredMixin, UpdateView):
+    """Период сводки о новых комментариях."""
+    model = DigestSubscription
+    fields = ('period',)
+    template_name = 'blog/digest.html'
+
+    def get_object(self, queryset=None):
+        return (DigestSubscription.objects.filter(
+            user=self.request.user).first()
+            or DigestSubscription(user=self.request.user))
+
+    def get_success_url(self):
+        return reverse(
+            'blog:profile',
+            kwargs={'username': self.request.user.username}
+        )
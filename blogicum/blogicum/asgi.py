@@ -1,7 +1,14 @@
 import os
 
-from django.core.asgi import get_asgi_application
+from django.conf import settings
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+os.environ.setdefault('BLOGICUM_SERVER', 'asgi')
 
-application = get_asgi_application()
+from core.asgi import get_application  # noqa: E402
+
+application = get_application()
+
+if settings.CACHED_TEMPLATES:
+    from core.templates import precompile_templates
+    precompile_templates()
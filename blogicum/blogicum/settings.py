@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -30,25 +31,67 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CacheInvalidationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.auth.CachedAuthenticationMiddleware',
+    'core.idempotency.IdempotencyMiddleware',
+    'core.ratelimit.RateLimitMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
+    'core.middleware.TemplateProfilerMiddleware',
 ]
 
+# Режим ASGI включает blogicum/asgi.py; debug_toolbar в нём не работает.
+ASGI = os.getenv('BLOGICUM_SERVER') == 'asgi'
+
+if ASGI:
+    INSTALLED_APPS.remove('debug_toolbar')
+    MIDDLEWARE.remove('debug_toolbar.middleware.DebugToolbarMiddleware')
+
+# Потоки для представлений-читателей под ASGI (core.asgi.read_view).
+ASGI_DB_THREADS = int(os.getenv('BLOGICUM_DB_THREADS', 8))
+
+HEALTH_CHECK_URL = '/healthz/'
+
+# Асинхронные обработчики вне стека middleware: (регулярное выражение
+# пути, обработчик ASGI).
+ASGI_ROUTES = [
+    (r'^/posts/(?P<post_id>\d+)/events/$', 'blog.live.comment_events'),
+]
+
+# Поток новых комментариев (blog.live, только под ASGI): период опроса
+# общего кэша и интервал пустых сообщений.
+COMMENT_EVENTS_POLL_INTERVAL = 1
+
+COMMENT_EVENTS_HEARTBEAT = 15
+
 ROOT_URLCONF = 'blogicum.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
 
+# Кэширующий загрузчик и предкомпиляция шаблонов при старте процесса.
+CACHED_TEMPLATES = os.getenv(
+    'BLOGICUM_CACHED_TEMPLATES', str(not DEBUG)) == 'True'
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+TEMPLATE_PROFILING = os.getenv('BLOGICUM_TEMPLATE_PROFILING') == 'True'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': (
+                [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)]
+                if CACHED_TEMPLATES else TEMPLATE_LOADERS
+            ),
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -57,11 +100,109 @@ TEMPLATES = [
             ],
         },
     },
+    {
+        'BACKEND': 'django.template.backends.jinja2.Jinja2',
+        'NAME': 'jinja2',
+        'DIRS': [BASE_DIR / 'jinja2'],
+        'OPTIONS': {
+            'environment': 'core.jinja2.environment',
+            'context_processors': [
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
 ]
 
+# Представления блога, которые рендерятся через Jinja2, например
+# BLOGICUM_JINJA2_VIEWS=PostListView,CategoryListView.
+BLOG_TEMPLATE_ENGINES = dict.fromkeys(
+    filter(None, os.getenv('BLOGICUM_JINJA2_VIEWS', '').split(',')),
+    'jinja2',
+)
+
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 
+SHARED_CACHES = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum-shared',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    },
+    'db': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'blogicum_cache',
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.TwoTierCache',
+        'LOCATION': 'blogicum',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'SHARED_ALIAS': 'shared',
+            'LOCAL_TIMEOUT': 30,
+            'MAX_ENTRIES': 1000,
+            'LOCAL_MAX_BYTES': 8 * 2 ** 20,
+        },
+    },
+    'shared': {
+        **SHARED_CACHES[os.getenv('BLOGICUM_SHARED_CACHE', 'locmem')],
+        'TIMEOUT': 300,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+CACHE_INVALIDATION_POLL_INTERVAL = 1
+
+CACHE_INVALIDATION_RETENTION = 3600
+
+# Хранилище сессий: cached_db (двухуровневый кэш поверх базы), db
+# или signed_cookies (без обращений к серверу).
+SESSION_ENGINES = {
+    'cached_db': 'core.sessions',
+    'db': 'django.contrib.sessions.backends.db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+SESSION_ENGINE = SESSION_ENGINES[os.getenv('BLOGICUM_SESSIONS', 'cached_db')]
+
+# Период очистки истёкших сессий задачей core.purge_sessions в секундах;
+# 0 — отключена.
+SESSION_PURGE_INTERVAL = int(os.getenv('BLOGICUM_SESSION_PURGE', 3600))
+
+# Ограничение частоты POST-запросов (core.ratelimit) по имени маршрута:
+# rate — (ёмкость корзины, секунд на её наполнение), keys — отдельные
+# корзины по пользователю, IP-адресу или полю формы.
+RATE_LIMITS = {
+    'blog:add_comment': {'rate': (10, 60), 'keys': ('user', 'ip')},
+    'blog:add_comment_json': {'rate': (10, 60), 'keys': ('user', 'ip')},
+    'blog:create_post': {'rate': (5, 300), 'keys': ('user', 'ip')},
+    'login': {'rate': (10, 300), 'keys': ('ip', 'username')},
+    'registration': {'rate': (5, 3600), 'keys': ('ip',)},
+    'password_reset': {'rate': (5, 3600), 'keys': ('ip', 'email')},
+}
+
+if os.getenv('BLOGICUM_RATE_LIMITS') == 'off':
+    RATE_LIMITS = {}
+
+# Представления, повторная отправка которых с тем же ключом
+# идемпотентности возвращает первый ответ (core.idempotency), и срок
+# хранения ответов в секундах.
+IDEMPOTENT_VIEWS = (
+    'blog:create_post',
+    'blog:add_comment',
+    'blog:add_comment_json',
+)
+
+IDEMPOTENCY_TTL = 600
+
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -106,10 +247,44 @@ STATIC_URL = '/static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Письма сохраняются в исходящую очередь (core.mail) и доставляются
+# задачей core.drain_outbox пачками через EMAIL_DELIVERY_BACKEND.
+EMAIL_BACKEND = 'core.mail.OutboxEmailBackend'
+
+EMAIL_DELIVERY_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+OUTBOX_BATCH_SIZE = 100
+
+OUTBOX_MAX_ATTEMPTS = 5
+
+OUTBOX_RETRY_BACKOFF = 30
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
+# ModelBackend остаётся после кэширующего для сессий, сохранённых с ним.
+AUTHENTICATION_BACKENDS = [
+    'core.auth.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# Очередь фоновых задач (core.tasks): TASKS_EAGER выполняет задачи сразу
+# после фиксации транзакции, без обработчика runworker.
+TASKS_EAGER = os.getenv('BLOGICUM_TASKS_EAGER') == 'True'
+
+TASKS_RETENTION = 86400
+
+# Адрес сайта для ссылок в письмах.
+SITE_URL = os.getenv('BLOGICUM_SITE_URL', 'http://localhost:8000')
+
+DIGEST_COMMENTS_PER_POST = 3
+
+# Автосохранение черновиков публикаций (blog.drafts): изменения копятся
+# в общем кэше и пишутся в базу не чаще раза в DRAFT_FLUSH_INTERVAL
+# секунд; брошенные черновики удаляются через DRAFT_RETENTION_DAYS дней.
+DRAFT_FLUSH_INTERVAL = 10
+
+DRAFT_RETENTION_DAYS = 30
+
 LOGIN_REDIRECT_URL = 'blog:index'
 
 LOGIN_URL = 'login'
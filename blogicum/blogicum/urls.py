@@ -25,7 +25,7 @@ handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error'
 
 
-if settings.DEBUG:
+if settings.DEBUG and 'debug_toolbar' in settings.INSTALLED_APPS:
     import debug_toolbar
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
 
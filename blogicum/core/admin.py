@@ -0,0 +1,51 @@
+from django.contrib import admin
+
+from .models import OutboxMessage, Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = (
+        'name',
+        'status',
+        'attempts',
+        'run_after',
+        'finished_at',
+    )
+    list_filter = (
+        'status',
+        'name',
+    )
+    search_fields = (
+        'idempotency_key',
+    )
+    readonly_fields = (
+        'locked_by',
+        'locked_until',
+        'last_error',
+    )
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = (
+        'subject',
+        'recipients',
+        'status',
+        'attempts',
+        'next_attempt_at',
+        'sent_at',
+    )
+    list_filter = (
+        'status',
+    )
+    search_fields = (
+        'recipients',
+    )
+    exclude = (
+        'message',
+    )
+    readonly_fields = (
+        'claimed_by',
+        'last_error',
+    )
@@ -0,0 +1,268 @@
+import asyncio
+import json
+import mimetypes
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.handlers.asgi import ASGIHandler
+from django.db import close_old_connections
+from django.urls import Resolver404, get_resolver
+from django.utils._os import safe_join
+from django.utils.module_loading import import_string
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .cache import shared_cache
+
+FILE_CHUNK_SIZE = 64 * 1024
+
+db_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'ASGI_DB_THREADS', 8),
+    thread_name_prefix='blogicum-db',
+)
+
+
+def read_view(view):
+    """
+    Пометить представление для чтения как выполняемое в пуле потоков БД.
+
+    Под WSGI пометка ни на что не влияет.
+    """
+    view.runs_in_db_pool = True
+    return view
+
+
+def _with_connections(func, *args, **kwargs):
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_in_db_pool(func, *args, **kwargs):
+    """Выполнить синхронный код с ORM в пуле ``db_executor``."""
+    return await sync_to_async(
+        _with_connections, thread_sensitive=False, executor=db_executor
+    )(func, *args, **kwargs)
+
+
+class CacheKeyWatcher:
+    """
+    Ожидание роста значений-счётчиков в общем кэше.
+
+    Вместо опроса на каждое соединение один цикл на процесс читает все
+    ожидаемые ключи одним ``get_many`` раз в ``interval`` секунд и будит
+    тех, для кого значение выросло.
+    """
+
+    def __init__(self, interval=1):
+        self.interval = interval
+        self.waiters = {}
+        self._poller = None
+
+    async def wait(self, key, seen, timeout):
+        """Дождаться значения ключа больше ``seen``; None по таймауту."""
+        event = asyncio.Event()
+        waiters = self.waiters.setdefault(key, {})
+        waiters[event] = seen
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.ensure_future(self._poll())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            waiters.pop(event, None)
+            if not waiters:
+                self.waiters.pop(key, None)
+        return event.value
+
+    async def _poll(self):
+        while self.waiters:
+            values = await run_in_db_pool(
+                shared_cache().get_many, list(self.waiters))
+            for key, value in values.items():
+                for event, seen in self.waiters.get(key, {}).items():
+                    if value > seen:
+                        event.value = value
+                        event.set()
+            await asyncio.sleep(self.interval)
+
+
+class BlogicumASGIHandler(ASGIHandler):
+    """
+    ASGIHandler с пулом потоков для представлений-читателей.
+
+    Middleware загружаются в синхронном режиме, и запрос целиком, от
+    сессии до ответа, выполняется в одном потоке: запросы к
+    представлениям ``read_view`` — в ограниченном пуле ``db_executor``,
+    остальные — в общем потоке синхронного кода. Число потоков и
+    соединений с базой не растёт с числом одновременных клиентов.
+    """
+
+    def __init__(self):
+        # ASGIHandler загрузил бы middleware в асинхронном режиме, где
+        # каждый синхронный middleware ждёт следующий в своём потоке.
+        self.load_middleware()
+
+    async def get_response_async(self, request):
+        if self.runs_in_db_pool(request):
+            return await run_in_db_pool(self.get_response, request)
+        return await sync_to_async(
+            self.get_response, thread_sensitive=True)(request)
+
+    @staticmethod
+    def runs_in_db_pool(request):
+        resolver = get_resolver(getattr(request, 'urlconf', None))
+        try:
+            match = resolver.resolve(request.path_info)
+        except Resolver404:
+            return False
+        return getattr(match.func, 'runs_in_db_pool', False)
+
+
+async def send_plain(send, status, body, content_type, headers=()):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', content_type.encode()),
+            (b'content-length', str(len(body)).encode()),
+            *headers,
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def health(scope, receive, send):
+    """Проверка живости процесса без обращения к Django и базе."""
+    await send_plain(send, 200, json.dumps({'status': 'ok'}).encode(),
+                     'application/json', [(b'cache-control', b'no-store')])
+
+
+async def send_file(scope, send, path):
+    loop = asyncio.get_running_loop()
+    try:
+        stat = await loop.run_in_executor(None, os.stat, path)
+    except OSError:
+        stat = None
+    if stat is None or not os.path.isfile(path):
+        await send_plain(send, 404, b'Not Found', 'text/plain')
+        return
+    headers = dict(scope['headers'])
+    if_modified_since = headers.get(b'if-modified-since')
+    if not was_modified_since(
+            if_modified_since and if_modified_since.decode('latin-1'),
+            stat.st_mtime):
+        await send({'type': 'http.response.start', 'status': 304,
+                    'headers': []})
+        await send({'type': 'http.response.body'})
+        return
+    content_type, encoding = mimetypes.guess_type(path)
+    response_headers = [
+        (b'content-type',
+         (content_type or 'application/octet-stream').encode()),
+        (b'content-length', str(stat.st_size).encode()),
+        (b'last-modified', http_date(stat.st_mtime).encode()),
+    ]
+    if encoding:
+        response_headers.append((b'content-encoding', encoding.encode()))
+    await send({'type': 'http.response.start', 'status': 200,
+                'headers': response_headers})
+    if scope['method'] == 'HEAD':
+        await send({'type': 'http.response.body'})
+        return
+    with open(path, 'rb') as file:
+        while True:
+            chunk = await loop.run_in_executor(
+                None, file.read, FILE_CHUNK_SIZE)
+            more_body = len(chunk) == FILE_CHUNK_SIZE
+            await send({'type': 'http.response.body', 'body': chunk,
+                        'more_body': more_body})
+            if not more_body:
+                return
+
+
+def find_static(path):
+    try:
+        return finders.find(path)
+    except SuspiciousFileOperation:
+        return None
+
+
+def find_media(path):
+    try:
+        return safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        return None
+
+
+class Application:
+    """
+    ASGI-приложение блога.
+
+    Проверка живости, статика, медиа и маршруты из ``ASGI_ROUTES``
+    обслуживаются асинхронно без middleware Django; остальные
+    HTTP-запросы уходят в Django.
+    """
+
+    def __init__(self, django_app):
+        self.django_app = django_app
+        self.file_roots = [
+            (settings.STATIC_URL, find_static),
+            (settings.MEDIA_URL, find_media),
+        ]
+        self.routes = [
+            (re.compile(pattern), import_string(handler))
+            for pattern, handler in getattr(settings, 'ASGI_ROUTES', ())
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] == 'http':
+            path = scope['path']
+            if path == settings.HEALTH_CHECK_URL:
+                await health(scope, receive, send)
+                return
+            for pattern, handler in self.routes:
+                match = pattern.match(path)
+                if match:
+                    await handler(scope, receive, send, **match.groupdict())
+                    return
+            for prefix, find in self.file_roots:
+                if (path.startswith(prefix)
+                        and scope['method'] in ('GET', 'HEAD')):
+                    loop = asyncio.get_running_loop()
+                    file_path = await loop.run_in_executor(
+                        None, find, path[len(prefix):])
+                    if file_path is None:
+                        await send_plain(send, 404, b'Not Found',
+                                         'text/plain')
+                    else:
+                        await send_file(scope, send, file_path)
+                    return
+        await self.django_app(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                db_executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def get_application():
+    django.setup(set_prefix=False)
+    return Application(BlogicumASGIHandler())
@@ -0,0 +1,113 @@
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import (BACKEND_SESSION_KEY, HASH_SESSION_KEY,
+                                 SESSION_KEY, get_user_model, load_backend)
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+from .invalidation import bus
+
+USER_CACHE_TIMEOUT = 300
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend, кэширующий пользователя, восстановленного из сессии.
+
+    В кэш попадают поля пользователя без хэша пароля и готовый хэш
+    сессии, который сверяет CachedAuthenticationMiddleware.
+    Восстановленный пользователь загружает пароль из базы только при
+    обращении к нему, а при сохранении не перезаписывает его.
+    Запись сбрасывается при любом сохранении или удалении пользователя,
+    в том числе при смене пароля, поэтому проверка хэша сессии
+    по-прежнему разлогинивает остальные сеансы.
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        data = cache.get(key)
+        if data is not None:
+            return self.restore_user(data)
+        user = super().get_user(user_id)
+        if user is not None:
+            cache.set(key, self.dump_user(user), USER_CACHE_TIMEOUT)
+        return user
+
+    @staticmethod
+    def cached_fields():
+        return [field.attname
+                for field in get_user_model()._meta.concrete_fields
+                if field.attname != 'password']
+
+    def dump_user(self, user):
+        return {
+            'fields': {name: getattr(user, name)
+                       for name in self.cached_fields()},
+            'session_auth_hash': user.get_session_auth_hash(),
+        }
+
+    def restore_user(self, data):
+        fields = data['fields']
+        user = get_user_model().from_db(
+            DEFAULT_DB_ALIAS, list(fields), list(fields.values()))
+        user._cached_session_auth_hash = data['session_auth_hash']
+        return user
+
+
+def get_session_user(request):
+    """
+    Пользователь сессии, как django.contrib.auth.get_user.
+
+    Пользователя из кэша CachedModelBackend проверяет по кэшированному
+    хэшу сессии, не загружая пароль. При несовпадении, например после
+    смены пароля, решение принимает стандартная проверка.
+    """
+    session = request.session
+    backend_path = session.get(BACKEND_SESSION_KEY)
+    session_hash = session.get(HASH_SESSION_KEY)
+    if session_hash and backend_path in settings.AUTHENTICATION_BACKENDS:
+        backend = load_backend(backend_path)
+        if isinstance(backend, CachedModelBackend):
+            try:
+                user_id = get_user_model()._meta.pk.to_python(
+                    session[SESSION_KEY])
+            except (KeyError, ValidationError):
+                return auth.get_user(request)
+            user = backend.get_user(user_id)
+            cached_hash = getattr(user, '_cached_session_auth_hash', None)
+            if cached_hash and constant_time_compare(session_hash,
+                                                     cached_hash):
+                return user
+    return auth.get_user(request)
+
+
+def get_cached_request_user(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = get_session_user(request)
+    return request._cached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware, сверяющий сессию с кэшем пользователя."""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(
+            lambda: get_cached_request_user(request))
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def user_changed(sender, instance, **kwargs):
+    bus.publish([user_cache_key(instance.pk)])
@@ -0,0 +1,201 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+_local_stores = {}
+_local_stores_lock = threading.Lock()
+
+
+def shared_cache():
+    """Общий кэш без L1 процесса — для значений, которые опрашивают."""
+    return getattr(cache, 'shared', cache)
+
+
+class LocalLRU:
+    """Ограниченный по числу записей и объёму LRU-кэш процесса с TTL."""
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, pickled = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._pop(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        return pickled
+
+    def set(self, key, pickled, timeout):
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._pop(key)
+            if len(pickled) > self.max_bytes:
+                return
+            self._data[key] = (expires_at, pickled)
+            self.size += len(pickled)
+            while (len(self._data) > self.max_entries
+                   or self.size > self.max_bytes):
+                self._pop(next(iter(self._data)))
+
+    def delete(self, key):
+        with self._lock:
+            return self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._data),
+                'max_entries': self.max_entries,
+                'bytes': self.size,
+                'max_bytes': self.max_bytes,
+            }
+
+    def _pop(self, key):
+        item = self._data.pop(key, None)
+        if item is None:
+            return False
+        self.size -= len(item[1])
+        return True
+
+
+class TwoTierCache(BaseCache):
+    """
+    Двухуровневый кэш: LRU процесса (L1) перед общим кэшем (L2).
+
+    L2 задаётся псевдонимом из ``CACHES`` (опция ``SHARED_ALIAS``);
+    записи L1 живут не дольше ``LOCAL_TIMEOUT`` секунд, поэтому
+    расхождение между процессами ограничено по времени.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._shared_alias = options.get('SHARED_ALIAS', 'shared')
+        self._local_timeout = int(options.get('LOCAL_TIMEOUT', 30))
+        self._pickle_protocol = pickle.HIGHEST_PROTOCOL
+        with _local_stores_lock:
+            self._local = _local_stores.setdefault(
+                location,
+                LocalLRU(self._max_entries,
+                         int(options.get('LOCAL_MAX_BYTES', 8 * 2 ** 20))))
+            self._shared_stats = _local_stores.setdefault(
+                (location, 'shared'), {'hits': 0, 'misses': 0})
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    def _local_timeout_for(self, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return self._local_timeout
+        return min(timeout, self._local_timeout)
+
+    def _set_local(self, key, value, timeout):
+        timeout = self._local_timeout_for(timeout)
+        if timeout <= 0:
+            self._local.delete(key)
+            return
+        self._local.set(
+            key, pickle.dumps(value, self._pickle_protocol), timeout)
+
+    def _count_shared(self, hit):
+        self._shared_stats['hits' if hit else 'misses'] += 1
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_key(key, version)
+        self.validate_key(local_key)
+        added = self.shared.add(key, value, timeout, version)
+        if added:
+            self._set_local(local_key, value, timeout)
+        return added
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_key(key, version)
+        self.validate_key(local_key)
+        pickled = self._local.get(local_key)
+        if pickled is not None:
+            return pickle.loads(pickled)
+        sentinel = object()
+        value = self.shared.get(key, sentinel, version)
+        self._count_shared(value is not sentinel)
+        if value is sentinel:
+            return default
+        self._set_local(local_key, value, DEFAULT_TIMEOUT)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_key(key, version)
+        self.validate_key(local_key)
+        self.shared.set(key, value, timeout, version)
+        self._set_local(local_key, value, timeout)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self._local.delete(self.make_key(key, version))
+        return self.shared.touch(key, timeout, version)
+
+    def delete(self, key, version=None):
+        local_key = self.make_key(key, version)
+        self.validate_key(local_key)
+        self._local.delete(local_key)
+        return self.shared.delete(key, version)
+
+    def has_key(self, key, version=None):
+        sentinel = object()
+        return self.get(key, sentinel, version) is not sentinel
+
+    def incr(self, key, delta=1, version=None):
+        self._local.delete(self.make_key(key, version))
+        return self.shared.incr(key, delta, version)
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self._local.delete(self.make_key(key, version))
+        self.shared.delete_many(keys, version)
+
+    def clear(self):
+        self._local.clear()
+        self.shared.clear()
+
+    def evict_local(self, keys, version=None):
+        """Удалить ключи только из L1 текущего процесса."""
+        for key in keys:
+            self._local.delete(self.make_key(key, version))
+
+    def clear_local(self):
+        self._local.clear()
+
+    def stats(self):
+        """Счётчики попаданий и занимаемая память по уровням."""
+        shared = dict(self._shared_stats)
+        lookups = shared['hits'] + shared['misses']
+        shared['hit_rate'] = shared['hits'] / lookups if lookups else 0.0
+        shared['alias'] = self._shared_alias
+        return {'local': self._local.stats(), 'shared': shared}
@@ -0,0 +1,96 @@
+import logging
+import re
+import uuid
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.html import format_html
+
+from .cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+FIELD_NAME = 'idempotency_key'
+HEADER_NAME = 'Idempotency-Key'
+PENDING = 'pending'
+TOKEN_RE = re.compile(r'^[A-Za-z0-9_-]{16,64}$')
+REPLAYED_HEADERS = ('Content-Type', 'Location')
+
+
+def new_token():
+    return uuid.uuid4().hex
+
+
+def idempotency_input():
+    """Скрытое поле формы с новым ключом идемпотентности."""
+    return format_html('<input type="hidden" name="{}" value="{}">',
+                       FIELD_NAME, new_token())
+
+
+def request_token(request):
+    token = (request.POST.get(FIELD_NAME)
+             or request.headers.get(HEADER_NAME, ''))
+    return token if TOKEN_RE.match(token) else None
+
+
+class IdempotencyMiddleware:
+    """
+    Повторная отправка формы с тем же ключом не выполняет запись снова.
+
+    Для представлений из IDEMPOTENT_VIEWS ключ из поля формы или
+    заголовка Idempotency-Key занимается в общем кэше до выполнения
+    представления; успешный ответ сохраняется на IDEMPOTENCY_TTL секунд
+    и отдаётся повторным запросам. Ответ с ошибкой ключ освобождает.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        key = getattr(request, '_idempotency_key', None)
+        if key is not None:
+            self.store(key, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (request.method != 'POST'
+                or not request.user.is_authenticated
+                or request.resolver_match.view_name
+                not in getattr(settings, 'IDEMPOTENT_VIEWS', ())):
+            return None
+        token = request_token(request)
+        if token is None:
+            return None
+        key = (f'idempotency:{request.user.pk}:'
+               f'{request.resolver_match.view_name}:{token}')
+        cache = shared_cache()
+        if cache.add(key, PENDING, settings.IDEMPOTENCY_TTL):
+            request._idempotency_key = key
+            return None
+        stored = cache.get(key)
+        if stored is None or stored == PENDING:
+            response = HttpResponse(
+                'Запрос с этим ключом ещё выполняется.',
+                content_type='text/plain; charset=utf-8', status=409)
+            response['Retry-After'] = '1'
+            return response
+        logger.info('Replayed idempotent response for %s', key)
+        response = HttpResponse(stored['content'], status=stored['status'])
+        for header, value in stored['headers']:
+            response[header] = value
+        response['Idempotent-Replayed'] = 'true'
+        return response
+
+    def store(self, key, response):
+        cache = shared_cache()
+        if response.status_code >= 400 or response.streaming:
+            cache.delete(key)
+            return
+        cache.set(key, {
+            'status': response.status_code,
+            'content': response.content,
+            'headers': [(header, response[header])
+                        for header in REPLAYED_HEADERS
+                        if response.has_header(header)],
+        }, settings.IDEMPOTENCY_TTL)
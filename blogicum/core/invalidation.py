@@ -0,0 +1,94 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import InvalidationEvent
+
+
+class InvalidationBus:
+    """
+    Канал инвалидации кэшей процессов.
+
+    Публикация удаляет ключи из общего кэша и записывает событие в
+    таблицу; каждый процесс не чаще раза в ``poll_interval`` секунд
+    читает новые события и вытесняет перечисленные ключи из своего L1.
+    """
+
+    def __init__(self, poll_interval, retention):
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._last_seen = None
+        self._next_poll = 0
+        self._next_purge = 0
+        self._lock = threading.Lock()
+
+    def publish(self, keys):
+        """
+        Удалить ключи из общего кэша и из L1 всех процессов.
+
+        Ключи удаляются сразу и ещё раз после фиксации транзакции:
+        читатель, заполнивший кэш между ними по ещё не изменённым строкам,
+        не оставит устаревшую запись. Событие для других процессов тоже
+        пишется после фиксации.
+        """
+        keys = sorted(set(keys))
+        if not keys:
+            return
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: self._publish_committed(keys))
+
+    def _publish_committed(self, keys):
+        cache.delete_many(keys)
+        self.announce(keys)
+
+    def announce(self, keys):
+        """Вытеснить ключи только из L1 других процессов."""
+        keys = sorted(set(keys))
+        if not keys:
+            return
+        InvalidationEvent.objects.create(keys='\n'.join(keys))
+        self._purge()
+
+    def poll(self, force=False):
+        now = time.monotonic()
+        if not force and now < self._next_poll:
+            return
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._next_poll = now + self.poll_interval
+            if self._last_seen is None:
+                self._last_seen = InvalidationEvent.objects.aggregate(
+                    last=Max('pk'))['last'] or 0
+                return
+            events = InvalidationEvent.objects.filter(
+                pk__gt=self._last_seen
+            ).order_by('pk').values_list('pk', 'keys')
+            evict_local = getattr(cache, 'evict_local', None)
+            for pk, keys in events:
+                if evict_local is not None:
+                    evict_local(keys.split('\n'))
+                self._last_seen = pk
+        finally:
+            self._lock.release()
+
+    def _purge(self):
+        now = time.monotonic()
+        if now < self._next_purge:
+            return
+        self._next_purge = now + self.retention / 10
+        InvalidationEvent.objects.filter(
+            created_at__lt=timezone.now() - timedelta(seconds=self.retention)
+        ).delete()
+
+
+bus = InvalidationBus(
+    poll_interval=getattr(settings, 'CACHE_INVALIDATION_POLL_INTERVAL', 1),
+    retention=getattr(settings, 'CACHE_INVALIDATION_RETENTION', 3600),
+)
@@ -0,0 +1,47 @@
+from datetime import date, datetime, time
+
+from django.template.defaultfilters import date as date_filter
+from django.template.defaultfilters import linebreaksbr, truncatewords
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.formats import localize
+from django.utils.timezone import template_localtime
+from django_bootstrap5.templatetags.django_bootstrap5 import (
+    bootstrap_button, bootstrap_css, bootstrap_form)
+from jinja2 import Environment
+
+from blog.templatetags.blog_cards import post_cards
+
+from .idempotency import idempotency_input
+
+
+def url(viewname, *args, **kwargs):
+    return reverse(viewname, args=args or None, kwargs=kwargs or None)
+
+
+def finalize(value):
+    """Вывод значений как в шаблонах Django: местное время и локализация."""
+    if isinstance(value, (datetime, date, time)):
+        return localize(template_localtime(value))
+    return value
+
+
+def environment(**options):
+    """Окружение Jinja2 с глобальными функциями и фильтрами блога."""
+    env = Environment(finalize=finalize, **options)
+    env.globals.update({
+        'bootstrap_button': bootstrap_button,
+        'bootstrap_css': bootstrap_css,
+        'bootstrap_form': bootstrap_form,
+        'idempotency_input': idempotency_input,
+        'post_cards': post_cards,
+        'static': static,
+        'url': url,
+    })
+    env.filters.update({
+        'date': lambda value, arg=None: date_filter(
+            template_localtime(value), arg),
+        'linebreaksbr': linebreaksbr,
+        'truncatewords': truncatewords,
+    })
+    return env
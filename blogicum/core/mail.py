@@ -0,0 +1,161 @@
+import copy
+import logging
+import pickle
+import threading
+import time
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import OutboxMessage
+from .tasks import task
+
+logger = logging.getLogger(__name__)
+
+_stats = {'sent': 0, 'retried': 0, 'dead': 0, 'seconds': 0.0}
+_stats_lock = threading.Lock()
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    """
+    Бэкенд, который только сохраняет письма в исходящую очередь.
+
+    Доставку выполняет задача ``core.drain_outbox`` через бэкенд из
+    ``EMAIL_DELIVERY_BACKEND``.
+    """
+
+    def send_messages(self, email_messages):
+        rows = []
+        for message in email_messages:
+            if not message.recipients():
+                continue
+            message = copy.copy(message)
+            message.connection = None
+            rows.append(OutboxMessage(
+                subject=message.subject[:255],
+                recipients=', '.join(message.recipients()),
+                message=pickle.dumps(message, pickle.HIGHEST_PROTOCOL)))
+        if not rows:
+            return 0
+        OutboxMessage.objects.bulk_create(rows)
+        # Без ключа идемпотентности: задача с ключом, уже выполненная
+        # раньше, не взяла бы новые письма.
+        transaction.on_commit(drain_outbox.enqueue)
+        return len(rows)
+
+
+def claim_batch(batch_size, lease, due_before):
+    """
+    Занять пачку писем, срок отправки которых наступил к ``due_before``.
+
+    Письма, оставшиеся в состоянии «отправляется» дольше ``lease``
+    секунд, занимаются повторно.
+    """
+    now = timezone.now()
+    due = OutboxMessage.objects.filter(
+        status__in=(OutboxMessage.Status.PENDING,
+                    OutboxMessage.Status.SENDING),
+        next_attempt_at__lte=due_before,
+    )
+    token = uuid.uuid4().hex
+    ids = list(due.values_list('pk', flat=True)[:batch_size])
+    due.filter(pk__in=ids).update(
+        status=OutboxMessage.Status.SENDING,
+        claimed_by=token,
+        next_attempt_at=now + timedelta(seconds=lease))
+    return list(OutboxMessage.objects.filter(
+        claimed_by=token, status=OutboxMessage.Status.SENDING))
+
+
+def retry_or_bury(row, error):
+    row.attempts += 1
+    row.last_error = error
+    row.claimed_by = ''
+    if row.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        row.status = OutboxMessage.Status.DEAD
+        logger.error('Outbox message %s is dead after %s attempts',
+                     row.pk, row.attempts)
+    else:
+        row.status = OutboxMessage.Status.PENDING
+        row.next_attempt_at = timezone.now() + timedelta(
+            seconds=settings.OUTBOX_RETRY_BACKOFF * 2 ** (row.attempts - 1))
+    row.save(update_fields=('attempts', 'last_error', 'claimed_by',
+                            'status', 'next_attempt_at'))
+    return row.status
+
+
+def deliver_batch(rows):
+    """Отправить пачку через одно соединение; вернуть итоги по пачке."""
+    result = {'sent': 0, 'retried': 0, 'dead': 0}
+    connection = get_connection(settings.EMAIL_DELIVERY_BACKEND)
+    try:
+        connection.open()
+    except Exception:
+        error = traceback.format_exc()
+        for row in rows:
+            dead = retry_or_bury(row, error) == OutboxMessage.Status.DEAD
+            result['dead' if dead else 'retried'] += 1
+        return result
+    sent = []
+    try:
+        for row in rows:
+            try:
+                message = pickle.loads(row.message)
+                message.connection = connection
+                connection.send_messages([message])
+            except Exception:
+                dead = retry_or_bury(
+                    row, traceback.format_exc()) == OutboxMessage.Status.DEAD
+                result['dead' if dead else 'retried'] += 1
+            else:
+                sent.append(row.pk)
+    finally:
+        connection.close()
+    OutboxMessage.objects.filter(pk__in=sent).update(
+        status=OutboxMessage.Status.SENT, claimed_by='',
+        sent_at=timezone.now())
+    result['sent'] = len(sent)
+    return result
+
+
+@task(name='core.drain_outbox', max_attempts=1, every=60)
+def drain_outbox(batch_size=None, lease=300):
+    """Отправить все готовые письма пачками по ``batch_size``."""
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    totals = {'sent': 0, 'retried': 0, 'dead': 0}
+    start = time.perf_counter()
+    due_before = timezone.now()
+    while True:
+        rows = claim_batch(batch_size, lease, due_before)
+        if not rows:
+            break
+        for key, value in deliver_batch(rows).items():
+            totals[key] += value
+    seconds = time.perf_counter() - start
+    with _stats_lock:
+        for key, value in totals.items():
+            _stats[key] += value
+        _stats['seconds'] += seconds
+    if any(totals.values()):
+        logger.info('Outbox drained: %(sent)s sent, %(retried)s retried, '
+                    '%(dead)s dead', totals)
+    return totals
+
+
+def outbox_stats():
+    """Письма по состояниям и пропускная способность отправки процесса."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['per_second'] = (
+        stats['sent'] / stats['seconds'] if stats['seconds'] else 0.0)
+    stats['queue'] = dict(
+        OutboxMessage.objects.order_by().values_list('status').annotate(
+            Count('pk')))
+    return stats
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from core.tags import describe_key, describe_tag, invalidate_tags
+
+
+class Command(BaseCommand):
+    help = 'Показывает зависимости тегов кэша и инвалидирует их.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('tags', nargs='*', help='Теги, например post:42')
+        parser.add_argument('--key', action='append', default=[],
+                            help='Показать теги записи кэша.')
+        parser.add_argument('--invalidate', action='store_true',
+                            help='Инвалидировать перечисленные теги.')
+
+    def handle(self, *args, **options):
+        for tag in options['tags']:
+            info = describe_tag(tag)
+            self.stdout.write(f"{tag} (version {info['version']})")
+            for key in info['keys']:
+                self.stdout.write(f'  {key}')
+        for key in options['key']:
+            info = describe_key(key)
+            state = 'fresh' if info['fresh'] else 'stale or missing'
+            self.stdout.write(f'{key}: {state}')
+            for tag, version in info['tags'].items():
+                self.stdout.write(f'  {tag} (version {version})')
+        if options['invalidate'] and options['tags']:
+            invalidate_tags(options['tags'])
+            self.stdout.write(self.style.SUCCESS('Invalidated.'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.mail import drain_outbox, outbox_stats
+from core.models import OutboxMessage
+
+
+class Command(BaseCommand):
+    help = 'Состояние исходящей очереди писем.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--drain', action='store_true',
+                            help='Отправить готовые письма сейчас.')
+        parser.add_argument('--requeue-dead', action='store_true',
+                            help='Вернуть недоставленные письма в очередь.')
+        parser.add_argument('--batch-size', type=int)
+
+    def handle(self, *args, **options):
+        if options['requeue_dead']:
+            requeued = OutboxMessage.objects.filter(
+                status=OutboxMessage.Status.DEAD
+            ).update(status=OutboxMessage.Status.PENDING, attempts=0,
+                     next_attempt_at=timezone.now())
+            self.stdout.write(f'Requeued {requeued} dead messages.')
+        if options['drain']:
+            drain_outbox(batch_size=options['batch_size'])
+        stats = outbox_stats()
+        for status, label in OutboxMessage.Status.choices:
+            count = stats['queue'].get(status, 0)
+            self.stdout.write(f'  {label:<40} {count:>10}')
+        self.stdout.write(
+            f'  {"sent by this process":<40} {stats["sent"]:>10}\n'
+            f'  {"messages per second":<40} {stats["per_second"]:>10.1f}')
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from core.template_profiler import TemplateProfiler
+
+
+class Command(BaseCommand):
+    help = 'Профилирует рендеринг шаблонов для страниц сайта.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+', help='Адреса, например /')
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--user', help='Запрашивать от имени '
+                                           'пользователя с таким username.')
+
+    def handle(self, *args, **options):
+        client = Client(SERVER_NAME='localhost')
+        if options['user']:
+            from django.contrib.auth import get_user_model
+            client.force_login(
+                get_user_model().objects.get(username=options['user']))
+        for url in options['urls']:
+            profiler = TemplateProfiler()
+            with profiler.activate():
+                for _ in range(options['repeat']):
+                    client.get(url)
+            self.stdout.write(f'{url} x{options["repeat"]}')
+            self.stdout.write('\n'.join(profiler.report()))
+            self.stdout.write('')
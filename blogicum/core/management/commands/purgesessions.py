@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.sessions import purge_expired_sessions
+
+
+class Command(BaseCommand):
+    help = 'Удаляет истёкшие сессии из базы данных пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--pause', type=float, default=0,
+                            help='Пауза между пачками в секундах.')
+
+    def handle(self, *args, **options):
+        if 'signed_cookies' in settings.SESSION_ENGINE:
+            raise CommandError('Signed cookie sessions are not stored.')
+        deleted = purge_expired_sessions(options['batch_size'],
+                                         options['pause'])
+        self.stdout.write(f'Deleted {deleted} expired sessions.')
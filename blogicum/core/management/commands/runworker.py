@@ -0,0 +1,51 @@
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.tasks import Worker
+
+
+def run_worker(threads, poll_interval):
+    worker = Worker(concurrency=threads, poll_interval=poll_interval)
+    signal.signal(signal.SIGTERM, lambda *args: worker.stop())
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        worker.stop()
+
+
+class Command(BaseCommand):
+    help = 'Обрабатывает очередь фоновых задач.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=4,
+                            help='Потоков в каждом процессе.')
+        parser.add_argument('--processes', type=int, default=1)
+        parser.add_argument('--poll-interval', type=float, default=1)
+        parser.add_argument('--once', action='store_true',
+                            help='Выполнить готовые задачи и завершиться.')
+
+    def handle(self, *args, **options):
+        if options['once']:
+            done = Worker(concurrency=options['threads']).run_pending()
+            self.stdout.write(f'Executed {done} tasks.')
+            return
+        worker_args = (options['threads'], options['poll_interval'])
+        if options['processes'] == 1:
+            run_worker(*worker_args)
+            return
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=run_worker, args=worker_args)
+            for _ in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
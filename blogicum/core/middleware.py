@@ -0,0 +1,35 @@
+import logging
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.deprecation import MiddlewareMixin
+
+from .invalidation import bus
+from .template_profiler import TemplateProfiler
+
+logger = logging.getLogger(__name__)
+
+
+class CacheInvalidationMiddleware(MiddlewareMixin):
+    """Применяет события инвалидации других процессов до обработки запроса."""
+
+    def process_request(self, request):
+        bus.poll()
+
+
+class TemplateProfilerMiddleware:
+    """Профилирует рендеринг шаблонов при TEMPLATE_PROFILING = True."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'TEMPLATE_PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with TemplateProfiler().activate() as profiler:
+            response = self.get_response(request)
+        if profiler.templates:
+            response['Server-Timing'] = profiler.server_timing()
+            logger.info('Template profile for %s\n%s', request.path,
+                        '\n'.join(profiler.report()))
+        return response
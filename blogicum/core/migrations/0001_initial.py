@@ -0,0 +1,27 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvalidationEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('keys', models.TextField(verbose_name='Ключи кэша')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Добавлено')),
+            ],
+            options={
+                'verbose_name': 'событие инвалидации',
+                'verbose_name_plural': 'События инвалидации',
+                'ordering': ('pk',),
+            },
+        ),
+    ]
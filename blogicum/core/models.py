@@ -1,15 +1,125 @@
 from django.db import models
+from django.utils import timezone
 
 
 class BaseModel(models.Model):
     """Абстрактная модель. Добвляет флаг is_published.
-    Добавляет дату и время публикации."""
+    Добавляет дату и время публикации и последнего изменения."""
     is_published = models.BooleanField(
         default=True,
         verbose_name='Опубликовано',
         help_text='Снимите галочку, чтобы скрыть публикацию.')
     created_at = models.DateTimeField(auto_now_add=True,
                                       verbose_name='Добавлено')
+    updated_at = models.DateTimeField(auto_now=True,
+                                      verbose_name='Изменено')
 
     class Meta:
         abstract = True
+
+
+class InvalidationEvent(models.Model):
+    """Событие инвалидации кэша, которое читают все процессы."""
+    keys = models.TextField(verbose_name='Ключи кэша')
+    created_at = models.DateTimeField(auto_now_add=True,
+                                      db_index=True,
+                                      verbose_name='Добавлено')
+
+    class Meta:
+        verbose_name = 'событие инвалидации'
+        verbose_name_plural = 'События инвалидации'
+        ordering = ('pk',)
+
+    def __str__(self):
+        return self.keys
+
+
+class Task(models.Model):
+    """Фоновая задача в очереди на базе данных."""
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'В очереди'
+        RUNNING = 'running', 'Выполняется'
+        DONE = 'done', 'Выполнена'
+        FAILED = 'failed', 'Ошибка'
+
+    name = models.CharField(max_length=200, verbose_name='Задача')
+    payload = models.JSONField(default=dict, verbose_name='Аргументы')
+    idempotency_key = models.CharField(
+        max_length=200,
+        unique=True,
+        null=True,
+        blank=True,
+        verbose_name='Ключ идемпотентности')
+    status = models.CharField(max_length=10,
+                              choices=Status.choices,
+                              default=Status.QUEUED,
+                              verbose_name='Состояние')
+    attempts = models.PositiveSmallIntegerField(default=0,
+                                                verbose_name='Попыток')
+    max_attempts = models.PositiveSmallIntegerField(
+        default=5,
+        verbose_name='Максимум попыток')
+    run_after = models.DateTimeField(default=timezone.now,
+                                     verbose_name='Выполнить после')
+    locked_by = models.CharField(max_length=100,
+                                 blank=True,
+                                 verbose_name='Обработчик')
+    locked_until = models.DateTimeField(null=True,
+                                        blank=True,
+                                        verbose_name='Занята до')
+    last_error = models.TextField(blank=True, verbose_name='Ошибка')
+    created_at = models.DateTimeField(auto_now_add=True,
+                                      verbose_name='Добавлено')
+    finished_at = models.DateTimeField(null=True,
+                                       blank=True,
+                                       verbose_name='Завершена')
+
+    class Meta:
+        verbose_name = 'задача'
+        verbose_name_plural = 'Задачи'
+        ordering = ('run_after', 'pk')
+        indexes = [models.Index(fields=('status', 'run_after'))]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
+
+
+class OutboxMessage(models.Model):
+    """Письмо в исходящей очереди."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Ожидает отправки'
+        SENDING = 'sending', 'Отправляется'
+        SENT = 'sent', 'Отправлено'
+        DEAD = 'dead', 'Не доставлено'
+
+    subject = models.CharField(max_length=255, verbose_name='Тема')
+    recipients = models.TextField(verbose_name='Получатели')
+    message = models.BinaryField(verbose_name='Письмо')
+    status = models.CharField(max_length=10,
+                              choices=Status.choices,
+                              default=Status.PENDING,
+                              verbose_name='Состояние')
+    attempts = models.PositiveSmallIntegerField(default=0,
+                                                verbose_name='Попыток')
+    next_attempt_at = models.DateTimeField(default=timezone.now,
+                                           verbose_name='Следующая попытка')
+    claimed_by = models.CharField(max_length=100,
+                                  blank=True,
+                                  verbose_name='Отправитель')
+    last_error = models.TextField(blank=True, verbose_name='Ошибка')
+    created_at = models.DateTimeField(auto_now_add=True,
+                                      verbose_name='Добавлено')
+    sent_at = models.DateTimeField(null=True,
+                                   blank=True,
+                                   verbose_name='Отправлено')
+
+    class Meta:
+        verbose_name = 'исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('next_attempt_at', 'pk')
+        indexes = [models.Index(fields=('status', 'next_attempt_at'))]
+
+    def __str__(self):
+        return self.subject
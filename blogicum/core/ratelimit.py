@@ -0,0 +1,134 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.http import HttpResponse
+
+from .cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+
+def take_token(full_at, capacity, period, now):
+    """
+    Взять маркер из корзины ёмкостью ``capacity``, которая наполняется
+    целиком за ``period`` секунд.
+
+    Корзина хранится одним числом — моментом, когда она снова будет
+    полной. Возвращает новый момент и ожидание до следующего маркера
+    (больше нуля, если маркеров нет).
+    """
+    full_at = max(full_at or 0, now) + period / capacity
+    return full_at, full_at - now - period
+
+
+class LocalBuckets:
+    """Корзины процесса на случай недоступности общего кэша."""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def take(self, keys, capacity, period, now):
+        with self._lock:
+            taken = {key: take_token(self._data.get(key), capacity,
+                                     period, now)
+                     for key in keys}
+            wait = max([wait for _, wait in taken.values()], default=0)
+            if wait <= 0:
+                if len(self._data) + len(taken) > self.max_entries:
+                    self._data = {k: v for k, v in self._data.items()
+                                  if v > now}
+                self._data.update(
+                    {key: full_at for key, (full_at, _) in taken.items()})
+            return wait
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+local_buckets = LocalBuckets()
+
+
+def take(keys, capacity, period):
+    """
+    Взять по маркеру из каждой корзины ``keys``; вернуть наибольшее
+    ожидание в секундах или 0.
+
+    Маркеры забираются, только если они есть во всех корзинах, поэтому
+    отклонённый запрос не расходует остальные. Корзины лежат в общем
+    кэше, чтобы лимит действовал на все процессы; чтение и запись не
+    атомарны, поэтому при одновременных запросах лимит может быть
+    превышен на несколько запросов. Если общий кэш недоступен,
+    используются корзины процесса.
+    """
+    now = time.time()
+    cache = shared_cache()
+    try:
+        stored = cache.get_many(keys)
+        taken = {key: take_token(stored.get(key), capacity, period, now)
+                 for key in keys}
+        wait = max([wait for _, wait in taken.values()], default=0)
+        if wait <= 0 and taken:
+            full = {key: full_at for key, (full_at, _) in taken.items()}
+            cache.set_many(full, math.ceil(max(full.values()) - now))
+    except Exception:
+        logger.warning('Rate limit cache is unavailable', exc_info=True)
+        wait = local_buckets.take(keys, capacity, period, now)
+    return max(wait, 0)
+
+
+def bucket_values(request, keys):
+    """Значения ключей корзин запроса: пользователь, IP или поле формы."""
+    for name in keys:
+        if name == 'user':
+            value = request.user.pk if request.user.is_authenticated else None
+        elif name == 'ip':
+            value = request.META.get('REMOTE_ADDR')
+        else:
+            value = request.POST.get(name, '').strip().lower()
+        if value:
+            yield name, hashlib.md5(str(value).encode()).hexdigest()
+
+
+class RateLimitMiddleware:
+    """
+    Ограничивает частоту POST-запросов к представлениям из RATE_LIMITS.
+
+    Для каждого представления заводится корзина на каждое значение
+    ключа; запрос проходит, только если маркер нашёлся во всех, и только
+    тогда маркеры забираются.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method != 'POST':
+            return None
+        name = request.resolver_match.view_name
+        rule = getattr(settings, 'RATE_LIMITS', {}).get(name)
+        if rule is None:
+            return None
+        capacity, period = rule['rate']
+        wait = take([
+            f'ratelimit:{name}:{key}:{value}'
+            for key, value in bucket_values(request, rule['keys'])
+        ], capacity, period)
+        if not wait:
+            return None
+        logger.info('Rate limit exceeded for %s from %s',
+                    name, request.META.get('REMOTE_ADDR'))
+        response = HttpResponse(
+            'Слишком много запросов. Повторите попытку позже.',
+            content_type='text/plain; charset=utf-8', status=429)
+        response['Retry-After'] = str(math.ceil(wait))
+        return response
@@ -0,0 +1,41 @@
+import time
+
+from django.contrib.sessions.backends import cached_db
+from django.contrib.sessions.models import Session
+from django.utils import timezone
+
+from .invalidation import bus
+
+
+class SessionStore(cached_db.SessionStore):
+    """
+    cached_db-сессии поверх двухуровневого кэша.
+
+    Запись и удаление сессии объявляются в канале инвалидации, чтобы
+    другие процессы не читали устаревшую копию из своего L1.
+    """
+
+    def save(self, must_create=False):
+        super().save(must_create)
+        bus.announce([self.cache_key])
+
+    def delete(self, session_key=None):
+        session_key = session_key or self.session_key
+        super().delete(session_key)
+        if session_key:
+            bus.announce([self.cache_key_prefix + session_key])
+
+
+def purge_expired_sessions(batch_size=1000, pause=0):
+    """Удалить истёкшие сессии пачками, не блокируя базу надолго."""
+    total = 0
+    while True:
+        keys = list(Session.objects.filter(
+            expire_date__lt=timezone.now()
+        ).values_list('session_key', flat=True)[:batch_size])
+        if not keys:
+            return total
+        Session.objects.filter(session_key__in=keys).delete()
+        total += len(keys)
+        if pause:
+            time.sleep(pause)
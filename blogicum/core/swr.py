@@ -0,0 +1,74 @@
+import logging
+import random
+import threading
+import time
+from collections import Counter
+
+from django.core.cache import cache
+
+from .tags import get_tagged, set_tagged
+
+logger = logging.getLogger(__name__)
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _count(event, key):
+    with _stats_lock:
+        _stats[event] += 1
+    logger.debug('swr %s: %s', event, key)
+
+
+def swr_stats():
+    """Счётчики отдачи свежих и устаревших значений и пересчётов."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def jittered(ttl, jitter):
+    return ttl * random.uniform(1 - jitter, 1 + jitter)
+
+
+def _recompute(key, compute, tags, ttl, stale_ttl, jitter):
+    value = compute()
+    fresh_for = jittered(ttl, jitter)
+    set_tagged(key, (time.time() + fresh_for, value), tags,
+               int(fresh_for + stale_ttl))
+    _count('recomputed', key)
+    return value
+
+
+def get_or_recompute(key, compute, tags=(), ttl=60, stale_ttl=300,
+                     lock_timeout=10, jitter=0.1):
+    """
+    Значение из кэша в режиме stale-while-revalidate.
+
+    После ``ttl`` (со случайным разбросом ``jitter``) значение ещё
+    ``stale_ttl`` секунд отдаётся устаревшим, пока ровно один процесс,
+    взявший блокировку, пересчитывает его. Инвалидация тегов удаляет
+    значение полностью.
+    """
+    lock_key = f'swr-lock:{key}'
+    envelope = get_tagged(key)
+    if envelope is not None:
+        fresh_until, value = envelope
+        if time.time() < fresh_until:
+            _count('fresh', key)
+            return value
+        if not cache.add(lock_key, 1, lock_timeout):
+            _count('stale', key)
+            return value
+    elif not cache.add(lock_key, 1, lock_timeout):
+        _count('lock_wait', key)
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            envelope = get_tagged(key)
+            if envelope is not None:
+                return envelope[1]
+        return _recompute(key, compute, tags, ttl, stale_ttl, jitter)
+    try:
+        return _recompute(key, compute, tags, ttl, stale_ttl, jitter)
+    finally:
+        cache.delete(lock_key)
@@ -0,0 +1,98 @@
+import time
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+from .invalidation import bus
+
+# Индекс тега только ускоряет вытеснение записей: устаревшую запись
+# отсекает проверка версий, поэтому индекс может истечь или потерять
+# ключ при одновременной записи.
+TAG_INDEX_TIMEOUT = 3600
+
+
+def tag_version_key(tag):
+    return f'tagver:{tag}'
+
+
+def tag_index_key(tag):
+    return f'tagidx:{tag}'
+
+
+def get_tag_versions(tags):
+    """Текущие версии тегов; отсутствующие версии создаются."""
+    keys = {tag_version_key(tag): tag for tag in tags}
+    found = cache.get_many(keys)
+    for key in keys.keys() - found.keys():
+        version = time.time_ns()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+        found[key] = version
+    return {tag: found[key] for key, tag in keys.items()}
+
+
+def set_tagged(key, value, tags, timeout=DEFAULT_TIMEOUT):
+    """Сохранить значение вместе с тегами объектов, от которых оно зависит."""
+    tags = [str(tag) for tag in tags]
+    cache.set(key, (get_tag_versions(tags), value), timeout)
+    for tag in tags:
+        index_key = tag_index_key(tag)
+        keys = cache.get(index_key, set())
+        if key not in keys:
+            keys.add(key)
+            cache.set(index_key, keys, TAG_INDEX_TIMEOUT)
+
+
+def get_tagged(key, default=None):
+    """Значение по ключу, если ни один из его тегов не инвалидирован."""
+    envelope = cache.get(key)
+    if envelope is None:
+        return default
+    versions, value = envelope
+    if get_tag_versions(versions) != versions:
+        return default
+    return value
+
+
+def get_many_tagged(keys):
+    """Актуальные значения по ключам за одно обращение к кэшу версий."""
+    envelopes = cache.get_many(keys)
+    tags = {tag for versions, _ in envelopes.values() for tag in versions}
+    current = get_tag_versions(tags)
+    return {
+        key: value for key, (versions, value) in envelopes.items()
+        if all(current[tag] == version for tag, version in versions.items())
+    }
+
+
+def invalidate_tags(tags):
+    """Вытеснить все записи, зависящие от тегов, во всех процессах."""
+    keys = set()
+    for tag in set(tags):
+        index_key = tag_index_key(tag)
+        keys |= cache.get(index_key, set())
+        keys |= {index_key, tag_version_key(tag)}
+    bus.publish(keys)
+
+
+def describe_tag(tag):
+    """Версия тега и ключи зависящих от него записей (для отладки)."""
+    return {
+        'tag': tag,
+        'version': cache.get(tag_version_key(tag)),
+        'keys': sorted(cache.get(tag_index_key(tag), set())),
+    }
+
+
+def describe_key(key):
+    """Теги записи и признак её актуальности (для отладки)."""
+    envelope = cache.get(key)
+    if envelope is None:
+        return {'key': key, 'cached': False, 'tags': {}, 'fresh': False}
+    versions, _ = envelope
+    return {
+        'key': key,
+        'cached': True,
+        'tags': versions,
+        'fresh': get_tag_versions(versions) == versions,
+    }
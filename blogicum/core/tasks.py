@@ -0,0 +1,240 @@
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .invalidation import bus
+from .models import Task
+from .sessions import purge_expired_sessions
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+class TaskFunction:
+    """Зарегистрированная задача: вызов напрямую или через очередь."""
+
+    def __init__(self, func, name, max_attempts, backoff, every):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.every = every
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, *args, idempotency_key=None, delay=0, **kwargs):
+        """
+        Поставить задачу в очередь и сразу вернуть её строку.
+
+        Повторная постановка с тем же ``idempotency_key`` возвращает уже
+        существующую задачу, пока её строка хранится в таблице.
+        """
+        fields = {
+            'name': self.name,
+            'payload': {'args': list(args), 'kwargs': kwargs},
+            'max_attempts': self.max_attempts,
+            'run_after': timezone.now() + timedelta(seconds=delay),
+        }
+        if idempotency_key is None:
+            task = Task.objects.create(**fields)
+        else:
+            try:
+                with transaction.atomic():
+                    task, _ = Task.objects.get_or_create(
+                        idempotency_key=idempotency_key, defaults=fields)
+            except IntegrityError:
+                task = Task.objects.get(idempotency_key=idempotency_key)
+        if getattr(settings, 'TASKS_EAGER', False):
+            transaction.on_commit(lambda: execute(task.pk))
+        return task
+
+    def retry_delay(self, attempts):
+        """Экспоненциальная задержка перед повтором со случайным разбросом."""
+        delay = self.backoff * 2 ** (attempts - 1)
+        return delay * random.uniform(0.5, 1.5)
+
+
+def task(name=None, max_attempts=5, backoff=2, every=None):
+    """
+    Зарегистрировать функцию как фоновую задачу.
+
+    ``every`` — период в секундах для задач, которые обработчики ставят
+    в очередь сами, не чаще раза за период.
+    """
+    def decorator(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        registry[task_name] = TaskFunction(
+            func, task_name, max_attempts, backoff, every)
+        return registry[task_name]
+    return decorator
+
+
+def execute(task_id, worker_id=''):
+    """Выполнить задачу и записать результат или запланировать повтор."""
+    task = Task.objects.get(pk=task_id)
+    if task.status in (Task.Status.DONE, Task.Status.FAILED):
+        return task.status == Task.Status.DONE
+    if task.status != Task.Status.RUNNING:
+        task.attempts += 1
+        Task.objects.filter(pk=task.pk).update(
+            status=Task.Status.RUNNING, attempts=task.attempts,
+            locked_by=worker_id)
+    func = registry.get(task.name)
+    try:
+        if func is None:
+            raise LookupError(f'Unknown task {task.name!r}')
+        func(*task.payload.get('args', ()), **task.payload.get('kwargs', {}))
+    except Exception:
+        logger.exception('Task %s failed (attempt %s of %s)',
+                         task, task.attempts, task.max_attempts)
+        update = {'last_error': traceback.format_exc(), 'locked_by': '',
+                  'locked_until': None}
+        if func is not None and task.attempts < task.max_attempts:
+            update.update(
+                status=Task.Status.QUEUED,
+                run_after=timezone.now() + timedelta(
+                    seconds=func.retry_delay(task.attempts)))
+        else:
+            update.update(status=Task.Status.FAILED,
+                          finished_at=timezone.now())
+        Task.objects.filter(pk=task.pk).update(**update)
+        return False
+    Task.objects.filter(pk=task.pk).update(
+        status=Task.Status.DONE, finished_at=timezone.now(),
+        locked_by='', locked_until=None)
+    return True
+
+
+class Worker:
+    """
+    Обработчик очереди задач.
+
+    Задачи занимаются условным UPDATE, поэтому несколько обработчиков
+    могут работать с одной таблицей; задача, обработчик которой
+    завис или упал, возвращается в очередь по истечении ``lease``.
+    """
+
+    def __init__(self, concurrency=4, poll_interval=1, lease=300,
+                 retention=None, housekeeping_interval=30):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.housekeeping_interval = housekeeping_interval
+        self._next_housekeeping = 0
+        self.retention = retention if retention is not None else getattr(
+            settings, 'TASKS_RETENTION', 86400)
+        self.worker_id = (f'{socket.gethostname()}:{os.getpid()}:'
+                          f'{threading.get_ident()}')
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def claim(self, limit):
+        """Занять до ``limit`` задач, срок которых наступил."""
+        now = timezone.now()
+        candidates = Task.objects.filter(
+            status=Task.Status.QUEUED, run_after__lte=now
+        ).values_list('pk', flat=True)[:limit]
+        claimed = []
+        for pk in candidates:
+            if Task.objects.filter(pk=pk, status=Task.Status.QUEUED).update(
+                    status=Task.Status.RUNNING,
+                    attempts=F('attempts') + 1,
+                    locked_by=self.worker_id,
+                    locked_until=now + timedelta(seconds=self.lease)):
+                claimed.append(pk)
+        return claimed
+
+    def requeue_expired(self):
+        return Task.objects.filter(
+            status=Task.Status.RUNNING, locked_until__lt=timezone.now()
+        ).update(status=Task.Status.QUEUED, locked_by='', locked_until=None)
+
+    def schedule_periodic(self):
+        now = time.time()
+        for func in registry.values():
+            if func.every:
+                func.enqueue(
+                    idempotency_key=f'{func.name}:{int(now // func.every)}')
+
+    def housekeeping(self):
+        """Вернуть брошенные задачи, запланировать периодические, почистить."""
+        now = time.monotonic()
+        if now < self._next_housekeeping:
+            return
+        self._next_housekeeping = now + self.housekeeping_interval
+        self.requeue_expired()
+        self.schedule_periodic()
+        self.purge_finished()
+
+    def purge_finished(self):
+        return Task.objects.filter(
+            status__in=(Task.Status.DONE, Task.Status.FAILED),
+            finished_at__lt=timezone.now() - timedelta(
+                seconds=self.retention),
+        ).delete()[0]
+
+    def run_pending(self):
+        """Выполнить все готовые задачи в текущем потоке (тесты, --once)."""
+        done = 0
+        bus.poll()
+        while True:
+            claimed = self.claim(self.concurrency)
+            if not claimed:
+                return done
+            for pk in claimed:
+                execute(pk, self.worker_id)
+                done += 1
+
+    def _execute(self, pk):
+        try:
+            execute(pk, self.worker_id)
+        finally:
+            close_old_connections()
+
+    def run(self):
+        """Обрабатывать очередь пулом потоков до вызова ``stop``."""
+        in_flight = set()
+        with ThreadPoolExecutor(self.concurrency,
+                                thread_name_prefix='blogicum-task') as pool:
+            while not self._stop.is_set():
+                in_flight = {future for future in in_flight
+                             if not future.done()}
+                try:
+                    bus.poll()
+                    self.housekeeping()
+                    free = self.concurrency - len(in_flight)
+                    claimed = self.claim(free) if free else []
+                except Exception:
+                    logger.exception('Task queue polling failed')
+                    claimed = []
+                finally:
+                    close_old_connections()
+                for pk in claimed:
+                    in_flight.add(pool.submit(self._execute, pk))
+                if not claimed:
+                    self._stop.wait(self.poll_interval)
+
+
+@task(name='core.purge_sessions', max_attempts=1,
+      every=getattr(settings, 'SESSION_PURGE_INTERVAL', 0) or None)
+def purge_sessions(batch_size=1000, pause=0.1):
+    """Периодическая очистка истёкших сессий."""
+    if 'signed_cookies' in settings.SESSION_ENGINE:
+        return
+    deleted = purge_expired_sessions(batch_size, pause)
+    logger.info('Purged %s expired sessions', deleted)
@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.template.base import Template
+
+_state = threading.local()
+_original_render = None
+
+
+def _template_name(template):
+    return getattr(template.origin, 'template_name', None) or template.name
+
+
+def _profiled_render(self, context):
+    profiler = getattr(_state, 'profiler', None)
+    if profiler is None:
+        return _original_render(self, context)
+    return profiler.measure(self, context)
+
+
+def install():
+    """Подменить Template._render один раз на профилирующую обёртку."""
+    global _original_render
+    if _original_render is None:
+        _original_render = Template._render
+        Template._render = _profiled_render
+
+
+class TemplateProfiler:
+    """
+    Время рендеринга по шаблонам и по парам «шаблон → {% include %}».
+
+    ``total`` включает вложенные шаблоны, ``own`` — только собственные
+    узлы шаблона.
+    """
+
+    def __init__(self):
+        self.templates = defaultdict(lambda: {'calls': 0, 'total': 0.0,
+                                              'own': 0.0})
+        self.includes = defaultdict(lambda: {'calls': 0, 'total': 0.0})
+        self._stack = []
+
+    def measure(self, template, context):
+        name = _template_name(template)
+        parent = self._stack[-1] if self._stack else None
+        frame = [name, 0.0]
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return _original_render(template, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            stats = self.templates[name]
+            stats['calls'] += 1
+            stats['total'] += elapsed
+            stats['own'] += elapsed - frame[1]
+            if parent is not None:
+                parent[1] += elapsed
+                edge = self.includes[(parent[0], name)]
+                edge['calls'] += 1
+                edge['total'] += elapsed
+
+    @contextmanager
+    def activate(self):
+        install()
+        previous = getattr(_state, 'profiler', None)
+        _state.profiler = self
+        try:
+            yield self
+        finally:
+            _state.profiler = previous
+
+    def report(self):
+        """Строки отчёта, отсортированные по суммарному времени."""
+        lines = [f'{"template":<40} {"calls":>6} {"total ms":>9} '
+                 f'{"own ms":>9}']
+        for name, stats in sorted(self.templates.items(),
+                                  key=lambda item: -item[1]['total']):
+            lines.append(f'{name:<40} {stats["calls"]:>6} '
+                         f'{stats["total"] * 1000:>9.2f} '
+                         f'{stats["own"] * 1000:>9.2f}')
+        lines.append('')
+        lines.append(f'{"include":<60} {"calls":>6} {"total ms":>9}')
+        for (parent, child), stats in sorted(
+                self.includes.items(), key=lambda item: -item[1]['total']):
+            edge = f'{parent} -> {child}'
+            lines.append(f'{edge:<60} {stats["calls"]:>6} '
+                         f'{stats["total"] * 1000:>9.2f}')
+        return lines
+
+    def server_timing(self, limit=5):
+        """Значение заголовка Server-Timing для самых дорогих шаблонов."""
+        top = sorted(self.templates.items(),
+                     key=lambda item: -item[1]['total'])[:limit]
+        return ', '.join(
+            f'tpl{index};desc="{name}";dur={stats["total"] * 1000:.2f}'
+            for index, (name, stats) in enumerate(top))
@@ -0,0 +1,33 @@
+from pathlib import Path
+
+from django.template import engines
+from django.template.utils import get_app_template_dirs
+
+
+def iter_template_names(engine):
+    """Имена всех шаблонов из каталогов движка и приложений."""
+    dirs = list(engine.dirs)
+    if engine.app_dirs or any(
+            'app_directories' in str(loader) for loader in engine.loaders):
+        dirs += get_app_template_dirs('templates')
+    seen = set()
+    for directory in dirs:
+        for path in sorted(Path(directory).rglob('*.html')):
+            name = path.relative_to(directory).as_posix()
+            if name not in seen:
+                seen.add(name)
+                yield name
+
+
+def precompile_templates(alias='django'):
+    """
+    Загрузить и скомпилировать все шаблоны проекта.
+
+    С кэширующим загрузчиком шаблоны остаются в памяти процесса, и первые
+    запросы не тратят время на чтение и разбор файлов.
+    """
+    engine = engines[alias].engine
+    names = list(iter_template_names(engine))
+    for name in names:
+        engine.get_template(name)
+    return names
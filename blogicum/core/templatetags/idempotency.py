@@ -0,0 +1,11 @@
+from django import template
+
+from core.idempotency import idempotency_input as make_input
+
+register = template.Library()
+
+
+@register.simple_tag
+def idempotency_input():
+    """Скрытое поле с новым ключом идемпотентности для формы."""
+    return make_input()
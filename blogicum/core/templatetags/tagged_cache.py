@@ -0,0 +1,67 @@
+from django import template
+from django.core.cache.utils import make_template_fragment_key
+
+from core.swr import get_or_recompute
+from core.tags import get_tagged, set_tagged
+
+register = template.Library()
+
+
+class TaggedCacheNode(template.Node):
+    def __init__(self, nodelist, expire_time_var, fragment_name, vary_on,
+                 tags_var, stale_var=None):
+        self.nodelist = nodelist
+        self.expire_time_var = expire_time_var
+        self.fragment_name = fragment_name
+        self.vary_on = vary_on
+        self.tags_var = tags_var
+        self.stale_var = stale_var
+
+    def render(self, context):
+        key = make_template_fragment_key(
+            self.fragment_name,
+            [var.resolve(context) for var in self.vary_on])
+        if self.stale_var is not None:
+            return get_or_recompute(
+                key,
+                lambda: self.nodelist.render(context),
+                tags=self.tags_var.resolve(context),
+                ttl=self.expire_time_var.resolve(context),
+                stale_ttl=self.stale_var.resolve(context),
+            )
+        value = get_tagged(key)
+        if value is None:
+            value = self.nodelist.render(context)
+            set_tagged(key, value, self.tags_var.resolve(context),
+                       self.expire_time_var.resolve(context))
+        return value
+
+
+@register.tag('cachetagged')
+def do_cachetagged(parser, token):
+    """
+    Кэширует фрагмент шаблона с тегами зависимостей::
+
+        {% cachetagged 300 post_card post.id tags=post.cache_tags %}
+
+    С ``stale=<секунды>`` истёкший фрагмент отдаётся устаревшим, пока его
+    пересчитывает один процесс.
+    """
+    nodelist = parser.parse(('endcachetagged',))
+    parser.delete_first_token()
+    tokens = token.split_contents()
+    options = {}
+    while tokens and '=' in tokens[-1]:
+        name, value = tokens.pop().split('=', 1)
+        options[name] = parser.compile_filter(value)
+    if len(tokens) < 3 or 'tags' not in options:
+        raise template.TemplateSyntaxError(
+            f"'{tokens[0]}' tag requires at least 2 arguments and tags=.")
+    return TaggedCacheNode(
+        nodelist,
+        parser.compile_filter(tokens[1]),
+        tokens[2],
+        [parser.compile_filter(token) for token in tokens[3:]],
+        options['tags'],
+        options.get('stale'),
+    )
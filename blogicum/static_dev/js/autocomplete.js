@@ -0,0 +1,58 @@
+// Подсказки для полей с data-autocomplete-url: варианты по началу
+// названия подгружаются в datalist поля по мере ввода, а ключ выбранного
+// варианта записывается в скрытое поле из data-value-input. Одинаковые
+// названия в подсказках различаются номером варианта.
+(function () {
+  var DELAY = 200;
+  Array.prototype.forEach.call(
+    document.querySelectorAll('input[data-autocomplete-url]'),
+    function (input) {
+      var list = document.getElementById(input.getAttribute('list'));
+      var hidden = document.getElementById(input.dataset.valueInput);
+      var timer = null;
+      var current = null;
+      // Подпись варианта -> ключ; начальное значение поля уже известно.
+      var known = {};
+      if (hidden.value) {
+        known[input.value] = hidden.value;
+      }
+      function load(query, page) {
+        var url = input.dataset.autocompleteUrl +
+          '?q=' + encodeURIComponent(query) + '&page=' + page;
+        fetch(url, {credentials: 'same-origin'})
+          .then(function (response) { return response.json(); })
+          .then(function (data) {
+            if (query !== current) {
+              return;
+            }
+            if (page === 1) {
+              list.innerHTML = '';
+            }
+            var counts = {};
+            data.results.forEach(function (choice) {
+              counts[choice.text] = (counts[choice.text] || 0) + 1;
+            });
+            data.results.forEach(function (choice) {
+              var label = counts[choice.text] > 1 ?
+                choice.text + ' (#' + choice.id + ')' : choice.text;
+              var option = document.createElement('option');
+              option.value = label;
+              known[label] = String(choice.id);
+              list.appendChild(option);
+            });
+            if (data.more && page < 5) {
+              load(query, page + 1);
+            }
+          });
+      }
+      input.addEventListener('input', function () {
+        hidden.value = known[input.value] || '';
+        clearTimeout(timer);
+        timer = setTimeout(function () {
+          current = input.value.trim();
+          load(current, 1);
+        }, DELAY);
+      });
+    }
+  );
+})();
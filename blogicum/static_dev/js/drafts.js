@@ -0,0 +1,113 @@
+// Автосохранение формы публикации: через DELAY мс после последней
+// правки на сервер уходят только изменённые поля, текст — заменой
+// изменённого участка.
+(function () {
+  var DELAY = 2000;
+  var FIELDS = ['title', 'text', 'pub_date', 'location', 'category'];
+  var form = document.querySelector('form[data-draft-url]');
+  if (!form || !window.fetch || !window.JSON) {
+    return;
+  }
+  var version = Number(form.dataset.draftVersion) || 0;
+  var token = form.querySelector('[name=csrfmiddlewaretoken]').value;
+
+  function collect() {
+    var values = {};
+    FIELDS.forEach(function (name) {
+      var field = form.elements[name];
+      if (field) {
+        values[name] = field.value;
+      }
+    });
+    return values;
+  }
+
+  // Замена участка в кодовых точках, как строки индексируются в Python.
+  function splice(before, after) {
+    var a = Array.from(before);
+    var b = Array.from(after);
+    var start = 0;
+    while (start < a.length && start < b.length && a[start] === b[start]) {
+      start++;
+    }
+    var end = 0;
+    while (end < a.length - start && end < b.length - start &&
+           a[a.length - 1 - end] === b[b.length - 1 - end]) {
+      end++;
+    }
+    return {
+      at: start,
+      remove: a.length - start - end,
+      insert: b.slice(start, b.length - end).join('')
+    };
+  }
+
+  var saved = collect();
+  var timer = null;
+  var sending = false;
+  var unflushed = false;
+  var submitted = false;
+
+  function save(flush) {
+    clearTimeout(timer);
+    if (sending && !flush) {
+      timer = setTimeout(save, DELAY);
+      return;
+    }
+    var current = collect();
+    var changes = {};
+    var changed = false;
+    FIELDS.forEach(function (name) {
+      if (name in current && current[name] !== saved[name]) {
+        changes[name] = name === 'text' && name in saved
+          ? splice(saved[name], current[name])
+          : current[name];
+        changed = true;
+      }
+    });
+    if (submitted || (!changed && !(flush && unflushed))) {
+      return;
+    }
+    sending = true;
+    fetch(form.dataset.draftUrl, {
+      method: 'POST',
+      credentials: 'same-origin',
+      keepalive: Boolean(flush),
+      headers: {'Content-Type': 'application/json', 'X-CSRFToken': token},
+      body: JSON.stringify({version: version, changes: changes, flush: flush})
+    }).then(function (response) {
+      return response.json().then(function (data) {
+        if (response.ok) {
+          version = data.version;
+          saved = current;
+          unflushed = !flush;
+        } else if (response.status === 409) {
+          // Черновик сохранён из другой вкладки: следующее
+          // автосохранение отправит все поля целиком.
+          version = data.version;
+          saved = {};
+          timer = setTimeout(save, DELAY);
+        } else if (response.status === 400) {
+          // Сервер не принял замену участка: следующее автосохранение
+          // отправит все поля целиком.
+          saved = {};
+        }
+      });
+    }).catch(function () {}).then(function () {
+      sending = false;
+    });
+  }
+
+  form.addEventListener('input', function () {
+    clearTimeout(timer);
+    timer = setTimeout(save, DELAY);
+  });
+  window.addEventListener('pagehide', function () {
+    save(true);
+  });
+  form.addEventListener('submit', function () {
+    // Сохранённая публикация удаляет черновик на сервере.
+    clearTimeout(timer);
+    submitted = true;
+  });
+})();
@@ -0,0 +1,67 @@
+// Новые комментарии публикации без перезагрузки страницы.
+(function () {
+  var list = document.getElementById('comments');
+  if (!list) {
+    return;
+  }
+  function hasComment(id) {
+    return Boolean(list.querySelector('a[name="comment_' + id + '"]'));
+  }
+  function append(id, html) {
+    if (!hasComment(id)) {
+      list.insertAdjacentHTML('beforeend', html);
+    }
+  }
+
+  var form = document.querySelector('form[data-json-url]');
+
+  // Следующий комментарий — новая отправка с новым ключом.
+  function renewToken() {
+    var token = form.elements.idempotency_key;
+    if (token && window.crypto) {
+      var bytes = window.crypto.getRandomValues(new Uint8Array(16));
+      token.value = Array.prototype.map.call(bytes, function (byte) {
+        return ('0' + byte.toString(16)).slice(-2);
+      }).join('');
+    }
+  }
+  if (form && window.fetch && window.FormData) {
+    form.addEventListener('submit', function (event) {
+      event.preventDefault();
+      var data = new FormData(form);
+      fetch(form.dataset.jsonUrl, {
+        method: 'POST',
+        body: data,
+        credentials: 'same-origin',
+        headers: {'X-CSRFToken': data.get('csrfmiddlewaretoken')}
+      }).then(function (response) {
+        if (response.status !== 201) {
+          // Ошибки формы показывает обычная отправка.
+          form.submit();
+          return;
+        }
+        return response.json().then(function (comment) {
+          append(comment.id, comment.html);
+          form.reset();
+          renewToken();
+        });
+      }).catch(function () {
+        form.submit();
+      });
+    });
+  }
+
+  // Поток событий есть только под ASGI; без него страница его не указывает.
+  if (!window.EventSource || !list.dataset.eventsUrl) {
+    return;
+  }
+  var ids = Array.prototype.map.call(
+    list.querySelectorAll('a[name^="comment_"]'),
+    function (link) { return Number(link.name.slice('comment_'.length)); }
+  );
+  var last = ids.length ? Math.max.apply(null, ids) : 0;
+  var source = new EventSource(list.dataset.eventsUrl + '?after=' + last);
+  source.addEventListener('comment', function (event) {
+    append(event.lastEventId, event.data);
+  });
+})();
@@ -19,6 +19,7 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -41,6 +42,16 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clean_cache():
+    """Пустые кэши обоих уровней до и после каждого теста."""
+    for alias in ("default", "shared"):
+        caches[alias].clear()
+    yield
+    for alias in ("default", "shared"):
+        caches[alias].clear()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -0,0 +1,115 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+
+@pytest.fixture
+def api_posts(mixer, user, published_category):
+    now = timezone.now()
+    return [
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=True, text="Слово " * 100,
+            pub_date=now - timedelta(hours=index // 2 + 1),
+        )
+        for index in range(7)
+    ]
+
+
+@pytest.mark.django_db
+def test_feed_cursor_walks_all_posts(client, api_posts, mixer, user):
+    mixer.blend("blog.Post", author=user, is_published=False,
+                pub_date=timezone.now() - timedelta(days=1))
+    url, seen = "/api/v1/posts/?limit=3", []
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert len(data["results"]) <= 3
+        seen += [post["id"] for post in data["results"]]
+        url = data["next"]
+    expected = [post.id for post in sorted(
+        api_posts, key=lambda post: (post.pub_date, post.id), reverse=True)]
+    assert seen == expected, (
+        "Убедитесь, что курсор API проходит ленту без пропусков и повторов"
+        " в порядке от новых публикаций к старым."
+    )
+
+
+@pytest.mark.django_db
+def test_fields_select_excerpt_and_omit_text(client, api_posts):
+    response = client.get("/api/v1/posts/")
+    post = response.json()["results"][0]
+    assert "text" not in post and len(post["excerpt"]) == 200, (
+        "Убедитесь, что лента API по умолчанию отдаёт отрывок без текста."
+    )
+    response = client.get("/api/v1/posts/?fields=id,text")
+    assert set(response.json()["results"][0]) == {"id", "text"}, (
+        "Убедитесь, что параметр fields выбирает поля ответа."
+    )
+    response = client.get("/api/v1/posts/?fields=id,password")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_scoped_feeds_detail_and_comments(
+    client, api_posts, mixer, user, published_category
+):
+    post = api_posts[0]
+    mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    category = client.get(
+        f"/api/v1/categories/{published_category.slug}/posts/")
+    author = client.get(f"/api/v1/authors/{user.username}/posts/")
+    assert len(category.json()["results"]) == len(api_posts)
+    assert len(author.json()["results"]) == len(api_posts)
+    detail = client.get(f"/api/v1/posts/{post.id}/").json()
+    assert detail["text"] == post.text and detail["comment_count"] == 3
+    comments = client.get(f"/api/v1/posts/{post.id}/comments/?limit=2")
+    data = comments.json()
+    assert len(data["results"]) == 2 and data["next"]
+    rest = client.get(data["next"]).json()
+    assert len(rest["results"]) == 1 and rest["next"] is None
+    assert client.get("/api/v1/posts/0/").status_code == HTTPStatus.NOT_FOUND
+    assert client.get(
+        "/api/v1/categories/missing/posts/"
+    ).status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_api_conditional_get_and_invalidation(client, api_posts, user):
+    url = "/api/v1/posts/"
+    response = client.get(url)
+    assert response.has_header("ETag")
+    not_modified = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что API отвечает 304 на If-None-Match с актуальным ETag."
+    )
+    post = api_posts[0]
+    post.title = "Новый заголовок"
+    post.save()
+    changed = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert changed.status_code == HTTPStatus.OK
+    titles = [item["title"] for item in changed.json()["results"]]
+    assert "Новый заголовок" in titles, (
+        "Убедитесь, что изменение публикации сбрасывает кэш API."
+    )
+
+
+@pytest.mark.django_db
+def test_new_comment_refreshes_cached_page(client, api_posts, mixer, user):
+    url = "/api/v1/posts/?fields=id,comment_count"
+    etag = client.get(url)["ETag"]
+    post = api_posts[0]
+    mixer.blend("blog.Comment", post=post, author=user)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    counts = {item["id"]: item["comment_count"]
+              for item in response.json()["results"]}
+    assert counts[post.id] == 1, (
+        "Убедитесь, что под новым ETag API отдаёт страницу с новым числом"
+        " комментариев, а не закэшированную старую."
+    )
+    repeated = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert repeated.status_code == HTTPStatus.NOT_MODIFIED
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from django.http import HttpResponse
+from django.test import override_settings
+from django.urls import path
+
+from core.asgi import read_view
+
+peak_threads = []
+
+
+@read_view
+def slow_view(request):
+    peak_threads.append(threading.active_count())
+    time.sleep(0.1)
+    return HttpResponse("ok")
+
+
+def thread_name(request):
+    return HttpResponse(threading.current_thread().name)
+
+
+@read_view
+def read_thread_name(request):
+    return thread_name(request)
+
+
+urlpatterns = [
+    path("slow/", slow_view),
+    path("read/", read_thread_name),
+    path("write/", thread_name),
+]
+
+
+def call(application, path, method="GET"):
+    return asyncio.run(call_async(application, path, method))
+
+
+async def call_async(application, path, method="GET"):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "scheme": "http", "path": path, "root_path": "",
+        "query_string": b"", "headers": [(b"host", b"localhost")],
+        "client": ("10.0.0.1", 0), "server": ("localhost", 80),
+    }
+    await application(scope, receive, send)
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return messages[0]["status"], body
+
+
+def test_health_and_static_are_served_natively():
+    from core.asgi import Application
+
+    def django_app(scope, receive, send):
+        raise AssertionError("Запрос не должен доходить до Django.")
+
+    application = Application(django_app)
+    status, body = call(application, "/healthz/")
+    assert status == 200 and json.loads(body) == {"status": "ok"}, (
+        "Убедитесь, что проверка живости отвечает без Django."
+    )
+    status, body = call(application, "/static/css/bootstrap.min.css")
+    assert status == 200 and body, (
+        "Убедитесь, что статика отдаётся асинхронно без Django."
+    )
+    status, _ = call(application, "/static/../blogicum/settings.py")
+    assert status == 404, "Убедитесь, что выход за пределы статики запрещён."
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(ROOT_URLCONF=__name__)
+def test_read_views_run_in_db_pool():
+    from core.asgi import BlogicumASGIHandler
+
+    handler = BlogicumASGIHandler()
+    status, body = call(handler, "/read/")
+    assert status == 200 and body.startswith(b"blogicum-db"), (
+        "Убедитесь, что запросы к представлениям для чтения выполняются"
+        " в пуле потоков базы данных."
+    )
+    _, body = call(handler, "/write/")
+    assert not body.startswith(b"blogicum-db"), (
+        "Убедитесь, что остальные представления выполняются в общем"
+        " потоке синхронного кода."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(ROOT_URLCONF=__name__)
+def test_concurrent_requests_use_bounded_threads(settings):
+    from core.asgi import BlogicumASGIHandler
+
+    handler = BlogicumASGIHandler()
+    peak_threads.clear()
+    baseline = threading.active_count()
+
+    async def flood():
+        return await asyncio.gather(
+            *[call_async(handler, "/slow/") for _ in range(40)])
+
+    start = time.perf_counter()
+    responses = asyncio.run(flood())
+    elapsed = time.perf_counter() - start
+    assert all(status == 200 for status, _ in responses)
+    assert elapsed < 40 * 0.1 / 2, (
+        "Убедитесь, что запросы к представлениям для чтения выполняются"
+        " параллельно в пуле, а не по одному."
+    )
+    assert max(peak_threads) - baseline <= settings.ASGI_DB_THREADS + 2, (
+        "Убедитесь, что число потоков под ASGI ограничено пулом базы данных"
+        " и не растёт с числом одновременных запросов."
+    )
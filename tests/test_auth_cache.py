@@ -0,0 +1,95 @@
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def user_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    return [query for query in queries if "auth_user" in query["sql"]]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/", "/profile/{username}/"])
+def test_authenticated_user_is_cached(user, user_client, url):
+    url = url.format(username=user.username)
+    user_client.get(url)
+    assert not user_queries(user_client, url), (
+        "Убедитесь, что пользователь из сессии берётся из кэша, а страницы"
+        " используют `request.user` вместо повторных запросов."
+    )
+
+
+@pytest.mark.django_db
+def test_password_change_invalidates_cached_user(user, user_client):
+    user_client.get("/")
+    user.set_password("new-password-123")
+    user.save()
+    assert user_queries(user_client, "/"), (
+        "Убедитесь, что смена пароля сбрасывает кэш пользователя."
+    )
+    assert not user_client.get("/").wsgi_request.user.is_authenticated, (
+        "Убедитесь, что после смены пароля старые сессии разлогиниваются."
+    )
+
+
+@pytest.mark.django_db
+def test_cached_user_has_no_password_hash(user, user_client):
+    user_client.get("/")
+    cached = caches["default"].get(f"auth:user:{user.pk}")
+    assert cached is not None and user.password not in str(cached), (
+        "Убедитесь, что в общий кэш не попадает хэш пароля пользователя."
+    )
+    request_user = user_client.get("/").wsgi_request.user
+    assert request_user.is_authenticated and request_user.pk == user.pk
+    request_user.first_name = "Новое имя"
+    request_user.save()
+    password = user.password
+    user.refresh_from_db()
+    assert user.password == password, (
+        "Убедитесь, что сохранение пользователя из кэша не стирает пароль."
+    )
+    assert user.first_name == "Новое имя"
+
+
+@pytest.mark.django_db
+def test_model_backend_sessions_stay_logged_in(user, client):
+    client.force_login(
+        user, backend="django.contrib.auth.backends.ModelBackend")
+    assert client.get("/").wsgi_request.user.is_authenticated, (
+        "Убедитесь, что сессии, сохранённые с ModelBackend, не"
+        " разлогиниваются."
+    )
+
+
+@pytest.mark.django_db
+def test_profile_lists_page_images(user, user_client, mixer):
+    mixer.blend("blog.Post", author=user, image="post_images/cover.jpg")
+    response = user_client.get(f"/profile/{user.username}/")
+    assert response.context["image"], (
+        "Убедитесь, что страница профиля передаёт в контекст изображения"
+        " публикаций страницы."
+    )
+
+
+@pytest.mark.django_db
+def test_password_change_view_keeps_user_logged_in(user, user_client):
+    user.set_password("old-password-123")
+    user.save()
+    user_client.force_login(user)
+    user_client.get("/")
+    response = user_client.post("/auth/password_change/", {
+        "old_password": "old-password-123",
+        "new_password1": "new-password-456",
+        "new_password2": "new-password-456",
+    })
+    assert response.status_code == 302
+    assert user_client.get("/").wsgi_request.user.is_authenticated, (
+        "Убедитесь, что после смены пароля через форму пользователь"
+        " остаётся в системе."
+    )
+    assert not user_queries(user_client, "/"), (
+        "Убедитесь, что после смены пароля пользователь снова берётся из"
+        " кэша."
+    )
@@ -0,0 +1,126 @@
+import pytest
+from django.core.cache import caches
+
+from core.cache import LocalLRU, TwoTierCache
+
+
+@pytest.fixture
+def two_tier_cache():
+    cache = caches["default"]
+    assert isinstance(cache, TwoTierCache), (
+        "Убедитесь, что кэш по умолчанию использует `core.cache.TwoTierCache`."
+    )
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+def test_local_lru_limits():
+    lru = LocalLRU(max_entries=2, max_bytes=10)
+    lru.set("a", b"1234", None)
+    lru.set("b", b"1234", None)
+    lru.get("a")
+    lru.set("c", b"1234", None)
+    assert lru.get("b") is None, (
+        "Убедитесь, что при переполнении LRU вытесняется давно не читавшаяся"
+        " запись."
+    )
+    assert lru.get("a") == b"1234"
+    lru.set("d", b"12345678", None)
+    assert lru.stats()["bytes"] <= 10, (
+        "Убедитесь, что LRU не превышает заданный объём памяти."
+    )
+
+
+def test_local_lru_ttl():
+    lru = LocalLRU(max_entries=2, max_bytes=100)
+    lru.set("a", b"1", -1)
+    assert lru.get("a") is None, "Убедитесь, что записи L1 истекают по TTL."
+
+
+def test_two_tier_hits(two_tier_cache):
+    two_tier_cache.set("key", {"value": 1})
+    assert two_tier_cache.get("key") == {"value": 1}
+    two_tier_cache.clear_local()
+    assert two_tier_cache.get("key") == {"value": 1}, (
+        "Убедитесь, что при промахе L1 значение читается из общего кэша."
+    )
+    stats = two_tier_cache.stats()
+    assert stats["local"]["hits"] >= 1
+    assert stats["shared"]["hits"] >= 1
+    assert stats["local"]["bytes"] > 0
+
+
+def test_two_tier_delete(two_tier_cache):
+    two_tier_cache.set("key", 1)
+    two_tier_cache.delete("key")
+    assert two_tier_cache.get("key") is None
+    assert caches["shared"].get("key") is None, (
+        "Убедитесь, что удаление ключа затрагивает оба уровня кэша."
+    )
+
+
+@pytest.mark.django_db
+def test_invalidation_bus_evicts_local_entries(two_tier_cache, monkeypatch):
+    from core.invalidation import bus
+    from core.models import InvalidationEvent
+
+    monkeypatch.setattr(bus, "_last_seen", None)
+    bus.poll(force=True)
+    two_tier_cache.set("shared-key", 1)
+    caches["shared"].delete("shared-key")
+    InvalidationEvent.objects.create(keys="shared-key")
+    assert two_tier_cache.get("shared-key") == 1
+    bus.poll(force=True)
+    assert two_tier_cache.get("shared-key") is None, (
+        "Убедитесь, что события инвалидации из других процессов вытесняют"
+        " ключи из локального кэша."
+    )
+
+
+
+@pytest.mark.django_db
+def test_publish_evicts_again_after_commit(
+    django_capture_on_commit_callbacks
+):
+    from core.invalidation import bus
+    from core.models import InvalidationEvent
+
+    cache = caches["default"]
+    with django_capture_on_commit_callbacks() as callbacks:
+        bus.publish(["published-key"])
+        cache.set("published-key", "старое значение")
+    assert not InvalidationEvent.objects.exists(), (
+        "Убедитесь, что событие инвалидации пишется после фиксации"
+        " транзакции."
+    )
+    for callback in callbacks:
+        callback()
+    assert cache.get("published-key") is None, (
+        "Убедитесь, что после фиксации ключи удаляются из кэша ещё раз."
+    )
+    assert InvalidationEvent.objects.filter(keys="published-key").exists()
+
+def test_stale_while_revalidate(two_tier_cache):
+    from core.swr import get_or_recompute, swr_stats
+
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert get_or_recompute("swr-key", compute, ttl=-1) == 1
+    stale_before = swr_stats().get("stale", 0)
+    two_tier_cache.add("swr-lock:swr-key", 1, 10)
+    assert get_or_recompute("swr-key", compute, ttl=-1) == 1, (
+        "Убедитесь, что пока значение пересчитывает другой процесс,"
+        " отдаётся устаревшее значение."
+    )
+    assert len(calls) == 1
+    assert swr_stats()["stale"] == stale_before + 1
+    two_tier_cache.delete("swr-lock:swr-key")
+    assert get_or_recompute("swr-key", compute, ttl=-1) == 2, (
+        "Убедитесь, что устаревшее значение пересчитывается, когда"
+        " блокировка свободна."
+    )
@@ -0,0 +1,153 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.cache import post_card_key
+from core.tags import describe_key, describe_tag
+
+
+@pytest.fixture
+def cached_post(mixer, user, published_category, published_location):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+        title="Исходный заголовок",
+    )
+
+
+def page_urls(post):
+    return {
+        "index": "/",
+        "category": f"/category/{post.category.slug}/",
+        "profile": f"/profile/{post.author.username}/",
+        "detail": f"/posts/{post.id}/",
+    }
+
+
+def get_content(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page", ["index", "category", "profile", "detail"])
+def test_post_edit_invalidates_page(client, cached_post, page):
+    url = page_urls(cached_post)[page]
+    assert "Исходный заголовок" in get_content(client, url)
+    cached_post.title = "Новый заголовок"
+    cached_post.save()
+    content = get_content(client, url)
+    assert "Новый заголовок" in content, (
+        f"Убедитесь, что после изменения поста страница `{page}` показывает"
+        " актуальные данные."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page", ["index", "category", "profile"])
+def test_related_edits_invalidate_cards(client, cached_post, page):
+    url = page_urls(cached_post)[page]
+    get_content(client, url)
+    cached_post.location.name = "Новое место"
+    cached_post.location.save()
+    cached_post.category.title = "Новая категория"
+    cached_post.category.save()
+    content = get_content(client, url)
+    assert "Новое место" in content and "Новая категория" in content, (
+        f"Убедитесь, что изменения категории и местоположения сбрасывают"
+        f" карточки публикаций на странице `{page}`."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page", ["index", "category", "profile"])
+def test_comment_invalidates_card_count(client, mixer, cached_post, page):
+    url = page_urls(cached_post)[page]
+    assert "Комментарии (0)" in get_content(client, url)
+    mixer.blend("blog.Comment", post=cached_post)
+    assert "Комментарии (1)" in get_content(client, url), (
+        f"Убедитесь, что новый комментарий обновляет счётчик на странице"
+        f" `{page}`."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page", ["index", "category", "profile"])
+def test_new_post_invalidates_counts(client, mixer, cached_post, page):
+    url = page_urls(cached_post)[page]
+    get_content(client, url)
+    mixer.cycle(10).blend(
+        "blog.Post",
+        author=cached_post.author,
+        category=cached_post.category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+    assert "?page=2" in get_content(client, url), (
+        f"Убедитесь, что кэш числа публикаций на странице `{page}`"
+        " сбрасывается при добавлении поста."
+    )
+
+
+@pytest.mark.django_db
+def test_tag_introspection(client, cached_post):
+    get_content(client, "/")
+    key = post_card_key(cached_post.id)
+    assert key in describe_tag(f"post:{cached_post.id}")["keys"]
+    info = describe_key(key)
+    assert info["fresh"]
+    assert f"category:{cached_post.category_id}" in info["tags"]
+    cached_post.save()
+    assert not describe_key(key)["fresh"]
+
+
+@pytest.mark.django_db
+def test_user_save_keeps_other_pages(client, mixer, cached_post):
+    etag = client.get("/")["ETag"]
+    mixer.blend("auth.User")
+    response = client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        "Убедитесь, что регистрация или изменение пользователя не сбрасывает"
+        " кэш страниц, не связанных с ним."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page", ["index", "category", "profile", "detail"])
+def test_author_rename_refreshes_pages(client, cached_post, page):
+    url = page_urls(cached_post)[page]
+    etag = client.get(url)["ETag"]
+    cached_post.author.username = "renamed_author"
+    cached_post.author.save()
+    if page == "profile":
+        url = "/profile/renamed_author/"
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        f"Убедитесь, что переименование автора меняет ETag страницы `{page}`."
+    )
+    assert "@renamed_author" in response.content.decode("utf-8"), (
+        f"Убедитесь, что страница `{page}` показывает новое имя автора."
+    )
+
+
+@pytest.mark.django_db
+def test_commenter_rename_refreshes_post_detail(
+    client, mixer, another_user, cached_post
+):
+    mixer.blend("blog.Comment", post=cached_post, author=another_user)
+    url = page_urls(cached_post)["detail"]
+    etag = client.get(url)["ETag"]
+    another_user.username = "renamed_commenter"
+    another_user.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert "renamed_commenter" in response.content.decode("utf-8"), (
+        "Убедитесь, что переименование комментатора обновляет страницу"
+        " публикации."
+    )
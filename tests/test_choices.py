@@ -0,0 +1,115 @@
+import pytest
+from django.utils import timezone
+
+from blog.models import Location, Post
+
+
+@pytest.fixture
+def many_locations(mixer):
+    mixer.cycle(30).blend(
+        "blog.Location", is_published=True,
+        name=(f"Город {index:02}" for index in range(30)),
+    )
+    mixer.blend("blog.Location", is_published=False, name="Город скрытый")
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("many_locations")
+def test_post_form_does_not_render_every_location(user_client):
+    content = user_client.get("/posts/create/").content.decode()
+    assert "Город 29" not in content, (
+        "Убедитесь, что форма публикации не выводит все местоположения."
+    )
+    assert 'data-autocomplete-url="/choices/location/"' in content
+    assert 'data-autocomplete-url="/choices/category/"' in content
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("many_locations")
+def test_choices_are_prefix_searched_paged_and_cached(
+    client, mixer, django_assert_num_queries
+):
+    data = client.get("/choices/location/?q=город").json()
+    assert len(data["results"]) == 20 and data["more"], (
+        "Убедитесь, что варианты отдаются страницами."
+    )
+    assert data["results"][0]["text"] == "Город 00"
+    page = client.get("/choices/location/?q=город&page=2").json()
+    assert [choice["text"] for choice in page["results"]][-1] == "Город 29"
+    assert not page["more"]
+    assert "Город скрытый" not in str(page), (
+        "Убедитесь, что снятые с публикации местоположения не предлагаются."
+    )
+    client.get("/choices/location/?q=Город 1")
+    with django_assert_num_queries(0):
+        client.get("/choices/location/?q=Город 1")
+    mixer.blend("blog.Location", is_published=True, name="Город 1а")
+    data = client.get("/choices/location/?q=Город 1").json()
+    assert "Город 1а" in [choice["text"] for choice in data["results"]], (
+        "Убедитесь, что кэш вариантов сбрасывается при изменении"
+        " местоположений."
+    )
+    assert client.get("/choices/user/").status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("many_locations")
+def test_post_form_accepts_typed_names(user_client, published_category):
+    response = user_client.post("/posts/create/", {
+        "title": "Без скриптов",
+        "text": "Текст",
+        "pub_date": timezone.now().strftime("%Y-%m-%dT%H:%M"),
+        "category": published_category.title,
+        "location": "город 07",
+    })
+    assert response.status_code == 302, (
+        "Убедитесь, что категорию и местоположение можно указать названием."
+    )
+    post = Post.objects.get(title="Без скриптов")
+    assert post.location == Location.objects.get(name="Город 07")
+    assert post.category == published_category
+    response = user_client.get(f"/posts/{post.pk}/edit/")
+    assert 'value="Город 07"' in response.content.decode(), (
+        "Убедитесь, что при редактировании в поле выводится название."
+    )
+
+
+@pytest.mark.django_db
+def test_resave_keeps_duplicate_named_location(
+    user_client, user, mixer, published_category
+):
+    first, second = mixer.cycle(2).blend(
+        "blog.Location", is_published=True, name="Москва")
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        location=second, is_published=True, pub_date=timezone.now(),
+    )
+    content = user_client.get(f"/posts/{post.pk}/edit/").content.decode()
+    assert f'name="location" value="{second.pk}"' in content, (
+        "Убедитесь, что форма отправляет ключ местоположения, а не название."
+    )
+    assert 'name="location_label"' in content and 'value="Москва"' in content
+    data = {
+        "title": post.title,
+        "text": post.text,
+        "pub_date": timezone.now().strftime("%Y-%m-%dT%H:%M"),
+        "category": published_category.pk,
+        "category_label": published_category.title,
+        "location": second.pk,
+        "location_label": "Москва",
+    }
+    response = user_client.post(f"/posts/{post.pk}/edit/", data)
+    assert response.status_code == 302
+    post.refresh_from_db()
+    assert post.location == second, (
+        "Убедитесь, что повторное сохранение не переносит публикацию на"
+        " другое местоположение с тем же названием."
+    )
+    data.update(location="", location_label="москва")
+    response = user_client.post(f"/posts/{post.pk}/edit/", data)
+    assert response.status_code == 200, (
+        "Убедитесь, что неоднозначное название без ключа не сохраняется"
+        " молча с первым совпадением."
+    )
+    post.refresh_from_db()
+    assert post.location == second
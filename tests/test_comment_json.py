@@ -0,0 +1,94 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+@pytest.fixture
+def commented_post(mixer, another_user, published_category):
+    return mixer.blend(
+        "blog.Post", author=another_user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+@pytest.mark.django_db
+def test_json_comment_uses_one_read_and_one_write(
+    user_client, user, commented_post, django_capture_on_commit_callbacks
+):
+    from blog.models import CommentEvent
+    from core.models import InvalidationEvent
+
+    url = f"/posts/{commented_post.id}/comments/"
+    user_client.get("/")
+    with django_capture_on_commit_callbacks() as callbacks:
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.post(
+                url, {"text": "Быстрый комментарий"})
+    assert response.status_code == 201, (
+        "Убедитесь, что JSON-эндпоинт комментариев отвечает 201."
+    )
+    data = response.json()
+    assert f'name="comment_{data["id"]}"' in data["html"], (
+        "Убедитесь, что в ответе есть готовый фрагмент комментария."
+    )
+    assert data["comment_count"] == 1
+    statements = [
+        re.sub(r"^SELECT .*? FROM (\S+).*$", r"SELECT \1",
+               re.sub(r"^(INSERT INTO|UPDATE) (\S+).*$", r"\1 \2",
+                      query["sql"]))
+        for query in queries.captured_queries
+        if not query["sql"].startswith(("SAVEPOINT", "RELEASE SAVEPOINT"))
+    ]
+    assert statements == [
+        'SELECT "blog_post"',
+        'INSERT INTO "blog_comment"',
+        'UPDATE "blog_post"',
+    ], (
+        "Убедитесь, что до фиксации эндпоинт выполняет только чтение"
+        " публикации, вставку комментария и обновление счётчика;"
+        f" выполнено: {statements}."
+    )
+    assert "RETURNING" in queries.captured_queries[-2]["sql"], (
+        "Убедитесь, что число комментариев возвращает сам UPDATE счётчика."
+    )
+    assert not CommentEvent.objects.exists()
+    for callback in callbacks:
+        callback()
+    assert CommentEvent.objects.filter(comment_id=data["id"]).exists(), (
+        "Убедитесь, что событие сводки записывается после фиксации."
+    )
+    assert InvalidationEvent.objects.exists()
+    commented_post.refresh_from_db()
+    assert commented_post.comments_total == 1, (
+        "Убедитесь, что счётчик комментариев обновляется при добавлении."
+    )
+
+
+@pytest.mark.django_db
+def test_json_comment_errors(client, user_client, commented_post):
+    url = f"/posts/{commented_post.id}/comments/"
+    assert client.post(url, {"text": "Аноним"}).status_code == 401
+    response = user_client.post(url, {"text": ""})
+    assert response.status_code == 400
+    assert "text" in response.json()["errors"]
+    commented_post.is_published = False
+    commented_post.save()
+    assert user_client.post(url, {"text": "Скрыто"}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_comment_counter_follows_deletes(mixer, user, commented_post):
+    first, second = mixer.cycle(2).blend(
+        "blog.Comment", post=commented_post, author=user
+    )
+    commented_post.refresh_from_db()
+    assert commented_post.comments_total == 2
+    first.delete()
+    commented_post.refresh_from_db()
+    assert commented_post.comments_total == 1, (
+        "Убедитесь, что счётчик комментариев уменьшается при удалении."
+    )
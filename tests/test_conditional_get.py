@@ -0,0 +1,154 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+
+@pytest.fixture
+def conditional_post(mixer, user, published_category, published_location):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def page_url(post, page):
+    return {
+        "index": "/",
+        "category": f"/category/{post.category.slug}/",
+        "profile": f"/profile/{post.author.username}/",
+        "detail": f"/posts/{post.id}/",
+    }[page]
+
+
+PAGES = ["index", "category", "profile", "detail"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page", PAGES)
+def test_etag_not_modified(client, conditional_post, page):
+    url = page_url(conditional_post, page)
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert response.has_header("ETag") and response.has_header(
+        "Last-Modified"), (
+        f"Убедитесь, что страница `{page}` отдаёт заголовки ETag и"
+        " Last-Modified."
+    )
+    not_modified = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED, (
+        f"Убедитесь, что страница `{page}` отвечает 304 на If-None-Match с"
+        " актуальным ETag."
+    )
+    assert not not_modified.content
+    by_date = client.get(
+        url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+    assert by_date.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page", PAGES)
+def test_etag_changes_after_comment(client, mixer, conditional_post, page):
+    url = page_url(conditional_post, page)
+    etag = client.get(url)["ETag"]
+    mixer.blend("blog.Comment", post=conditional_post)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        f"Убедитесь, что новый комментарий меняет ETag страницы `{page}`."
+    )
+
+
+@pytest.mark.django_db
+def test_etag_varies_by_user(client, user_client, conditional_post):
+    etag = client.get("/")["ETag"]
+    response = user_client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что ETag различается для разных пользователей."
+    )
+
+
+@pytest.mark.django_db
+def test_not_modified_skips_rendering(client, conditional_post):
+    etag = client.get("/")["ETag"]
+    response = client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert not response.templates, (
+        "Убедитесь, что при ответе 304 шаблоны не рендерятся."
+    )
+
+
+@pytest.mark.django_db
+def test_last_modified_moves_when_scheduled_post_goes_live(
+    client, mixer, conditional_post, monkeypatch
+):
+    now = timezone.now()
+    mixer.blend(
+        "blog.Post", author=conditional_post.author,
+        category=conditional_post.category, is_published=True,
+        pub_date=now + timedelta(hours=1),
+    )
+    last_modified = client.get("/")["Last-Modified"]
+    monkeypatch.setattr(timezone, "now", lambda: now + timedelta(hours=2))
+    response = client.get("/", HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что Last-Modified ленты сдвигается, когда наступает"
+        " дата отложенной публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_feed_validators_do_not_scan_comments(client, conditional_post):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        client.get("/")
+    assert not [query for query in queries.captured_queries
+                if '"blog_comment"' in query["sql"]], (
+        "Убедитесь, что валидаторы ленты считают комментарии по счётчикам"
+        " публикаций, а не по таблице комментариев."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page", ["index", "category"])
+def test_not_modified_runs_one_bounded_query(client, conditional_post, page):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    url = page_url(conditional_post, page)
+    etag = client.get(url)["ETag"]
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    post_queries = [query["sql"] for query in queries.captured_queries
+                    if '"blog_post"' in query["sql"]]
+    assert len(post_queries) == 1 and "LIMIT 1" in post_queries[0], (
+        "Убедитесь, что валидаторы ленты читают одну строку по индексу,"
+        " а не агрегируют все видимые публикации."
+    )
+    assert not any(function in post_queries[0]
+                   for function in ("COUNT(", "SUM(", "MAX(")), (
+        "Убедитесь, что валидаторы ленты не агрегируют публикации."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page", ["index", "category"])
+def test_cached_page_matches_new_etag_after_comment(
+    client, mixer, conditional_post, page
+):
+    url = page_url(conditional_post, page)
+    etag = client.get(url)["ETag"]
+    mixer.blend("blog.Comment", post=conditional_post,
+                author=conditional_post.author)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert "Комментарии (1)" in response.content.decode(), (
+        f"Убедитесь, что под новым ETag страница `{page}` не отдаётся из"
+        " кэша со старым числом комментариев."
+    )
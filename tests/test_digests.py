@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+
+
+@pytest.fixture
+def commented_post(mixer, user, another_user, published_category,
+                   django_capture_on_commit_callbacks):
+    user.email = "author@example.com"
+    user.save()
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        mixer.cycle(2).blend("blog.Comment", post=post, author=another_user)
+        mixer.blend("blog.Comment", post=post, author=user)
+    return post
+
+
+@pytest.mark.django_db
+def test_comments_are_sent_as_one_digest(commented_post, user):
+    from blog.models import CommentEvent
+    from blog.notifications import send_digests
+
+    assert CommentEvent.objects.filter(recipient=user).count() == 2, (
+        "Убедитесь, что для сводки запоминаются комментарии других"
+        " пользователей, но не комментарии самого автора."
+    )
+    assert send_digests() == 1
+    assert len(mail.outbox) == 1, (
+        "Убедитесь, что автор получает одну сводку вместо письма на каждый"
+        " комментарий."
+    )
+    assert mail.outbox[0].to == [user.email]
+    assert commented_post.title in mail.outbox[0].body
+    assert not CommentEvent.objects.exists()
+
+
+@pytest.mark.django_db
+def test_digest_respects_period(mixer, commented_post, another_user):
+    from blog.notifications import send_digests
+
+    send_digests()
+    mixer.blend("blog.Comment", post=commented_post, author=another_user)
+    assert send_digests() == 0, (
+        "Убедитесь, что сводка отправляется не чаще выбранного периода."
+    )
+
+
+@pytest.mark.django_db
+def test_digest_can_be_turned_off(user_client, commented_post):
+    from blog.models import CommentEvent, DigestSubscription
+    from blog.notifications import send_digests
+
+    user_client.post("/user/digest/", {"period": 0})
+    assert DigestSubscription.objects.get().period == 0, (
+        "Убедитесь, что пользователь может отключить сводку."
+    )
+    assert send_digests() == 0 and not mail.outbox
+    assert not CommentEvent.objects.exists()
+
+
+@pytest.mark.parametrize("period, sent_at, now, due", [
+    (1, "10:00:05", "11:00:02", True),
+    (1, "10:59:59", "11:00:00", True),
+    (1, "10:00:00", "10:59:59", False),
+    (24, "10:00:07", "10:00:03", True),
+    (24, "10:00:07", "09:59:59", False),
+])
+def test_digest_period_tolerates_task_jitter(period, sent_at, now, due):
+    from datetime import datetime
+
+    from blog.models import DigestSubscription
+    from blog.notifications import is_due
+
+    def moment(time, day):
+        return datetime.fromisoformat(f"2024-05-{day:02}T{time}+00:00")
+
+    subscription = DigestSubscription(
+        period=period, last_sent_at=moment(sent_at, 1))
+    assert is_due(subscription, moment(now, 1 + period // 24)) is due, (
+        "Убедитесь, что запуск задачи на несколько секунд раньше"
+        " не откладывает сводку на целый период."
+    )
@@ -0,0 +1,109 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.drafts import load_draft, purge_drafts
+from blog.models import PostDraft
+
+
+def autosave(client, url, version, changes, **extra):
+    return client.post(
+        url, json.dumps({"version": version, "changes": changes, **extra}),
+        content_type="application/json",
+    )
+
+
+@pytest.mark.django_db
+@override_settings(DRAFT_FLUSH_INTERVAL=3600)
+def test_autosave_coalesces_deltas(user_client, user):
+    url = "/posts/draft/"
+    response = autosave(user_client, url, 0, {
+        "title": "Черновик", "text": "Начало текста 🙂 и конец"})
+    assert response.json() == {"version": 1}
+    assert PostDraft.objects.get(author=user, post=None).version == 1, (
+        "Убедитесь, что первое автосохранение записывается в базу."
+    )
+    with CaptureQueriesContext(connection) as queries:
+        autosave(user_client, url, 1, {
+            "text": {"at": 15, "remove": 0, "insert": "!"}})
+        response = autosave(user_client, url, 2, {
+            "text": {"at": 19, "remove": 5, "insert": "финал"}})
+    assert response.json() == {"version": 3}
+    assert not [query for query in queries.captured_queries
+                if "blog_postdraft" in query["sql"]], (
+        "Убедитесь, что частые автосохранения копятся в кэше и не пишутся"
+        " в базу каждый раз."
+    )
+    assert load_draft(user.pk, None)["data"]["text"] == (
+        "Начало текста 🙂! и финал"
+    ), "Убедитесь, что изменения текста применяются как замена участка."
+    autosave(user_client, url, 3, {}, flush=True)
+    assert PostDraft.objects.get(author=user, post=None).version == 4
+    content = user_client.get("/posts/create/").content.decode()
+    assert "Начало текста 🙂! и финал" in content, (
+        "Убедитесь, что форма создания восстанавливает черновик."
+    )
+
+
+@pytest.mark.django_db
+def test_edit_page_autosaves_text_splice(user_client, user, mixer):
+    post = mixer.blend("blog.Post", author=user, text="Текст поста")
+    url = f"/posts/{post.pk}/draft/"
+    response = autosave(user_client, url, 0, {
+        "text": {"at": 11, "remove": 0, "insert": "!"}})
+    assert response.status_code == 200, (
+        "Убедитесь, что первое автосохранение формы правки принимает"
+        " замену участка текста публикации."
+    )
+    assert load_draft(user.pk, post.pk)["data"]["text"] == "Текст поста!"
+    content = user_client.get(f"/posts/{post.pk}/edit/").content.decode()
+    assert "Текст поста!" in content, (
+        "Убедитесь, что форма правки восстанавливает черновик."
+    )
+
+
+@pytest.mark.django_db
+def test_autosave_rejects_stale_versions_and_foreign_posts(
+    user_client, another_user, mixer
+):
+    autosave(user_client, "/posts/draft/", 0, {"title": "Первая вкладка"})
+    response = autosave(user_client, "/posts/draft/", 0, {"title": "Вторая"})
+    assert response.status_code == 409, (
+        "Убедитесь, что автосохранение от устаревшей версии отклоняется."
+    )
+    assert response.json()["data"] == {"title": "Первая вкладка"}
+    foreign = mixer.blend("blog.Post", author=another_user)
+    response = autosave(
+        user_client, f"/posts/{foreign.pk}/draft/", 0, {"title": "Чужое"})
+    assert response.status_code == 404
+    response = autosave(user_client, "/posts/draft/", 1, {"author": "x"})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_publishing_purges_draft(user_client, user, published_category):
+    autosave(user_client, "/posts/draft/", 0, {"title": "Скоро"})
+    response = user_client.post("/posts/create/", {
+        "title": "Скоро",
+        "text": "Текст",
+        "pub_date": timezone.now().strftime("%Y-%m-%dT%H:%M"),
+        "category": published_category.pk,
+    })
+    assert response.status_code == 302
+    assert load_draft(user.pk, None) is None, (
+        "Убедитесь, что черновик удаляется после публикации."
+    )
+    assert not PostDraft.objects.exists()
+
+
+@pytest.mark.django_db
+def test_abandoned_drafts_are_purged(user):
+    draft = PostDraft.objects.create(author=user, data={"title": "Старый"})
+    PostDraft.objects.filter(pk=draft.pk).update(
+        updated_at=timezone.now() - timedelta(days=365))
+    assert purge_drafts() == 1
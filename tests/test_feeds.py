@@ -0,0 +1,81 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category):
+    now = timezone.now()
+    visible = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, title="Видимая запись",
+        pub_date=now - timedelta(days=1),
+    )
+    hidden = [
+        mixer.blend("blog.Post", author=user, category=published_category,
+                    is_published=False, title="Снятая запись",
+                    pub_date=now - timedelta(days=1)),
+        mixer.blend("blog.Post", author=user, category=published_category,
+                    is_published=True, title="Отложенная запись",
+                    pub_date=now + timedelta(days=1)),
+    ]
+    return visible, hidden
+
+
+def feed_urls(post):
+    return [
+        "/feeds/rss/", "/feeds/atom/",
+        f"/category/{post.category.slug}/rss/",
+        f"/category/{post.category.slug}/atom/",
+        f"/profile/{post.author.username}/rss/",
+        f"/profile/{post.author.username}/atom/",
+    ]
+
+
+@pytest.mark.django_db
+def test_feeds_follow_feed_visibility(client, feed_posts):
+    visible, hidden = feed_posts
+    for url in feed_urls(visible):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        content = response.content.decode()
+        assert visible.title in content, (
+            f"Убедитесь, что лента `{url}` содержит опубликованные записи."
+        )
+        assert not [post for post in hidden if post.title in content], (
+            f"Убедитесь, что лента `{url}` не показывает снятые с публикации"
+            " и отложенные записи."
+        )
+    assert client.get("/category/missing/rss/").status_code == (
+        HTTPStatus.NOT_FOUND)
+
+
+@pytest.mark.django_db
+def test_feed_polls_get_not_modified(client, feed_posts):
+    visible, _ = feed_posts
+    url = "/feeds/rss/"
+    response = client.get(url)
+    assert response["Content-Type"].startswith("application/rss+xml")
+    with CaptureQueriesContext(connection) as queries:
+        not_modified = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что лента отвечает 304 на If-None-Match с актуальным"
+        " ETag."
+    )
+    assert not [query for query in queries.captured_queries
+                if "LIMIT 20" in query["sql"]], (
+        "Убедитесь, что ответ 304 не запрашивает записи ленты."
+    )
+    by_date = client.get(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+    assert by_date.status_code == HTTPStatus.NOT_MODIFIED
+    visible.title = "Переименованная запись"
+    visible.save()
+    changed = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert changed.status_code == HTTPStatus.OK
+    assert "Переименованная запись" in changed.content.decode(), (
+        "Убедитесь, что изменение записи пересобирает ленту."
+    )
@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Comment, Post
+from core.cache import shared_cache
+
+
+@pytest.fixture
+def fresh_keys():
+    shared_cache().clear()
+
+
+def form_token(content):
+    marker = 'name="idempotency_key" value="'
+    start = content.index(marker) + len(marker)
+    return content[start:content.index('"', start)]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("fresh_keys")
+def test_repeated_post_submission_is_replayed(user_client, published_category):
+    token = form_token(user_client.get("/posts/create/").content.decode())
+    data = {
+        "title": "Двойной щелчок",
+        "text": "Текст",
+        "pub_date": timezone.now().strftime("%Y-%m-%dT%H:%M"),
+        "category": published_category.pk,
+        "idempotency_key": token,
+    }
+    first = user_client.post("/posts/create/", data)
+    second = user_client.post("/posts/create/", data)
+    assert Post.objects.filter(title="Двойной щелчок").count() == 1, (
+        "Убедитесь, что повторная отправка формы с тем же ключом не создаёт"
+        " публикацию ещё раз."
+    )
+    assert second.status_code == first.status_code == 302
+    assert second["Location"] == first["Location"]
+    assert second["Idempotent-Replayed"] == "true"
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("fresh_keys")
+def test_json_comment_replay_and_failed_attempts(
+    user_client, mixer, another_user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=another_user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    url = f"/posts/{post.id}/comments/"
+    token = "a" * 32
+    invalid = user_client.post(url, {"text": "", "idempotency_key": token})
+    assert invalid.status_code == 400
+    first = user_client.post(url, {"text": "Один", "idempotency_key": token})
+    assert first.status_code == 201, (
+        "Убедитесь, что ошибка валидации освобождает ключ для исправленной"
+        " отправки."
+    )
+    second = user_client.post(
+        url, {"text": "Один"}, HTTP_IDEMPOTENCY_KEY=token)
+    assert second.json() == first.json(), (
+        "Убедитесь, что повторный запрос получает исходный ответ."
+    )
+    assert Comment.objects.filter(post=post).count() == 1
+    other = user_client.post(url, {"text": "Два", "idempotency_key": "b" * 32})
+    assert other.status_code == 201
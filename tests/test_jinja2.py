@@ -0,0 +1,66 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.core.cache import caches
+from django.test import override_settings
+from django.utils import timezone
+
+JINJA2_VIEWS = {
+    name: "jinja2"
+    for name in ("PostListView", "CategoryListView", "PostDetailView",
+                 "ProfileDetailView")
+}
+
+
+def normalize(html):
+    html = re.sub(r'(name="csrfmiddlewaretoken" value=)"[^"]+"', r"\1", html)
+    html = re.sub(r'(name="idempotency_key" value=)"[^"]+"', r"\1", html)
+    html = re.sub(r">\s+", ">", html)
+    html = re.sub(r"\s+<", "<", html)
+    return re.sub(r"\s+", " ", html).strip()
+
+
+@pytest.fixture
+def jinja_posts(mixer, user, published_category, published_location):
+    posts = mixer.cycle(12).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+        text="Текст <b>публикации</b>\nс переносом строки " * 3,
+    )
+    mixer.cycle(2).blend("blog.Comment", post=posts[0], author=user,
+                         text="Комментарий\nв две строки")
+    return posts
+
+
+def render_both(client, url):
+    caches["default"].clear()
+    django_html = client.get(url).content.decode("utf-8")
+    caches["default"].clear()
+    with override_settings(BLOG_TEMPLATE_ENGINES=JINJA2_VIEWS):
+        response = client.get(url)
+    assert response.status_code == 200
+    return django_html, response.content.decode("utf-8")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page", ["index", "category", "detail", "profile"])
+@pytest.mark.parametrize("client_name", ["client", "user_client"])
+def test_jinja2_matches_django(request, jinja_posts, page, client_name):
+    client = request.getfixturevalue(client_name)
+    post = jinja_posts[0]
+    url = {
+        "index": "/?page=2",
+        "category": f"/category/{post.category.slug}/",
+        "detail": f"/posts/{post.id}/",
+        "profile": f"/profile/{post.author.username}/",
+    }[page]
+    django_html, jinja_html = render_both(client, url)
+    assert normalize(jinja_html) == normalize(django_html), (
+        f"Убедитесь, что шаблон Jinja2 страницы `{page}` выводит ту же"
+        " разметку, что и шаблон Django."
+    )
@@ -0,0 +1,82 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from django.core.cache import caches
+from django.test import override_settings
+from django.utils import timezone
+
+
+@pytest.fixture
+def live_post(mixer, user, published_category):
+    caches["default"].clear()
+    return mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+@pytest.mark.django_db
+def test_wsgi_pages_do_not_open_event_stream(client, live_post):
+    response = client.get(f"/posts/{live_post.id}/")
+    assert "data-events-url" not in response.content.decode(), (
+        "Убедитесь, что под WSGI страница публикации не открывает поток"
+        " комментариев."
+    )
+    events = client.get(f"/posts/{live_post.id}/events/")
+    assert events.status_code == 204, (
+        "Убедитесь, что под WSGI поток комментариев отвечает 204, чтобы"
+        " браузер не переподключался."
+    )
+    with override_settings(ASGI=True):
+        response = client.get(f"/posts/{live_post.id}/")
+    assert (f'data-events-url="/posts/{live_post.id}/events/"'
+            in response.content.decode())
+
+
+@pytest.mark.django_db
+def test_event_stream_hides_unpublished_posts(client, live_post):
+    live_post.is_published = False
+    live_post.save()
+    assert client.get(f"/posts/{live_post.id}/events/").status_code == 404
+
+
+@pytest.mark.django_db(transaction=True)
+def test_asgi_event_stream_pushes_new_comments(mixer, user, live_post):
+    from core.asgi import Application
+
+    application = Application(None)
+    seen, new = mixer.cycle(2).blend(
+        "blog.Comment", post=live_post, author=user, text="Новый"
+    )
+    messages = []
+
+    async def scenario():
+        disconnect = asyncio.Event()
+        requests = [{"type": "http.request", "body": b""}]
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+            if b"event: comment" in message.get("body", b""):
+                disconnect.set()
+
+        scope = {
+            "type": "http", "method": "GET", "query_string": b"",
+            "path": f"/posts/{live_post.id}/events/",
+            "headers": [(b"last-event-id", str(seen.id).encode())],
+        }
+        await asyncio.wait_for(application(scope, receive, send), 5)
+
+    asyncio.run(scenario())
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    assert messages[0]["status"] == 200
+    assert f"id: {new.id}\n".encode() in body, (
+        "Убедитесь, что под ASGI новый комментарий отправляется открытому"
+        " соединению без отдельного потока на соединение."
+    )
@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.admin import helpers
+from django.core.cache import caches
+from django.utils import timezone
+
+from blog import moderation
+from blog.models import Comment, CommentEvent, Post
+
+
+@pytest.fixture
+def moderated_posts(mixer, user, another_user, published_category):
+    posts = mixer.cycle(5).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    mixer.cycle(3).blend("blog.Comment", post=posts[0], author=another_user)
+    return posts
+
+
+@pytest.mark.django_db
+def test_bulk_unpublish_and_publish_across_batches(
+    monkeypatch, client, admin_client, moderated_posts,
+    django_assert_max_num_queries
+):
+    monkeypatch.setattr(moderation, "BATCH_SIZE", 2)
+    caches["default"].clear()
+    assert moderated_posts[4].title in client.get("/").content.decode()
+    with django_assert_max_num_queries(40):
+        response = admin_client.post("/admin/blog/post/", {
+            "action": "unpublish",
+            "select_across": "1",
+            helpers.ACTION_CHECKBOX_NAME: [moderated_posts[0].pk],
+        })
+    assert response.status_code == 302
+    assert not Post.objects.filter(is_published=True).exists(), (
+        "Убедитесь, что действие «Снять с публикации» применяется ко всей"
+        " выборке списка."
+    )
+    assert moderated_posts[4].title not in client.get("/").content.decode(), (
+        "Убедитесь, что массовые действия сбрасывают кэш лент."
+    )
+    admin_client.post("/admin/blog/post/", {
+        "action": "publish",
+        helpers.ACTION_CHECKBOX_NAME: [moderated_posts[1].pk],
+    })
+    assert list(Post.objects.filter(
+        is_published=True).values_list("pk", flat=True)) == [
+        moderated_posts[1].pk]
+
+
+@pytest.mark.django_db
+def test_bulk_move_requires_confirmation(
+    admin_client, moderated_posts, another_category
+):
+    data = {
+        "action": "move_to_category",
+        helpers.ACTION_CHECKBOX_NAME: [post.pk for post in moderated_posts],
+    }
+    response = admin_client.post("/admin/blog/post/", data)
+    assert response.status_code == 200
+    assert "Перенос в категорию" in response.content.decode()
+    response = admin_client.post("/admin/blog/post/", {
+        **data, "post": "yes", "category": another_category.pk,
+    })
+    assert response.status_code == 302
+    assert Post.objects.filter(category=another_category).count() == 5, (
+        "Убедитесь, что публикации переносятся в выбранную категорию."
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_delete_keeps_comment_counters(
+    admin_client, mixer, moderated_posts, another_user
+):
+    commented = moderated_posts[0]
+    kept = mixer.blend("blog.Comment", post=commented, author=another_user)
+    CommentEvent.objects.create(recipient=commented.author, comment=kept)
+    doomed = Comment.objects.exclude(pk=kept.pk)
+    admin_client.post("/admin/blog/comment/", {
+        "action": "delete_selected_comments",
+        "post": "yes",
+        helpers.ACTION_CHECKBOX_NAME: list(doomed.values_list("pk", flat=True)),
+    })
+    commented.refresh_from_db()
+    assert commented.comments_total == 1, (
+        "Убедитесь, что массовое удаление комментариев пересчитывает"
+        " счётчик публикации."
+    )
+    admin_client.post("/admin/blog/post/", {
+        "action": "delete_selected_posts",
+        "post": "yes",
+        helpers.ACTION_CHECKBOX_NAME: [commented.pk],
+    })
+    assert not Post.objects.filter(pk=commented.pk).exists()
+    assert not Comment.objects.filter(pk=kept.pk).exists()
+    assert not CommentEvent.objects.exists()
+
+
+@pytest.mark.django_db
+def test_changelist_scales_with_table_size(
+    monkeypatch, admin_client, moderated_posts, django_assert_max_num_queries
+):
+    from blog import admin as blog_admin
+
+    monkeypatch.setattr(blog_admin, "EXACT_COUNT_LIMIT", 0)
+    long_text = "Длинный текст публикации. " * 20
+    Post.objects.filter(pk=moderated_posts[0].pk).update(text=long_text)
+    with django_assert_max_num_queries(12) as queries:
+        response = admin_client.get("/admin/blog/post/")
+    assert response.status_code == 200
+    assert not [query for query in queries.captured_queries
+                if 'COUNT(' in query["sql"] and '"blog_post"' in query["sql"]
+                ], (
+        "Убедитесь, что список публикаций без фильтров не считает строки"
+        " через COUNT(*)."
+    )
+    content = response.content.decode()
+    assert long_text not in content, (
+        "Убедитесь, что список публикаций показывает только начало текста."
+    )
+    author = moderated_posts[0].author.username
+    response = admin_client.get(f"/admin/blog/post/?author={author}")
+    assert response.status_code == 200
+    assert response.context["cl"].result_count == len(moderated_posts)
+    response = admin_client.get("/admin/blog/post/?author=nobody")
+    assert response.context["cl"].result_count == 0, (
+        "Убедитесь, что фильтр по автору ищет по имени пользователя."
+    )
@@ -0,0 +1,79 @@
+import pytest
+from django.core import mail
+from django.test import override_settings
+
+OUTBOX = {
+    "EMAIL_BACKEND": "core.mail.OutboxEmailBackend",
+    "EMAIL_DELIVERY_BACKEND": "django.core.mail.backends.locmem.EmailBackend",
+}
+
+
+@pytest.mark.django_db
+@override_settings(**OUTBOX)
+def test_password_reset_mail_goes_through_outbox(
+    client, user, django_capture_on_commit_callbacks
+):
+    from core.mail import drain_outbox
+    from core.models import OutboxMessage, Task
+
+    user.email = "reader@example.com"
+    user.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post("/auth/password_reset/", {"email": user.email})
+    assert not mail.outbox, (
+        "Убедитесь, что письма не отправляются внутри запроса."
+    )
+    assert OutboxMessage.objects.count() == 1
+    assert Task.objects.filter(name="core.drain_outbox").exists(), (
+        "Убедитесь, что отправка писем ставит в очередь задачу доставки."
+    )
+    assert drain_outbox()["sent"] == 1
+    assert [message.to for message in mail.outbox] == [[user.email]]
+    assert OutboxMessage.objects.get().status == OutboxMessage.Status.SENT
+
+
+@pytest.mark.django_db
+@override_settings(**{
+    **OUTBOX,
+    "EMAIL_DELIVERY_BACKEND": "tests.test_outbox.BrokenBackend",
+    "OUTBOX_MAX_ATTEMPTS": 2,
+    "OUTBOX_RETRY_BACKOFF": 0,
+})
+def test_undeliverable_mail_is_dead_lettered():
+    from core.mail import drain_outbox
+    from core.models import OutboxMessage
+
+    mail.send_mail("Тема", "Текст", "from@example.com", ["to@example.com"])
+    assert drain_outbox() == {"sent": 0, "retried": 1, "dead": 0}, (
+        "Убедитесь, что неудачная доставка повторяется."
+    )
+    assert drain_outbox() == {"sent": 0, "retried": 0, "dead": 1}
+    message = OutboxMessage.objects.get()
+    assert message.status == OutboxMessage.Status.DEAD, (
+        "Убедитесь, что письмо помечается недоставленным после исчерпания"
+        " попыток."
+    )
+    assert "ConnectionRefusedError" in message.last_error
+
+
+@pytest.mark.django_db
+@override_settings(**OUTBOX)
+def test_each_send_schedules_delivery(django_capture_on_commit_callbacks):
+    from core.mail import drain_outbox
+    from core.models import Task
+
+    for subject in ("Первое", "Второе"):
+        with django_capture_on_commit_callbacks(execute=True):
+            mail.send_mail(subject, "Текст", "from@example.com",
+                           ["to@example.com"])
+        Task.objects.update(status=Task.Status.DONE)
+    assert Task.objects.filter(name="core.drain_outbox").count() == 2, (
+        "Убедитесь, что письмо, отправленное в ту же секунду после"
+        " выполненной доставки, ставит новую задачу доставки."
+    )
+    assert drain_outbox()["sent"] == 2
+
+
+class BrokenBackend(mail.backends.base.BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionRefusedError("SMTP is down")
@@ -0,0 +1,88 @@
+import pytest
+from django.test import override_settings
+
+from core import ratelimit
+
+
+@pytest.fixture
+def empty_buckets():
+    ratelimit.local_buckets.clear()
+    yield
+    ratelimit.local_buckets.clear()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("empty_buckets")
+@override_settings(RATE_LIMITS={
+    "login": {"rate": (2, 60), "keys": ("ip", "username")},
+})
+def test_login_is_rate_limited(client):
+    credentials = {"username": "victim", "password": "wrong"}
+    for _ in range(2):
+        assert client.post("/auth/login/", credentials).status_code == 200
+    response = client.post("/auth/login/", credentials)
+    assert response.status_code == 429, (
+        "Убедитесь, что частые попытки входа получают ответ 429."
+    )
+    assert 0 < int(response["Retry-After"]) <= 30, (
+        "Убедитесь, что ответ 429 содержит заголовок Retry-After."
+    )
+    assert client.get("/auth/login/").status_code == 200, (
+        "Убедитесь, что лимит действует только на отправку формы."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("empty_buckets")
+@override_settings(RATE_LIMITS={
+    "blog:add_comment": {"rate": (1, 60), "keys": ("user", "ip")},
+})
+def test_comment_limit_falls_back_to_process_buckets(
+    monkeypatch, user_client, post_with_published_location
+):
+    class UnavailableCache:
+        def get_many(self, keys):
+            raise ConnectionError("cache is down")
+
+    monkeypatch.setattr(ratelimit, "shared_cache", UnavailableCache)
+    post = post_with_published_location
+    url = f"/posts/{post.id}/comment/create/"
+    assert user_client.post(url, {"text": "Первый"}).status_code == 302
+    response = user_client.post(url, {"text": "Второй"})
+    assert response.status_code == 429, (
+        "Убедитесь, что без общего кэша лимит ведут корзины процесса."
+    )
+    assert post.comments.count() == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("empty_buckets")
+@override_settings(RATE_LIMITS={
+    "login": {"rate": (2, 60), "keys": ("ip", "username")},
+})
+def test_rejected_request_keeps_other_buckets(client):
+    for _ in range(2):
+        client.post("/auth/login/", {"username": "first", "password": "x"})
+    for _ in range(3):
+        response = client.post(
+            "/auth/login/", {"username": "second", "password": "x"},
+            REMOTE_ADDR="127.0.0.1")
+        assert response.status_code == 429
+    response = client.post(
+        "/auth/login/", {"username": "second", "password": "x"},
+        REMOTE_ADDR="10.0.0.2")
+    assert response.status_code == 200, (
+        "Убедитесь, что отклонённый запрос не забирает маркеры из других"
+        " корзин."
+    )
+
+
+def test_token_bucket_refills_over_period():
+    full_at, wait = ratelimit.take_token(None, 2, 10, now=100)
+    assert wait <= 0
+    full_at, wait = ratelimit.take_token(full_at, 2, 10, now=100)
+    assert wait <= 0
+    _, wait = ratelimit.take_token(full_at, 2, 10, now=100)
+    assert wait == 5, "Новый маркер появляется через period / capacity."
+    _, wait = ratelimit.take_token(full_at, 2, 10, now=105)
+    assert wait <= 0
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+@pytest.mark.django_db
+def test_anonymous_reader_does_not_touch_sessions(client):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/")
+    assert not any(
+        "django_session" in query["sql"] for query in queries
+    ), "Убедитесь, что анонимный читатель не обращается к таблице сессий."
+    assert settings.SESSION_COOKIE_NAME not in response.cookies, (
+        "Убедитесь, что анонимному читателю не выдаётся cookie сессии."
+    )
+
+
+@pytest.mark.django_db
+def test_purge_expired_sessions():
+    from core.sessions import purge_expired_sessions
+
+    now = timezone.now()
+    for index in range(5):
+        Session.objects.create(
+            session_key=f"expired{index}",
+            session_data="",
+            expire_date=now - timedelta(days=1),
+        )
+    Session.objects.create(
+        session_key="alive", session_data="",
+        expire_date=now + timedelta(days=1),
+    )
+    assert purge_expired_sessions(batch_size=2) == 5
+    assert list(Session.objects.values_list("session_key", flat=True)) == [
+        "alive"
+    ], "Убедитесь, что очистка удаляет только истёкшие сессии."
+
+
+@pytest.mark.django_db
+def test_logout_evicts_session_from_other_processes(user_client):
+    from core.models import InvalidationEvent
+
+    session_key = user_client.session.session_key
+    user_client.logout()
+    assert InvalidationEvent.objects.filter(
+        keys__contains=session_key
+    ).exists(), (
+        "Убедитесь, что удаление сессии вытесняет её из L1 других процессов."
+    )
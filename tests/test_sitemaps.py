@@ -0,0 +1,94 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from blog import cache, sitemaps
+
+
+@pytest.fixture
+def small_shards(monkeypatch):
+    monkeypatch.setattr(cache, "SITEMAP_SHARD_SIZE", 2)
+    monkeypatch.setattr(sitemaps, "SITEMAP_SHARD_SIZE", 2)
+    monkeypatch.setattr(sitemaps, "SITEMAP_CHUNK_SIZE", 1)
+
+
+@pytest.fixture
+def sitemap_posts(mixer, user, published_category):
+    now = timezone.now()
+    posts = mixer.cycle(5).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now - timedelta(days=1),
+    )
+    hidden = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now + timedelta(days=1),
+    )
+    return posts, hidden
+
+
+def shard_url(section, post_pk):
+    return f"/sitemap-{section}-{post_pk // 2}.xml"
+
+
+@pytest.mark.django_db
+def test_sitemap_index_and_shards(client, small_shards, sitemap_posts, user):
+    posts, hidden = sitemap_posts
+    index = client.get("/sitemap.xml").content.decode()
+    for post in posts:
+        assert shard_url("posts", post.pk) in index, (
+            "Убедитесь, что индекс карты сайта ссылается на все шарды"
+            " публикаций."
+        )
+    assert shard_url("categories", posts[0].category_id) in index
+    assert shard_url("profiles", user.pk) in index
+    for post in posts:
+        response = client.get(shard_url("posts", post.pk))
+        assert response.status_code == HTTPStatus.OK
+        assert f"/posts/{post.pk}/</loc>" in response.content.decode()
+    hidden_shard = client.get(shard_url("posts", hidden.pk)).content.decode()
+    assert f"/posts/{hidden.pk}/</loc>" not in hidden_shard, (
+        "Убедитесь, что карта сайта не содержит отложенные публикации."
+    )
+    profiles = client.get(shard_url("profiles", user.pk)).content.decode()
+    assert f"/profile/{user.username}/</loc>" in profiles
+    assert client.get("/sitemap-posts-999.xml").status_code == (
+        HTTPStatus.NOT_FOUND)
+    assert client.get("/sitemap-users-0.xml").status_code == (
+        HTTPStatus.NOT_FOUND)
+
+
+@pytest.mark.django_db
+def test_post_change_rebuilds_only_its_shard(
+    client, small_shards, sitemap_posts, monkeypatch
+):
+    posts, _ = sitemap_posts
+    first, last = posts[0], posts[-1]
+    assert first.pk // 2 != last.pk // 2
+    rendered = []
+    render_shard = sitemaps.render_shard
+
+    def counting_render(section, shard):
+        rendered.append((section, shard))
+        return render_shard(section, shard)
+
+    monkeypatch.setattr(sitemaps, "render_shard", counting_render)
+    etags = {post.pk: client.get(shard_url("posts", post.pk))["ETag"]
+             for post in (first, last)}
+    rendered.clear()
+    last.is_published = False
+    last.save()
+    unchanged = client.get(shard_url("posts", first.pk),
+                           HTTP_IF_NONE_MATCH=etags[first.pk])
+    assert unchanged.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что изменение публикации не затрагивает чужие шарды."
+    )
+    changed = client.get(shard_url("posts", last.pk),
+                         HTTP_IF_NONE_MATCH=etags[last.pk])
+    assert changed.status_code == HTTPStatus.OK
+    assert f"/posts/{last.pk}/</loc>" not in changed.content.decode()
+    assert rendered == [("posts", last.pk // 2)], (
+        "Убедитесь, что после изменения публикации пересобирается только"
+        " её шард."
+    )
@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+
+@pytest.fixture
+def flaky_task():
+    from core.tasks import registry, task
+
+    calls = []
+
+    @task(name="tests.flaky", max_attempts=2, backoff=60)
+    def flaky(value):
+        calls.append(value)
+        raise ValueError(value)
+
+    yield flaky, calls
+    registry.pop("tests.flaky")
+
+
+@pytest.mark.django_db
+def test_enqueue_is_idempotent():
+    from blog.tasks import warm_pages
+
+    first = warm_pages.enqueue(["/"], idempotency_key="warm:index")
+    second = warm_pages.enqueue(["/"], idempotency_key="warm:index")
+    assert first.pk == second.pk, (
+        "Убедитесь, что повторная постановка задачи с тем же ключом"
+        " идемпотентности не создаёт новую задачу."
+    )
+
+
+@pytest.mark.django_db
+def test_failed_task_is_retried_with_backoff(flaky_task):
+    from core.models import Task
+    from core.tasks import Worker
+
+    flaky, calls = flaky_task
+    task = flaky.enqueue("boom")
+    worker = Worker()
+    assert worker.run_pending() == 1
+    task.refresh_from_db()
+    assert task.status == Task.Status.QUEUED and task.attempts == 1, (
+        "Убедитесь, что упавшая задача возвращается в очередь."
+    )
+    assert task.run_after > timezone.now() + timedelta(seconds=20), (
+        "Убедитесь, что повтор откладывается с экспоненциальной задержкой."
+    )
+    assert worker.run_pending() == 0
+    Task.objects.filter(pk=task.pk).update(run_after=timezone.now())
+    worker.run_pending()
+    task.refresh_from_db()
+    assert task.status == Task.Status.FAILED and calls == ["boom", "boom"], (
+        "Убедитесь, что после исчерпания попыток задача помечается"
+        " как неудачная."
+    )
+    assert "ValueError" in task.last_error
+
+
+@pytest.mark.django_db(transaction=True)
+def test_post_save_enqueues_cache_warming(mixer, user, published_category):
+    from core.models import Task
+    from core.tasks import Worker
+
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    tasks = Task.objects.filter(name="blog.warm_pages")
+    assert tasks.count() == 1, (
+        "Убедитесь, что сохранение публикации ставит в очередь прогрев кэша,"
+        " не выполняя его в запросе."
+    )
+    assert tasks.get().payload["args"] == [
+        ["/", f"/category/{published_category.slug}/"]
+    ], "Убедитесь, что прогреваются только страницы с кэшем."
+    Worker().run_pending()
+    assert tasks.get().status == Task.Status.DONE
+
+
+@pytest.mark.django_db
+def test_warm_pages_skips_uncached_views(monkeypatch, mixer, user):
+    from blog import tasks
+    from core import swr
+
+    post = mixer.blend("blog.Post", author=user, is_published=True)
+    computed = []
+    get_or_recompute = swr.get_or_recompute
+
+    def counting(key, compute, **kwargs):
+        computed.append(key)
+        return get_or_recompute(key, compute, **kwargs)
+
+    monkeypatch.setattr("blog.mixins.get_or_recompute", counting)
+    tasks.warm_pages(["/", f"/posts/{post.pk}/", "/category/missing/"])
+    assert len(computed) == 1, (
+        "Убедитесь, что прогрев рендерит только страницы с кэшем и не"
+        " падает на отсутствующих."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_eager_tasks_do_not_warm_in_request(
+    settings, mixer, user, published_category
+):
+    from core.models import Task
+
+    settings.TASKS_EAGER = True
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    assert not Task.objects.filter(name="blog.warm_pages").exists(), (
+        "Убедитесь, что без обработчика очереди прогрев не выполняется"
+        " в запросе."
+    )
@@ -0,0 +1,93 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.template import Context, Template, engines
+
+from blog.models import Category, Location, Post
+
+from core.template_profiler import TemplateProfiler
+from core.templates import iter_template_names
+
+
+def test_project_templates_found():
+    names = set(iter_template_names(engines["django"].engine))
+    assert {"base.html", "includes/post_card.html", "blog/index.html"} <= (
+        names
+    ), "Убедитесь, что предкомпиляция находит все шаблоны проекта."
+
+
+@pytest.mark.django_db
+def test_template_profiler_counts_includes(user_client, mixer, user,
+                                           published_category):
+    mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date="2020-01-01T00:00:00Z"
+    )
+    profiler = TemplateProfiler()
+    with profiler.activate():
+        user_client.get(f"/category/{published_category.slug}/")
+    assert profiler.templates["blog/category.html"]["calls"] == 1
+    assert profiler.includes[("base.html", "includes/header.html")][
+        "calls"] == 1
+    assert profiler.includes[
+        ("base.html", "includes/paginator.html")]["calls"] == 1, (
+        "Убедитесь, что профилировщик учитывает каждый {% include %}."
+    )
+    assert any("paginator" in line for line in profiler.report())
+
+
+def make_posts():
+    author = get_user_model()(pk=7, username="author_7")
+    category = Category(pk=1, slug="routine", title="Будни & <дела>",
+                        is_published=True)
+    hidden_category = Category(pk=2, slug="hidden", title="Скрытая",
+                               is_published=False)
+    location = Location(pk=1, name="Остров \"Буян\"", is_published=True)
+    hidden_location = Location(pk=2, name="Тайное место",
+                               is_published=False)
+    variants = [
+        dict(category=category, location=location, image="posts_images/a.jpg"),
+        dict(category=category, location=None, is_published=False),
+        dict(category=hidden_category, location=hidden_location),
+        dict(category=category, location=location, image=""),
+    ]
+    posts = []
+    for index, variant in enumerate(variants, start=1):
+        post = Post(
+            pk=index,
+            title=f"Заголовок <{index}> & 'кавычки'",
+            text="Очень длинный текст <b>публикации</b> " * 5,
+            pub_date=datetime(2023, 3, index, 12, 30, tzinfo=timezone.utc),
+            author=author,
+            is_published=variant.pop("is_published", True),
+            **variant,
+        )
+        post.comment_count = index * 2
+        posts.append(post)
+    return posts
+
+
+def test_post_cards_match_include_loop():
+    caches["default"].clear()
+    posts = make_posts()
+    reference = Template(
+        "{% for post in posts %}\n"
+        '    <article class="mb-5">\n'
+        '      {% include "includes/post_card.html" %}\n'
+        "    </article>\n"
+        "  {% endfor %}"
+    ).render(Context({"posts": posts}))
+    caches["default"].clear()
+    fast = Template(
+        "{% load blog_cards %}{% post_cards posts %}"
+    ).render(Context({"posts": posts}))
+    assert fast == reference, (
+        "Убедитесь, что `{% post_cards %}` выводит разметку, побайтно"
+        " совпадающую с циклом по `includes/post_card.html`."
+    )
+    cached = Template(
+        "{% load blog_cards %}{% post_cards posts %}"
+    ).render(Context({"posts": posts}))
+    assert cached == reference